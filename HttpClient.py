@@ -1,27 +1,476 @@
+import ipaddress
+import os
+import socket
+import threading
+import time
+
+from concurrent.futures import Future
+from urllib.parse import parse_qs, urlencode, urlsplit, urlunsplit
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.connection import allowed_gai_family
+
+import http_cache
+import metrics
+import retry
+
+DHLOTTERY_HOSTS = (
+    "dhlottery.co.kr",
+    "www.dhlottery.co.kr",
+    "ol.dhlottery.co.kr",
+    "el.dhlottery.co.kr",
+)
+
+DEFAULT_TIMEOUT = 10
+DEFAULT_POOL_SIZE = 4
+
+# 호스트별 초당 요청 수 / 순간 최대 요청 수 (고정 sleep 대신 토큰 버킷으로 속도 제한)
+DEFAULT_HOST_RATE = float(os.environ.get("HOST_RATE_PER_SEC", 5))
+DEFAULT_HOST_BURST = int(os.environ.get("HOST_BURST", 10))
+
+# get_coalesced 로 받은 응답을 같은 실행 안에서 재사용하는 시간 (공개 페이지는 추첨 주기로만 바뀐다)
+DEFAULT_COALESCE_TTL = float(os.environ.get("COALESCE_TTL", 300))
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        assert rate > 0 and burst >= 1
+
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """토큰 하나를 가져간다. 토큰이 없으면 채워질 때까지 기다리고, 기다린 시간을 돌려준다"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+
+            # 먼저 예약해 두고 락 밖에서 기다린다 (다른 스레드는 그 다음 토큰을 기다림)
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    """호스트마다 TokenBucket 을 하나씩 두고, 같은 프로세스의 모든 HttpClient 가 공유한다"""
+
+    def __init__(self, rate: float = DEFAULT_HOST_RATE, burst: int = DEFAULT_HOST_BURST, overrides: dict = None):
+        self.rate = rate
+        self.burst = burst
+        self.overrides = overrides or {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str) -> float:
+        host = urlsplit(url).hostname or ""
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, burst = self.overrides.get(host, (self.rate, self.burst))
+                bucket = self._buckets[host] = TokenBucket(rate, burst)
+        return bucket.acquire()
+
+
+_DEFAULT_RATE_LIMITER = HostRateLimiter()
+_DEFAULT_CIRCUIT_BREAKERS = retry.HostCircuitBreakers()
+
+
+class SingleFlight:
+    """
+    같은 키로 동시에 들어온 호출을 하나의 실행으로 합친다
+    - 먼저 온 호출만 fn 을 실행하고, 나머지는 그 결과(또는 예외)를 함께 받는다
+    - ttl 이 있으면 끝난 결과를 그 시간 동안 재사용한다 (실패한 결과는 남기지 않는다)
+    """
 
-class HttpClient:
     def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key, fn, ttl: float = 0.0):
+        with self._lock:
+            entry = self._calls.get(key)
+            if entry is not None:
+                future, finished_at = entry
+                if finished_at is None or time.monotonic() - finished_at < ttl:
+                    self.shared += 1
+                    leader = False
+                else:
+                    entry = None
+            if entry is None:
+                future = Future()
+                self._calls[key] = (future, None)
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            with self._lock:
+                self._calls.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            if ttl > 0:
+                self._calls[key] = (future, time.monotonic())
+            else:
+                self._calls.pop(key, None)
+        future.set_result(result)
+        return result
+
+
+# 요청 하나 동안 새로 연 연결의 DNS / TCP 연결 / TLS 시간 (requests 는 알려주지 않아서 연결 클래스에서 직접 잰다)
+_connection_timing = threading.local()
+
+
+def _reset_connection_timing() -> None:
+    _connection_timing.dns = 0.0
+    _connection_timing.connect = 0.0
+    _connection_timing.tls = 0.0
+    _connection_timing.opened = 0
+
+
+def _add_connection_timing(stage: str, seconds: float) -> None:
+    setattr(_connection_timing, stage, getattr(_connection_timing, stage, 0.0) + seconds)
+
+
+class _TimedConnectionMixin:
+    def _new_conn(self):
+        """DNS 조회를 따로 재기 위해 먼저 주소를 찾아두고, urllib3 에는 그 주소로 연결하게 한다"""
+        host = self._dns_host
+        started = time.perf_counter()
+        address = None
+        try:
+            ipaddress.ip_address(host)
+        except ValueError:
+            try:
+                address = socket.getaddrinfo(host, self.port, allowed_gai_family(), socket.SOCK_STREAM)[0][4][0]
+            except OSError:
+                # 실패 사유는 아래에서 urllib3 가 다시 조회하면서 알맞은 예외로 알려준다
+                address = None
+        resolved_at = time.perf_counter()
+
+        try:
+            self._dns_host = address or host
+            try:
+                conn = super()._new_conn()
+            except Exception:
+                if address is None:
+                    raise
+                # 첫 주소로 연결하지 못하면 원래대로 모든 주소를 시도한다
+                self._dns_host = host
+                conn = super()._new_conn()
+        finally:
+            self._dns_host = host
+
+        _add_connection_timing("dns", resolved_at - started)
+        _add_connection_timing("connect", time.perf_counter() - resolved_at)
+        _add_connection_timing("opened", 1)
+        return conn
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    def connect(self):
+        # connect() 안의 _new_conn() 을 뺀 나머지가 TLS 핸드셰이크 시간
+        before = getattr(_connection_timing, "dns", 0.0) + getattr(_connection_timing, "connect", 0.0)
+        started = time.perf_counter()
+        super().connect()
+        opened = getattr(_connection_timing, "dns", 0.0) + getattr(_connection_timing, "connect", 0.0) - before
+        _add_connection_timing("tls", max(time.perf_counter() - started - opened, 0.0))
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """새 연결마다 DNS / 연결 / TLS 시간을 재는 HTTPAdapter"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+def _endpoint(parts) -> str:
+    """경로 + method 쿼리 (동행복권은 같은 경로에서 method= 로 기능이 갈린다)"""
+    method = parse_qs(parts.query).get("method")
+    return f"{parts.path}?method={method[0]}" if method else parts.path
+
+
+class HttpClient:
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, pool_sizes: dict = None,
+                 rate_limiter: HostRateLimiter = None, origin: str = None,
+                 retry_policy: retry.RetryPolicy = None, circuit_breakers: retry.HostCircuitBreakers = None,
+                 cache: http_cache.HttpCache = None):
         self.session = requests.Session()
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter or _DEFAULT_RATE_LIMITER
+        self.retry_policy = retry_policy or retry.RetryPolicy()
+        self.circuit_breakers = circuit_breakers or _DEFAULT_CIRCUIT_BREAKERS
+        self.flights = SingleFlight()
+
+        # DHLOTTERY_ORIGIN (예: http://127.0.0.1:8766) 이 있으면 동행복권 요청을 모두 그 서버로 보낸다 (fakes/dhlottery_server.py)
+        self.origin = urlsplit(origin or os.environ.get("DHLOTTERY_ORIGIN") or "")
+        # 공용 디스크 캐시는 실제 사이트의 페이지만 담는다 (대역 서버 응답이 다음 실제 실행에 쓰이지 않도록)
+        self.cache = cache or (http_cache.get_cache() if not self.origin.netloc else None)
+
+        # 호스트마다 별도의 커넥션 풀을 둔다 (www., ol., el. 이 서로의 연결을 기다리지 않도록)
+        pool_sizes = pool_sizes or {}
+        self.session.mount("http://", TimedHTTPAdapter())
+        self.session.mount("https://", TimedHTTPAdapter())
+        for host in DHLOTTERY_HOSTS:
+            pool_size = pool_sizes.get(host, DEFAULT_POOL_SIZE)
+            self.session.mount(
+                f"https://{host}/",
+                TimedHTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            )
 
     def __del__(self):
         self.session.close()
 
-    def post(self, url: str, headers: dict = None, data: dict = None) -> requests.Response:
-        session_headers = self.session.headers.copy()
-        if headers:
-            session_headers.update(headers)
-        res = self.session.post(url, headers=session_headers, data=data, timeout=10, allow_redirects=True)
-        res.raise_for_status()
-        return res
-
-    def get(self, url: str, headers: dict = None, params: dict = None) -> requests.Response:
-        session_headers = self.session.headers.copy()
-        if headers:
-            session_headers.update(headers)
-        res = self.session.get(url, headers=session_headers, params=params, timeout=10)
-        res.raise_for_status()
-        return res
+    def resolve(self, url: str) -> str:
+        """origin 이 설정되어 있으면 동행복권 호스트의 URL 을 같은 경로의 origin URL 로 바꾼다"""
+        if not self.origin.netloc:
+            return url
+        parts = urlsplit(url)
+        if parts.hostname not in DHLOTTERY_HOSTS:
+            return url
+        return urlunsplit((self.origin.scheme, self.origin.netloc, parts.path, parts.query, parts.fragment))
+
+    def post(self, url: str, headers: dict = None, data: dict = None, retry: bool = False) -> requests.Response:
+        """retry=True 는 다시 보내도 되는 조회용 POST 에만 쓴다 (구매/결제 요청은 retry.NEVER_RETRY_PATHS 로도 막는다)"""
+        return self._send("POST", url, retry, headers=headers, data=data)
+
+    def get(self, url: str, headers: dict = None, params: dict = None, retry: bool = True) -> requests.Response:
+        return self._send("GET", url, retry, headers=headers, params=params)
+
+    def _send(self, method: str, url: str, retryable: bool, **kwargs) -> requests.Response:
+        def attempt(number: int, remaining: float) -> requests.Response:
+            # 세션 헤더는 requests 가 요청마다 병합하므로 따로 복사하지 않는다
+            # (속도 제한은 원래 호스트 기준이라 대역 서버에서도 실제와 같은 간격으로 보낸다)
+            self.rate_limiter.acquire(url)
+
+            _reset_connection_timing()
+            started = time.perf_counter()
+            res = None
+            error = None
+            try:
+                res = self.session.request(method, self.resolve(url), timeout=min(self.timeout, remaining),
+                                           allow_redirects=True, **kwargs)
+                res.raise_for_status()
+                return res
+            except Exception as e:
+                error = type(e).__name__
+                raise
+            finally:
+                self._record_span(method, url, res, error, time.perf_counter() - started, number)
+
+        return self.retry_policy.call(attempt, url, retryable, self.circuit_breakers.get(url))
+
+    @staticmethod
+    def _record_span(method: str, url: str, res: requests.Response, error: str, total: float, attempt: int) -> None:
+        """요청 하나를 metrics 에 남긴다 (호스트/경로는 origin 으로 바꾸기 전의 원래 URL 기준)"""
+        parts = urlsplit(url)
+        dns = getattr(_connection_timing, "dns", 0.0)
+        connect = getattr(_connection_timing, "connect", 0.0)
+        tls = getattr(_connection_timing, "tls", 0.0)
+
+        ttfb = None
+        if res is not None:
+            # elapsed 는 요청을 보내기 시작해서 응답 헤더를 받을 때까지 (리다이렉트마다 따로 잰다)
+            elapsed = sum(r.elapsed.total_seconds() for r in (*res.history, res))
+            ttfb = max(elapsed - dns - connect - tls, 0.0)
+
+        metrics.get_recorder().record({
+            "ts": time.time(),
+            "host": parts.hostname or "",
+            "endpoint": _endpoint(parts),
+            "method": method,
+            "status": res.status_code if res is not None else 0,
+            "bytes": len(res.content) if res is not None else 0,
+            "reused": res is not None and getattr(_connection_timing, "opened", 0) == 0,
+            "dns": dns,
+            "connect": connect,
+            "tls": tls,
+            "ttfb": ttfb,
+            "total": total,
+            "error": error,
+            "attempt": attempt,
+        })
+
+    def get_cached(self, url: str, params: dict = None) -> requests.Response:
+        """공개 결과 페이지는 디스크 캐시(http_cache)를 거쳐 받는다, 그 밖의 URL 은 get() 과 같다"""
+        if self.cache is None or not http_cache.is_cacheable(url):
+            return self.get(url, params=params)
+        return self.cache.get(lambda cache_url, headers: self.get(cache_url, headers=headers), url, params)
+
+    def get_coalesced(self, url: str, params: dict = None, ttl: float = DEFAULT_COALESCE_TTL) -> requests.Response:
+        """
+        공개 페이지용 GET - 같은 URL 의 동시/반복 요청은 한 번만 보내고 응답을 공유한다
+        (응답 객체를 여러 곳에서 같이 읽으므로 수정하지 말 것)
+        """
+        key = (url, tuple(sorted((params or {}).items())))
+        return self.flights.do(key, lambda: self.get_cached(url, params=params), ttl=ttl)
+
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop():
+    """AsyncHttpClient 요청을 돌리는 프로세스 공용 이벤트 루프 (데몬 스레드 하나, 연결 풀이 이 루프에 묶인다)"""
+    # asyncio 는 import 가 수십 ms 라서 비동기 요청을 실제로 할 때 처음 가져온다
+    import asyncio
+
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="http", daemon=True).start()
+        return _loop
+
+
+def _as_requests_error(error: Exception, url: str) -> Exception:
+    """httpx 예외 -> retry 가 판단할 수 있는 같은 뜻의 requests 예외"""
+    import httpx
+    from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+    if isinstance(error, httpx.ConnectTimeout):
+        return requests.exceptions.ConnectTimeout(str(error))
+    if isinstance(error, httpx.ConnectError):
+        # requests 와 같이 연결을 맺지 못한 실패로 감싸서 retry.is_unsent 가 알아보게 한다
+        return requests.ConnectionError(MaxRetryError(None, url, NewConnectionError(None, str(error))))
+    if isinstance(error, httpx.TimeoutException):
+        return requests.exceptions.ReadTimeout(str(error))
+    if isinstance(error, httpx.TransportError):
+        return requests.ConnectionError(str(error))
+    return error
+
+
+class AsyncHttpClient:
+    """
+    HttpClient 와 같은 get/post 를 await 로 쓰는 asyncio 전송 계층 (httpx.AsyncClient)
+    - 동기 HttpClient 의 세션 쿠키·헤더 / origin / 호스트별 속도 제한 / 재시도 정책 / 회로 차단기 / 요청 기록을 같이 쓴다
+    - 호스트마다 연결 풀을 따로 두고 풀 크기(pool_sizes)만큼만 동시에 보낸다, 나머지 요청은 풀에서 차례를 기다린다
+    - 연결 풀이 공용 이벤트 루프(_get_loop)에 묶이므로 그 루프 안에서만 쓴다 (밖에서는 submit / run)
+    """
+
+    def __init__(self, http_client: HttpClient = None, pool_sizes: dict = None, pool_size: int = DEFAULT_POOL_SIZE):
+        self.http_client = http_client or HttpClientSingleton.get_instance()
+        self.pool_sizes = pool_sizes or {}
+        self.pool_size = pool_size
+        self._clients = {}
+
+    def submit(self, coro):
+        """coro 를 공용 루프에서 시작하고 concurrent.futures.Future 를 돌려준다 (cancel() 하면 요청도 끊는다)"""
+        import asyncio
+
+        return asyncio.run_coroutine_threadsafe(coro, _get_loop())
+
+    def run(self, coro):
+        """coro 를 공용 루프에서 실행하고 끝날 때까지 기다린다"""
+        return self.submit(coro).result()
+
+    async def post(self, url: str, headers: dict = None, data: dict = None, retry: bool = False):
+        """retry=True 는 다시 보내도 되는 조회용 POST 에만 쓴다 (HttpClient.post 와 같다)"""
+        return await self._send("POST", url, retry, headers=headers, data=data)
+
+    async def get(self, url: str, headers: dict = None, params: dict = None, retry: bool = True):
+        return await self._send("GET", url, retry, headers=headers, params=params)
+
+    async def aclose(self) -> None:
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            await client.aclose()
+
+    def _client_for(self, host: str):
+        import httpx
+
+        client = self._clients.get(host)
+        if client is None:
+            size = self.pool_sizes.get(host, self.pool_size)
+            # 풀이 가득 차 있으면 타임아웃 없이 차례를 기다린다 (요청 시간 제한은 요청마다 따로 준다)
+            client = self._clients[host] = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=size, max_keepalive_connections=size),
+                timeout=httpx.Timeout(self.http_client.timeout, pool=None),
+                follow_redirects=True,
+            )
+        return client
+
+    def _headers(self, method: str, url: str, headers: dict) -> dict:
+        merged = dict(self.http_client.session.headers)
+        merged.update(headers or {})
+        if "Cookie" not in merged:
+            # 로그인 세션(JSESSIONID)은 동기 세션의 쿠키 저장소에서 그 URL 에 맞는 것만 붙인다
+            cookie = requests.cookies.get_cookie_header(self.http_client.session.cookies, requests.Request(method, url))
+            if cookie:
+                merged["Cookie"] = cookie
+        return merged
+
+    async def _send(self, method: str, url: str, retryable: bool, **kwargs):
+        import asyncio
+        import httpx
+
+        http_client = self.http_client
+        target = http_client.resolve(url)
+        params = kwargs.pop("params", None)
+        if params:
+            # httpx 는 params 로 URL 의 기존 쿼리(method=...)를 바꿔 버리므로 requests 처럼 뒤에 붙인다
+            target = f"{target}{'&' if '?' in target else '?'}{urlencode(params)}"
+        client = self._client_for(urlsplit(target).netloc)
+        headers = self._headers(method, target, kwargs.pop("headers", None))
+
+        async def attempt(number: int, remaining: float):
+            # 토큰 버킷은 스레드를 재우므로 루프 밖에서 기다린다
+            await asyncio.get_running_loop().run_in_executor(None, http_client.rate_limiter.acquire, url)
+
+            _reset_connection_timing()
+            started = time.perf_counter()
+            res = None
+            error = None
+            try:
+                try:
+                    res = await client.request(method, target, headers=headers,
+                                               timeout=min(http_client.timeout, remaining), **kwargs)
+                except httpx.HTTPError as e:
+                    raise _as_requests_error(e, target) from e
+                if res.status_code >= 400:
+                    raise requests.HTTPError(f"{res.status_code} {res.reason_phrase} for url: {target}", response=res)
+                return res
+            except Exception as e:
+                error = type(e).__name__
+                raise
+            finally:
+                http_client._record_span(method, url, res, error, time.perf_counter() - started, number)
+
+        return await http_client.retry_policy.call_async(attempt, url, retryable, http_client.circuit_breakers.get(url))
+
 
 class HttpClientSingleton:
     _instance = None
@@ -30,4 +479,4 @@ class HttpClientSingleton:
     def get_instance():
         if HttpClientSingleton._instance is None:
             HttpClientSingleton._instance = HttpClient()
-        return HttpClientSingleton._instance
\ No newline at end of file
+        return HttpClientSingleton._instance
@@ -1,5 +1,8 @@
 import copy
 import requests
+
+import html_parser
+import metrics
 from HttpClient import HttpClientSingleton
 
 class AuthController:
@@ -24,13 +27,36 @@ class AuthController:
     _AUTH_CRED = ""
 
 
-    def __init__(self):
-        self.http_client = HttpClientSingleton.get_instance()
+    def __init__(self, http_client=None):
+        # 계정별로 독립된 세션을 쓰려면 http_client 를 직접 넘겨준다 (기본값: 프로세스 공용 클라이언트)
+        self.http_client = http_client or HttpClientSingleton.get_instance()
 
-    def login(self, user_id: str, password: str):
+    @metrics.phase("login")
+    def login(self, user_id: str, password: str, session_store=None) -> bool:
+        """
+        로그인 후 마이페이지 확인으로 성공 여부를 돌려준다
+        - session_store 가 있으면 저장된 JSESSIONID 가 아직 유효한지 먼저 확인하고, 유효하면 로그인 요청을 생략한다
+        """
         assert type(user_id) == str
         assert type(password) == str
 
+        if session_store is not None:
+            if session_store.has_recent_failure(user_id, password):
+                print("❌ 최근 같은 비밀번호로 로그인에 실패한 기록이 있어 로그인을 시도하지 않습니다.")
+                print("💡 비밀번호를 확인하거나 SESSION_STORE_DIR 의 세션 파일을 삭제해주세요.")
+                return False
+
+            saved_auth_cred = session_store.load(user_id, password)
+            if saved_auth_cred:
+                self._update_auth_cred(saved_auth_cred)
+                try:
+                    if self.is_logged_in():
+                        print("✅ 저장된 세션으로 로그인 상태 확인")
+                        return True
+                    print("⚠️ 저장된 세션이 만료되어 다시 로그인합니다.")
+                except requests.RequestException as e:
+                    print(f"⚠️ 저장된 세션 확인 요청 실패 - 다시 로그인합니다: {type(e).__name__}: {e}")
+
         default_auth_cred = (
             self._get_default_auth_cred()
         )  # JSessionId 값을 받아온 후, 그 값에 인증을 씌우는 방식
@@ -43,6 +69,40 @@ class AuthController:
 
         self._update_auth_cred(default_auth_cred)
 
+        # 로그인 실패해도 jsession 값이 갱신되기 때문에, 마이페이지 방문으로 판단
+        # + 비번 5번 틀렸을 경우엔 비번 정확해도 로그인 실패함
+        # (확인 요청 자체가 실패하면 예외가 그대로 올라가므로 실패 기록을 남기지 않는다)
+        logged_in = self.is_logged_in()
+        if logged_in:
+            print("✅ 로그인 성공")
+        else:
+            print("❌ 로그인 실패 - 아이디/비밀번호 또는 계정 잠김 여부를 확인해주세요.")
+
+        if session_store is not None:
+            if logged_in:
+                session_store.save(user_id, password, default_auth_cred)
+            else:
+                session_store.mark_failed(user_id, password)
+
+        return logged_in
+
+    def is_logged_in(self) -> bool:
+        """
+        마이페이지에 예치금 영역이 보이면 로그인된 세션으로 판단한다
+        - 요청 자체가 실패하면(연결 오류, 5xx 등) 로그인 여부를 알 수 없으므로 requests 예외를 그대로 올린다
+        """
+        if not self._AUTH_CRED:
+            return False
+
+        res = self.http_client.post(
+            "https://dhlottery.co.kr/userSsl.do?method=myPage",
+            headers=self.add_auth_cred_to_headers(self._REQ_HEADERS),
+            retry=True
+        )
+
+        balance = html_parser.extract(res.text, lambda doc: doc.text("p.total_new strong"), only="p.total_new")
+        return balance is not None
+
     def add_auth_cred_to_headers(self, headers: dict) -> str:
         assert type(headers) == dict
 
@@ -99,7 +159,4 @@ class AuthController:
     def _update_auth_cred(self, j_session_id: str) -> None:
         assert type(j_session_id) == str
 
-        # TODO: judge whether login is success or not
-        # 로그인 실패해도 jsession 값이 갱신되기 때문에, 마이페이지 방문 등으로 판단해야 할 듯
-        # + 비번 5번 틀렸을 경우엔 비번 정확해도 로그인 실패함
         self._AUTH_CRED = j_session_id
@@ -0,0 +1,186 @@
+import math
+import os
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import lotto_stats
+import prize
+import recommender
+
+TICKET_PRICE = 1000
+
+# 등수별 당첨금 (1~3등은 회차마다 달라지므로 최근 평균에 가까운 값, 4/5등은 고정 금액)
+PRIZE_AMOUNTS = {
+    1: 2_000_000_000,
+    2: 55_000_000,
+    3: 1_500_000,
+    4: 50_000,
+    5: 5_000,
+    0: 0,
+}
+
+# 무작위 한 게임의 등수별 확률 (전체 조합 C(45, 6) 중 해당 등수 조합 수)
+_COMBINATIONS = math.comb(45, 6)
+CHANCE = {
+    1: 1 / _COMBINATIONS,
+    2: 6 / _COMBINATIONS,
+    3: 228 / _COMBINATIONS,
+    4: 11_115 / _COMBINATIONS,
+    5: 182_780 / _COMBINATIONS,
+}
+CHANCE[0] = 1 - sum(CHANCE.values())
+
+# 추천기를 만들 때 필요한 최소 과거 회차 수 / 작업 하나가 맡는 회차 수 (결과가 워커 수와 무관하도록 고정)
+MIN_HISTORY = 100
+CHUNK_DRAWS = 25
+
+DEFAULT_SEED = int(os.environ.get("BACKTEST_SEED", 645))
+DEFAULT_WORKERS = int(os.environ.get("BACKTEST_WORKERS", os.cpu_count() or 1))
+
+_PRIZE_TABLE = np.array([PRIZE_AMOUNTS[g] for g in range(6)], dtype=np.float64)
+_GRADES = (1, 2, 3, 4, 5, 0)
+
+
+def random_tickets(past: lotto_stats.DrawHistory, count: int, rng: np.random.Generator) -> np.ndarray:
+    """generate_fallback_numbers 와 같은 균등 무작위 (count, 6)"""
+    return np.argpartition(rng.random((count, 45)), 6, axis=1)[:, :6] + 1
+
+
+def local_tickets(past: lotto_stats.DrawHistory, count: int, rng: np.random.Generator) -> np.ndarray:
+    """그 회차 직전까지의 이력으로 만든 LocalRecommender 의 균형 조건을 통과한 후보 (count, 6)"""
+    local = recommender.LocalRecommender.from_history(past)
+    local.rng = rng
+
+    picked, total = [], 0
+    while total < count:
+        candidates = local.sample(max(count - total, 64) * 2)
+        candidates = candidates[local.balanced(candidates)]
+        picked.append(candidates)
+        total += len(candidates)
+    return np.concatenate(picked)[:count]
+
+
+STRATEGIES = {
+    "random": random_tickets,
+    "local": local_tickets,
+}
+
+_history = None
+
+
+def _init_worker(rounds, dates, numbers, bonus) -> None:
+    global _history
+    _history = lotto_stats.DrawHistory(rounds, dates, numbers, bonus)
+
+
+def _run_chunk(strategy: str, start: int, stop: int, tickets_per_draw: int, seed_seq) -> tuple:
+    """start~stop-1 번째 회차마다 그 이전 이력만 보고 게임을 만들어 채점한다 -> (등수별 개수, 수익률 합, 제곱 합)"""
+    make_tickets = STRATEGIES[strategy]
+    rng = np.random.default_rng(seed_seq)
+
+    counts = np.zeros(6, dtype=np.int64)
+    total = 0.0
+    squares = 0.0
+    for i in range(start, stop):
+        past = lotto_stats.DrawHistory(_history.rounds[:i], _history.dates[:i], _history.numbers[:i], _history.bonus[:i])
+        tickets = make_tickets(past, tickets_per_draw, rng)
+        grades = prize.grade(tickets, _history.numbers[i], int(_history.bonus[i]))
+
+        counts += np.bincount(grades, minlength=6)
+        returns = _PRIZE_TABLE[grades] / TICKET_PRICE
+        total += float(returns.sum())
+        squares += float((returns * returns).sum())
+    return counts, total, squares
+
+
+def wilson_interval(hits: int, n: int, z: float = 1.96) -> tuple:
+    """이항 비율의 Wilson 신뢰 구간 (1등처럼 거의 안 나오는 등수에도 0 아래로 내려가지 않는다)"""
+    if n == 0:
+        return 0.0, 0.0
+    p = hits / n
+    denominator = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+class Backtester:
+    """
+    추천 전략을 역대 당첨 번호 전체에 대해 다시 돌려보는 몬테카를로 백테스트
+    - 회차 i 의 게임은 i 이전 이력만 보고 만든다 (미래 정보 없음)
+    - 회차 구간을 CHUNK_DRAWS 개씩 작업으로 나눠 프로세스 풀에서 실행한다
+    - 작업마다 SeedSequence 로 나눈 독립 난수를 쓰므로 같은 seed 면 워커 수와 상관없이 결과가 같다
+    """
+
+    def __init__(self, history: lotto_stats.DrawHistory, seed: int = DEFAULT_SEED, workers: int = DEFAULT_WORKERS):
+        assert len(history) > MIN_HISTORY, f"백테스트에는 {MIN_HISTORY}회차보다 많은 이력이 필요합니다"
+        assert workers >= 1
+
+        self.history = history
+        self.seed = seed
+        self.workers = workers
+
+    def _chunks(self) -> list:
+        return [(start, min(start + CHUNK_DRAWS, len(self.history)))
+                for start in range(MIN_HISTORY, len(self.history), CHUNK_DRAWS)]
+
+    def run(self, strategy: str, tickets_per_draw: int = 1000) -> dict:
+        assert strategy in STRATEGIES, f"알 수 없는 전략: {strategy}"
+        assert tickets_per_draw >= 1
+
+        chunks = self._chunks()
+        # 전략마다 다른 난수 흐름을 쓰도록 전략 이름을 엔트로피에 섞는다
+        seeds = np.random.SeedSequence([self.seed, *strategy.encode()]).spawn(len(chunks))
+        args = [(strategy, start, stop, tickets_per_draw, seed_seq) for (start, stop), seed_seq in zip(chunks, seeds)]
+        init_args = (self.history.rounds, self.history.dates, self.history.numbers, self.history.bonus)
+
+        started_at = time.perf_counter()
+        if self.workers == 1:
+            _init_worker(*init_args)
+            results = [_run_chunk(*arg) for arg in args]
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=init_args) as executor:
+                results = list(executor.map(_run_chunk, *zip(*args)))
+        elapsed = time.perf_counter() - started_at
+
+        counts = sum(result[0] for result in results)
+        total = sum(result[1] for result in results)
+        squares = sum(result[2] for result in results)
+        n = int(counts.sum())
+
+        mean = total / n
+        variance = max(squares / n - mean * mean, 0.0)
+        margin = 1.96 * math.sqrt(variance / n)
+
+        return {
+            "strategy": strategy,
+            "draws": len(self.history) - MIN_HISTORY,
+            "tickets": n,
+            "elapsed": elapsed,
+            "counts": {g: int(counts[g]) for g in _GRADES},
+            "rates": {g: counts[g] / n for g in _GRADES},
+            "rate_ci": {g: wilson_interval(int(counts[g]), n) for g in _GRADES},
+            "return_mean": mean,
+            "return_ci": (mean - margin, mean + margin),
+        }
+
+
+def expected_return_by_chance() -> float:
+    """무작위 게임 한 장의 기대 수익률 (당첨금 / 게임 가격)"""
+    return sum(CHANCE[g] * PRIZE_AMOUNTS[g] for g in _GRADES) / TICKET_PRICE
+
+
+def print_report(result: dict) -> None:
+    print(f"🎲 전략 '{result['strategy']}': {result['draws']}회차 x {result['tickets'] // max(result['draws'], 1):,}게임"
+          f" = {result['tickets']:,}게임 ({result['elapsed']:.1f}s)")
+    for g in _GRADES:
+        low, high = result["rate_ci"][g]
+        ratio = result["rates"][g] / CHANCE[g]
+        print(f"   {prize.GRADE_NAMES[g]}: {result['counts'][g]:>10,}게임  {result['rates'][g]:.3e}"
+              f" (95% {low:.3e}~{high:.3e}, 무작위 대비 {ratio:.2f}배)")
+    low, high = result["return_ci"]
+    print(f"   💰 기대 수익률: {result['return_mean'] * 100:.2f}% (95% {low * 100:.2f}%~{high * 100:.2f}%,"
+          f" 무작위 이론값 {expected_return_by_chance() * 100:.2f}%)")
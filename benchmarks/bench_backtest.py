@@ -0,0 +1,38 @@
+"""
+백테스트 워커 수별 처리량 (합성 당첨 이력 사용, 네트워크 불필요)
+
+    python3 benchmarks/bench_backtest.py [회차당 게임 수] [전략]
+
+- 같은 seed 로 워커 1, 2, 4, ... cpu_count 개를 돌려 초당 게임 수를 비교한다
+- 워커 수가 달라도 등수 분포가 같은지(재현성)도 함께 확인한다
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import backtest  # noqa: E402
+from bench_recommender import synthetic_history  # noqa: E402
+
+
+def main():
+    tickets_per_draw = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    strategy = sys.argv[2] if len(sys.argv) > 2 else "random"
+
+    history = synthetic_history()
+    cpus = os.cpu_count() or 1
+    workers_list = sorted({1, *[w for w in (2, 4, 8, 16, 32) if w <= cpus], cpus})
+
+    print(f"전략 '{strategy}', {len(history)}회차 이력, 회차당 {tickets_per_draw:,}게임 (CPU {cpus}개)")
+    baseline = None
+    for workers in workers_list:
+        result = backtest.Backtester(history, seed=1, workers=workers).run(strategy, tickets_per_draw)
+        if baseline is None:
+            baseline = result
+        assert result["counts"] == baseline["counts"], "워커 수에 따라 결과가 달라졌습니다"
+        print(f"   워커 {workers:>2}개: {result['elapsed']:6.2f}s / {result['tickets'] / result['elapsed'] / 1e6:5.2f}M 게임/s"
+              f" / 속도 {baseline['elapsed'] / result['elapsed']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
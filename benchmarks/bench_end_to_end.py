@@ -0,0 +1,102 @@
+"""
+buy / check 종단 간 지연 시간 (가짜 동행복권 서버 사용, 네트워크/계정 불필요)
+
+    python3 benchmarks/bench_end_to_end.py [실행 횟수] [계정 수]
+
+- fakes/dhlottery_server.py 를 띄우고 DHLOTTERY_ORIGIN 으로 모든 동행복권 요청을 그쪽으로 보낸다
+- 번호 추천은 RECOMMENDER=local (OpenAI 호출 없음), 알림은 서버의 /webhook 으로 보낸다
+- 계정별: 로그인 / buy_account / check_account 각각의 p50, p95
+- 전체: fleet.run_accounts 로 계정 수만큼 동시에 buy / check 했을 때 전체 소요 시간의 p50, p95
+서버 응답 시간은 LATENCY 초 (+-20%), 호스트별 속도 제한(HOST_RATE_PER_SEC / HOST_BURST)은 실제 설정 그대로 쓴다
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from fakes.dhlottery_server import FakeDhlotteryServer  # noqa: E402
+
+LATENCY = 0.05
+COUNT = 5
+
+
+def percentile(values: list, p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def report(name: str, values: list) -> None:
+    print(f"   {name:<16}: p50 {percentile(values, 50) * 1000:7.1f} ms / p95 {percentile(values, 95) * 1000:7.1f} ms"
+          f" / 최대 {max(values) * 1000:7.1f} ms")
+
+
+def timed(fn, *args):
+    started_at = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn(*args)
+    return result, time.perf_counter() - started_at
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    account_count = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    with FakeDhlotteryServer(latency=LATENCY, seed=1) as fake, tempfile.TemporaryDirectory() as purchases:
+        os.environ["DHLOTTERY_ORIGIN"] = fake.origin
+        os.environ["RECOMMENDER"] = "local"
+        os.environ.pop("SESSION_STORE_DIR", None)
+        # 가짜 서버에서 산 표를 실제 구매 기록(data/purchases)에 남기지 않는다
+        os.environ["PURCHASE_STORE_DIR"] = purchases
+
+        import auth
+        import fleet
+        import notification
+        import steps
+        from HttpClient import HttpClient
+
+        accounts = [
+            {"username": f"user{i:02d}", "password": "pw", "count": COUNT, "webhook_url": fake.webhook_url}
+            for i in range(account_count)
+        ]
+
+        print(f"가짜 동행복권 서버 {fake.origin} (응답 {LATENCY}s), 실행 {runs}회, 계정 {account_count}개")
+
+        login, buy, check = [], [], []
+        for run in range(runs):
+            account = accounts[run % account_count]
+            authCtrl = auth.AuthController(HttpClient())
+            logged_in, elapsed = timed(authCtrl.login, account["username"], account["password"])
+            assert logged_in, "가짜 서버 로그인 실패"
+            login.append(elapsed)
+
+            bought, elapsed = timed(steps.buy_account, authCtrl, account["username"], COUNT, account["webhook_url"])
+            assert bought["lotto"]["result"]["resultMsg"] == "SUCCESS", bought["lotto"]
+            buy.append(elapsed)
+
+            _, elapsed = timed(steps.check_account, authCtrl, account["webhook_url"], account["username"])
+            check.append(elapsed)
+
+        print("계정별")
+        report("로그인", login)
+        report("buy_account", buy)
+        report("check_account", check)
+
+        print(f"전체 ({account_count}개 계정, 워커 {fleet.DEFAULT_WORKERS}개, 로그인 포함)")
+        for action in ("buy", "check"):
+            elapsed = []
+            for _ in range(max(1, runs // 2)):
+                results, _ = timed(fleet.run_accounts, accounts, action)
+                assert all(r["status"] == "OK" for r in results), [r["detail"] for r in results]
+                elapsed.append(results[0]["fleet_elapsed"])
+            report(f"{action}-all", elapsed)
+
+        notification.flush()
+        print(f"요청 {sum(fake.hits.values())}건 / 구매 {fake.purchases}건 / 알림 {notification.get_queue().sent}건")
+
+
+if __name__ == "__main__":
+    main()
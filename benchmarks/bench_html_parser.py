@@ -0,0 +1,73 @@
+"""
+HTML 파서 백엔드별 파싱 시간 / 최대 메모리 비교
+
+    python3 benchmarks/bench_html_parser.py [반복 횟수]
+
+fixtures/html 의 저장된 페이지마다 실제 코드와 같은 추출을 각 백엔드로 실행한다.
+'html5lib (전체 트리)' 행은 기존 방식(전체 html5lib 파싱 후 find)과 같은 기준선이다.
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import html_parser  # noqa: E402
+import lotto645  # noqa: E402
+from draw_info import MainPageInfo  # noqa: E402
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "fixtures", "html")
+
+# 페이지 종류: (파일, only 선택자, 추출 함수)
+PAGES = {
+    "main (회차)": ("main.html", "strong", MainPageInfo._read_rounds),
+    "myPage (잔액)": ("my_page.html", "p.total_new", lambda doc: doc.text("p.total_new strong")),
+    "game645 (추첨일)": ("game645.html", "input", lotto645.Lotto645._read_draw_dates),
+    "lottoBuyList": ("lotto_buy_list.html", "table.tbl_data", lotto645.Lotto645._read_buy_list),
+    "statByNumber": ("stat_by_number.html", "table", lambda doc: doc.rows(1)),
+    "noViewNumber": ("no_view_number.html", "table", lambda doc: doc.rows(0)),
+    "byWin": ("by_win.html", "table", lambda doc: doc.rows(0)),
+}
+
+
+def measure(fn, iterations: int):
+    fn()  # warm-up
+
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = (time.perf_counter() - started_at) / iterations
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    backends = html_parser.available_backends()
+
+    print(f"백엔드: {', '.join(backends)} / 반복 {iterations}회")
+    print(f"{'페이지':<18} {'백엔드':<22} {'평균 시간(ms)':>14} {'최대 메모리(KB)':>16}")
+
+    for page, (filename, only, extractor) in PAGES.items():
+        with open(os.path.join(FIXTURE_DIR, filename), encoding="utf-8") as f:
+            html = f.read()
+
+        cases = [("html5lib (전체 트리)", lambda: extractor(html_parser.parse(html, "html5lib")))]
+        for backend in backends:
+            if backend == html_parser.FALLBACK_BACKEND:
+                continue
+            cases.append((backend, lambda backend=backend: extractor(html_parser.parse(html, backend, only))))
+
+        for name, fn in cases:
+            elapsed, peak = measure(fn, iterations)
+            print(f"{page:<18} {name:<22} {elapsed * 1000:>14.2f} {peak / 1024:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+ChatGPT 추천 지연 시간 비교 (가짜 OpenAI 서버 사용, 네트워크/API 키 불필요)
+
+    python3 benchmarks/bench_llm_runner.py [실행 횟수]
+
+- 기존: 호출마다 새 OpenAI 클라이언트, 상세 분석 프롬프트 -> (번호가 부족하면) 역대 당첨 번호 프롬프트를 순서대로
+- LLMRunner: 클라이언트 재사용, 상세 분석 응답이 HEDGE_DELAY 안에 없거나 부족하면 두 번째 프롬프트를 함께 보낸다
+서버 응답: 대부분 LATENCY 초, TAIL_RATIO 비율로 TAIL_LATENCY 초, INVALID_RATIO 비율로 번호 없는 응답
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from openai import OpenAI  # noqa: E402
+
+import llm_runner  # noqa: E402
+import number_parser  # noqa: E402
+from fakes.openai_server import FakeOpenAIServer  # noqa: E402
+
+LATENCY = 0.2
+TAIL_RATIO = 0.1
+TAIL_LATENCY = 2.0
+INVALID_RATIO = 0.1
+HEDGE_DELAY = 0.4
+
+PROMPTS = [("상세분석", "상세 분석 프롬프트"), ("역대당첨번호기반", "역대 당첨 번호 프롬프트")]
+
+
+def legacy(base_url: str) -> list:
+    for _, prompt_text in PROMPTS:
+        client = OpenAI(api_key="sk-fake", base_url=base_url)
+        response = client.chat.completions.create(
+            model=llm_runner.MODEL,
+            messages=[{"role": "system", "content": llm_runner.SYSTEM_PROMPT}, {"role": "user", "content": prompt_text}],
+        )
+        numbers = number_parser.parse_number_sets(response.choices[0].message.content, limit=5)
+        if len(numbers) >= 5:
+            return numbers
+    return []
+
+
+def percentile(values: list, p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def run(name: str, fn, fake: FakeOpenAIServer, runs: int) -> None:
+    fake.requests = 0
+    elapsed, misses = [], 0
+    for _ in range(runs):
+        started_at = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            numbers = fn()
+        elapsed.append(time.perf_counter() - started_at)
+        misses += len(numbers) < 5
+
+    print(f"   {name:<22}: p50 {percentile(elapsed, 50) * 1000:7.1f} ms / p95 {percentile(elapsed, 95) * 1000:7.1f} ms"
+          f" / 최대 {max(elapsed) * 1000:7.1f} ms / 요청 {fake.requests / runs:.2f}회 / 실패 {misses}")
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+
+    with FakeOpenAIServer(latency=LATENCY, tail_ratio=TAIL_RATIO, tail_latency=TAIL_LATENCY,
+                          invalid_ratio=INVALID_RATIO, seed=1) as fake:
+        runner = llm_runner.LLMRunner("sk-fake", base_url=fake.base_url, hedge_delay=HEDGE_DELAY, deadline=10)
+
+        print(f"추천 {runs}회 (응답 {LATENCY}s, {TAIL_RATIO:.0%} 확률로 {TAIL_LATENCY}s, {INVALID_RATIO:.0%} 확률로 번호 없음)")
+        run("기존 (순차)", lambda: legacy(fake.base_url), fake, runs)
+        run("LLMRunner (hedge)", lambda: runner.first_valid(PROMPTS, need=5), fake, runs)
+
+
+if __name__ == "__main__":
+    main()
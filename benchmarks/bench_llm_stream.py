@@ -0,0 +1,56 @@
+"""
+장황한 ChatGPT 응답에서 스트림 조기 종료 효과 측정 (가짜 OpenAI 서버 사용)
+
+    python3 benchmarks/bench_llm_stream.py [실행 횟수]
+
+응답 = 번호 5세트 + VERBOSE_CHARS 글자의 설명, CHUNK_SIZE 글자마다 TOKEN_LATENCY 초가 걸린다고 가정한다.
+- 전체 응답: 스트림 없이 생성이 끝날 때까지 기다린 뒤 파싱
+- 스트림: 조각이 올 때마다 파싱하고 need 세트가 모이면 연결을 끊는다
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import llm_runner  # noqa: E402
+from fakes.openai_server import FakeOpenAIServer  # noqa: E402
+
+LATENCY = 0.3
+TOKEN_LATENCY = 0.005
+CHUNK_SIZE = 4
+VERBOSE_CHARS = 1500
+
+
+def run(name: str, runner: llm_runner.LLMRunner, fake: FakeOpenAIServer, runs: int, need: int) -> None:
+    fake.sent_chars = 0
+    elapsed, misses = [], 0
+    for _ in range(runs):
+        started_at = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            numbers = runner.recommend("프롬프트", "벤치마크", need)
+        elapsed.append(time.perf_counter() - started_at)
+        misses += len(numbers) < need
+
+    # 끊긴 스트림의 서버 쪽 기록이 끝날 시간을 준다
+    time.sleep(TOKEN_LATENCY * 4)
+    print(f"   {name:<18}: 평균 {sum(elapsed) / runs * 1000:7.1f} ms / 최대 {max(elapsed) * 1000:7.1f} ms"
+          f" / 수신 {fake.sent_chars / runs:6.0f}자 / 실패 {misses}")
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    with FakeOpenAIServer(latency=LATENCY, token_latency=TOKEN_LATENCY, chunk_size=CHUNK_SIZE,
+                          verbose_chars=VERBOSE_CHARS, seed=1) as fake:
+        print(f"추천 {runs}회 (첫 토큰 {LATENCY}s, {CHUNK_SIZE}글자당 {TOKEN_LATENCY * 1000:.0f}ms, 설명 {VERBOSE_CHARS}자)")
+        for need in (5, 3):
+            print(f"{need}세트 필요")
+            run("전체 응답", llm_runner.LLMRunner("sk-fake", base_url=fake.base_url, stream=False), fake, runs, need)
+            run("스트림 조기 종료", llm_runner.LLMRunner("sk-fake", base_url=fake.base_url, stream=True), fake, runs, need)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+ChatGPT 응답 파서 처리량 비교 (기존 다중 정규식 패스 vs number_parser 단일 스캔)
+
+    python3 benchmarks/bench_number_parser.py [반복 횟수]
+
+fixtures/llm/responses.json 의 응답마다
+1. number_parser 결과가 expected 와 같은지 (통째로 / 7글자씩 나눠 넣었을 때 모두) 확인하고
+2. 기존 get_chatgpt_recommendation 파싱과 결과 번호 조합이 다른 경우를 보여준 뒤
+3. 전체 말뭉치를 반복 파싱하는 처리량을 비교한다.
+"""
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import number_parser  # noqa: E402
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "fixtures", "llm", "responses.json")
+
+
+def legacy_parse(generated_text: str) -> list:
+    """기존 controller.get_chatgpt_recommendation 의 파싱 부분 (출력 제외)"""
+
+    def is_valid_lotto_number(num_str):
+        try:
+            if not re.match(r'^\d+$', num_str.strip()):
+                return False
+            if '*' in num_str or '***' in num_str:
+                return False
+            num = int(num_str.strip())
+            if num < 1 or num > 45:
+                return False
+            if len(str(num)) > 2:
+                return False
+            return True
+        except (ValueError, AttributeError):
+            return False
+
+    def validate_number_set(nums):
+        if not isinstance(nums, list) or len(nums) != 6:
+            return False
+        try:
+            for num in nums:
+                if not isinstance(num, int) or num < 1 or num > 45:
+                    return False
+                num_str = str(num)
+                if '*' in num_str or '***' in num_str or len(num_str) > 2:
+                    return False
+            if len(set(nums)) != 6:
+                return False
+            return True
+        except (ValueError, TypeError):
+            return False
+
+    def from_elements(content):
+        elements = [elem.strip() for elem in content.split(',')]
+        if len(elements) == 6:
+            valid_nums = [int(elem) for elem in elements if is_valid_lotto_number(elem)]
+            if len(valid_nums) == 6 and validate_number_set(valid_nums):
+                return valid_nums
+        return None
+
+    numbers = []
+
+    for match in re.findall(r'\[\s*\[.*?\]\s*\]', generated_text, re.DOTALL):
+        for candidate in (match, re.sub(r'\s+', ' ', re.sub(r',\s*\]', ']', re.sub(r'\[\s*,', '[', re.sub(r'\[,\s*\]', '[]', re.sub(r'\*+', '', match))))).strip()):
+            try:
+                parsed_numbers = json.loads(candidate)
+            except (json.JSONDecodeError, ValueError, TypeError):
+                continue
+            if isinstance(parsed_numbers, list):
+                numbers = [num_set for num_set in parsed_numbers if validate_number_set(num_set)]
+                if numbers:
+                    return numbers
+            break
+
+    for match in re.findall(r'\[([^\]]+)\]', generated_text):
+        nums = from_elements(match)
+        if nums:
+            numbers.append(nums)
+
+    if not numbers:
+        for line in generated_text.split('\n'):
+            line = line.strip()
+            if '[' in line and ']' in line:
+                bracket_content = re.search(r'\[([^\]]+)\]', line)
+                if bracket_content:
+                    nums = from_elements(bracket_content.group(1))
+                    if nums:
+                        numbers.append(nums)
+
+    if not numbers:
+        number_pattern = r'(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)'
+        for match in re.findall(number_pattern, generated_text):
+            valid_nums = [int(num_str) for num_str in match if is_valid_lotto_number(num_str)]
+            if len(valid_nums) == 6 and validate_number_set(valid_nums):
+                numbers.append(valid_nums)
+
+    unique_numbers = []
+    for num_set in numbers:
+        if validate_number_set(num_set) and num_set not in unique_numbers:
+            unique_numbers.append(num_set)
+    return unique_numbers
+
+
+def streamed(text: str, chunk: int = 7) -> list:
+    parser = number_parser.NumberSetParser()
+    for start in range(0, len(text), chunk):
+        parser.feed(text[start:start + chunk])
+    return parser.close()
+
+
+def combinations(sets: list) -> set:
+    return {tuple(sorted(numbers)) for numbers in sets}
+
+
+def measure(parse, texts: list, iterations: int) -> float:
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        for text in texts:
+            parse(text)
+    return time.perf_counter() - started_at
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        corpus = json.load(f)
+
+    for case in corpus:
+        assert number_parser.parse_number_sets(case["text"]) == case["expected"], case["name"]
+        assert streamed(case["text"]) == case["expected"], case["name"]
+    print(f"✅ 말뭉치 {len(corpus)}건 모두 expected 와 일치 (통째로 / 나눠 넣기)")
+
+    for case in corpus:
+        legacy = legacy_parse(case["text"])
+        if combinations(legacy) != combinations(case["expected"]) or len(legacy) != len(case["expected"]):
+            print(f"   기존 파서와 다름 - {case['name']}: 기존 {legacy} / 새 파서 {case['expected']}")
+
+    texts = [case["text"] for case in corpus]
+    size = sum(len(text.encode("utf-8")) for text in texts) * iterations
+
+    legacy = measure(legacy_parse, texts, iterations)
+    single = measure(number_parser.parse_number_sets, texts, iterations)
+
+    print(f"말뭉치 {len(corpus)}건 x {iterations}회")
+    print(f"   기존 다중 패스 : {legacy * 1000:8.1f} ms ({size / legacy / 1e6:6.2f} MB/s)")
+    print(f"   단일 스캔      : {single * 1000:8.1f} ms ({size / single / 1e6:6.2f} MB/s)")
+    print(f"   개선           : {legacy / single:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+구매 게임 채점 속도 비교 (네트워크 불필요)
+
+    python3 benchmarks/bench_prize.py [게임 수]
+
+- 파이썬 루프: 게임마다 set 교집합으로 맞힌 개수를 세고 등수를 정한다
+- prize.grade: (게임 수, 6) 번호 행렬 전체를 한 번의 NumPy 연산으로 채점
+- prize.grade_rounds: 게임마다 회차가 다를 때 DrawHistory 로 한 번에 채점
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import prize  # noqa: E402
+from bench_recommender import synthetic_history  # noqa: E402
+
+
+def python_grade(tickets: list, numbers: list, bonus: int) -> list:
+    drawn = set(numbers)
+    grades = []
+    for ticket in tickets:
+        matches = len(drawn.intersection(ticket))
+        if matches == 6:
+            grades.append(1)
+        elif matches == 5:
+            grades.append(2 if bonus in ticket else 3)
+        elif matches == 4:
+            grades.append(4)
+        elif matches == 3:
+            grades.append(5)
+        else:
+            grades.append(0)
+    return grades
+
+
+def timed(fn) -> tuple:
+    started_at = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started_at
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    rng = np.random.default_rng(1)
+    tickets = np.sort(np.argsort(rng.random((count, 45)), axis=1)[:, :6] + 1, axis=1).astype(np.int16)
+    history = synthetic_history()
+    numbers, bonus = history.numbers[-1].tolist(), int(history.bonus[-1])
+    ticket_lists = tickets.tolist()
+
+    expected, legacy_elapsed = timed(lambda: python_grade(ticket_lists, numbers, bonus))
+    grades, elapsed = timed(lambda: prize.grade(tickets, numbers, bonus))
+    assert grades.tolist() == expected
+
+    rounds = rng.integers(1, len(history) + 1, size=count)
+    per_round, rounds_elapsed = timed(lambda: prize.grade_rounds(tickets, rounds, history))
+    expected_rounds = [
+        python_grade([t], history.numbers[r - 1].tolist(), int(history.bonus[r - 1]))[0]
+        for t, r in zip(ticket_lists[:2000], rounds[:2000])
+    ]
+    assert per_round[:2000].tolist() == expected_rounds
+
+    print(f"{count:,}게임 채점 / 등수 분포 {prize.count_grades(grades)}")
+    print(f"   파이썬 루프        : {legacy_elapsed * 1000:8.1f} ms")
+    print(f"   prize.grade        : {elapsed * 1000:8.1f} ms ({legacy_elapsed / elapsed:.0f}x)")
+    print(f"   prize.grade_rounds : {rounds_elapsed * 1000:8.1f} ms (회차별 당첨 번호)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+번호 추천 경로별 지연 시간 비교
+
+    python3 benchmarks/bench_recommender.py [반복 횟수] [--gpt]
+
+- 로컬 추천기: 합성 당첨 이력(1,200회차)으로 LocalRecommender 생성 + 5세트 추천
+- 무작위: 기존 generate_fallback_numbers 와 같은 random.sample
+- --gpt: OPEN_API_KEY 가 있으면 steps.get_manual_numbers_from_gpt() 전체를 실제로 호출해 비교한다
+  (동행복권 통계 페이지 + OpenAI 요청이 포함되므로 네트워크가 필요하다)
+"""
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import lotto_stats  # noqa: E402
+import recommender  # noqa: E402
+
+
+def synthetic_history(draws: int = 1200, seed: int = 0) -> lotto_stats.DrawHistory:
+    rng = np.random.default_rng(seed)
+    numbers = np.sort(np.argsort(rng.random((draws, 45)), axis=1)[:, :7] + 1, axis=1)
+    return lotto_stats.DrawHistory(
+        range(1, draws + 1),
+        [f"draw-{i}" for i in range(1, draws + 1)],
+        numbers[:, :6],
+        numbers[:, 6],
+    )
+
+
+def measure(fn, iterations: int) -> float:
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started_at) / iterations
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    iterations = int(args[0]) if args else 200
+    history = synthetic_history()
+
+    def local():
+        return recommender.LocalRecommender.from_history(history).recommend(5)
+
+    def local_prepared(engine=recommender.LocalRecommender.from_history(history)):
+        return engine.recommend(5)
+
+    def plain_random():
+        return [sorted(random.sample(range(1, 46), 6)) for _ in range(5)]
+
+    # 추천 결과가 모두 조건을 만족하는지 먼저 확인
+    sets = np.array(local())
+    assert len({tuple(s) for s in sets.tolist()}) == 5
+    assert recommender.LocalRecommender.balanced(sets).all()
+
+    rows = [
+        ("로컬 추천기 (통계 계산 포함)", measure(local, iterations)),
+        ("로컬 추천기 (추천만)", measure(local_prepared, iterations)),
+        ("무작위 (random.sample)", measure(plain_random, iterations)),
+    ]
+
+    if "--gpt" in sys.argv:
+        if os.environ.get("OPEN_API_KEY"):
+            import steps
+            rows.append(("ChatGPT 경로 (전체)", measure(steps.get_manual_numbers_from_gpt, 1)))
+        else:
+            print("⚠️ OPEN_API_KEY 가 없어 ChatGPT 경로는 건너뜁니다")
+
+    print(f"5세트 추천 1회당 시간 ({iterations}회 평균, ChatGPT 는 1회)")
+    for name, elapsed in rows:
+        print(f"   {name:<28}: {elapsed * 1000:9.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+번호 세트 표현 비교 - int 목록 vs Ticket(45비트 마스크) vs uint64 배열 (네트워크 불필요)
+
+    python3 benchmarks/bench_ticket.py [세트 수]
+
+- 중복 제거: 정렬 튜플 set vs Ticket set
+- 맞힌 개수: set 교집합 vs 마스크 AND + popcount
+- 메모리: tracemalloc 으로 잰 보관 비용
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import ticket  # noqa: E402
+
+
+def timed(fn) -> tuple:
+    started_at = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started_at
+
+
+def allocated(fn) -> tuple:
+    tracemalloc.start()
+    result = fn()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    rng = random.Random(1)
+    raw = [rng.sample(range(1, 46), 6) for _ in range(count)]
+    draw = ticket.Ticket.of([3, 11, 19, 27, 38, 44])
+    drawn = set(draw.numbers)
+
+    lists, list_bytes = allocated(lambda: [sorted(numbers) for numbers in raw])
+    tickets, ticket_bytes = allocated(lambda: [ticket.Ticket.of(numbers) for numbers in raw])
+    packed, packed_bytes = allocated(lambda: ticket.pack(tickets))
+
+    unique_lists, list_dedupe = timed(lambda: {tuple(numbers) for numbers in lists})
+    unique_tickets, ticket_dedupe = timed(lambda: set(tickets))
+    assert len(unique_lists) == len(unique_tickets)
+
+    list_matches, list_match = timed(lambda: [len(drawn.intersection(numbers)) for numbers in lists])
+    ticket_matches, ticket_match = timed(lambda: [t.matches(draw) for t in tickets])
+    assert list_matches == ticket_matches
+
+    print(f"{count:,}세트")
+    print(f"   보관      : int 목록 {list_bytes / count:6.0f} B/세트 / Ticket {ticket_bytes / count:6.0f} B/세트"
+          f" / uint64 배열 {packed_bytes / count:4.0f} B/세트")
+    print(f"   중복 제거 : 정렬 튜플 {list_dedupe * 1000:7.1f} ms / Ticket {ticket_dedupe * 1000:7.1f} ms")
+    print(f"   맞힌 개수 : set 교집합 {list_match * 1000:7.1f} ms / popcount {ticket_match * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
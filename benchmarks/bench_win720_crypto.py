@@ -0,0 +1,80 @@
+"""
+연금복권 구매 1회당 암복호화 비용 비교 (PBKDF2 키 파생 캐시 전/후)
+
+    python3 benchmarks/bench_win720_crypto.py [구매 횟수]
+
+구매 1회 = makeAutoNo / makeOrderNo / connPro 요청 3번 암호화 + 응답 3번 복호화.
+'기존' 은 예전 Win720._encText/_decText 처럼 호출마다 새 salt 로 PBKDF2 를 돌린다.
+"""
+import base64
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from Crypto.Cipher import AES  # noqa: E402
+from Crypto.Hash import SHA256  # noqa: E402
+from Crypto.Protocol.KDF import PBKDF2  # noqa: E402
+from Crypto.Random import get_random_bytes  # noqa: E402
+
+import win720_crypto  # noqa: E402
+from win720_crypto import CryptoContext  # noqa: E402
+
+KEY_CODE = "A1B2C3D4E5F6G7H8I9J0K1L2M3N4O5P6.worker1"
+PAYLOADS = [
+    "ROUND=286&SEL_NO=&BUY_CNT=&AUTO_SEL_SET=SA&SEL_CLASS=&BUY_TYPE=A&ACCS_TYPE=01",
+    "ROUND=286&AUTO_SEL_SET=SA&SEL_CLASS=&SEL_NO=123456&BUY_TYPE=M&BUY_CNT=5",
+    "ROUND=286&FLAG=&BUY_KIND=01&BUY_NO=1123456%2C2123456%2C3123456%2C4123456%2C5123456&BUY_CNT=5",
+]
+RESPONSES = ['{"selLotNo":"123456"}', '{"orderNo":"1234","orderDate":"20251018"}', '{"resultCode":"100"}']
+
+
+def legacy_encrypt(plain_text: str) -> str:
+    enc_salt = get_random_bytes(32)
+    enc_iv = get_random_bytes(16)
+    key = PBKDF2(KEY_CODE[:32], enc_salt, 16, count=1000, hmac_hash_module=SHA256)
+    aes = AES.new(key, AES.MODE_CBC, enc_iv)
+    padded = win720_crypto._pad(plain_text).encode("utf-8")
+    return "{}{}{}".format(bytes.hex(enc_salt), bytes.hex(enc_iv), base64.b64encode(aes.encrypt(padded)).decode("utf-8"))
+
+
+def legacy_decrypt(enc_text: str) -> str:
+    dec_salt = bytes.fromhex(enc_text[0:64])
+    dec_iv = bytes.fromhex(enc_text[64:96])
+    key = PBKDF2(KEY_CODE[:32], dec_salt, 16, count=1000, hmac_hash_module=SHA256)
+    aes = AES.new(key, AES.MODE_CBC, dec_iv)
+    return win720_crypto._unpad(aes.decrypt(base64.b64decode(enc_text[96:])).decode("utf-8"))
+
+
+def main():
+    purchases = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    # 서버 응답은 매번 새 salt 로 암호화된다고 가정 (같은 salt 가 반복되면 그만큼 더 빨라진다)
+    server_responses = [[legacy_encrypt(r) for r in RESPONSES] for _ in range(purchases)]
+
+    started_at = time.perf_counter()
+    for responses in server_responses:
+        for payload in PAYLOADS:
+            legacy_encrypt(payload)
+        for response in responses:
+            legacy_decrypt(response)
+    legacy = (time.perf_counter() - started_at) / purchases
+
+    started_at = time.perf_counter()
+    derivations = 0
+    for responses in server_responses:
+        context = CryptoContext(KEY_CODE)
+        context.encrypt_many(PAYLOADS)
+        context.decrypt_many(responses)
+        derivations += context.derivations
+    cached = (time.perf_counter() - started_at) / purchases
+
+    print(f"구매 {purchases}회 기준 1회당 암복호화 비용")
+    print(f"   기존      : {legacy * 1000:7.2f} ms (키 파생 6회)")
+    print(f"   컨텍스트  : {cached * 1000:7.2f} ms (키 파생 {derivations / purchases:.1f}회)")
+    print(f"   개선      : {legacy / cached:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+import datetime
+import os
+import re
+
+from concurrent.futures import FIRST_COMPLETED, wait
+from datetime import timedelta
+
+import auth
+import html_parser
+import metrics
+from HttpClient import AsyncHttpClient
+from lotto645 import Lotto645
+
+BUY_LIST_URL = "https://dhlottery.co.kr/myPage.do?method=lottoBuyList"
+LOTTO645_DETAIL_URL = "https://dhlottery.co.kr/myPage.do?method=lotto645Detail"
+
+LOTTO_IDS = {
+    "lotto645": "LO40",
+    "win720": "LP72",
+}
+
+# 한 번에 조회할 기간(일) / 동시에 받을 상세 페이지 수 / 기간 하나에서 넘길 최대 페이지 수
+DEFAULT_WINDOW_DAYS = int(os.environ.get("BUY_HISTORY_WINDOW_DAYS", 31))
+DEFAULT_CONCURRENCY = int(os.environ.get("BUY_HISTORY_CONCURRENCY", 4))
+MAX_PAGES = 200
+
+_DETAIL_POP = re.compile(r"detailPop\(\s*'([^']*)'\s*,\s*'([^']*)'\s*,\s*'([^']*)'\s*\)")
+
+
+def parse_date(value) -> datetime.date:
+    """'20250101' / '2025-01-01' / date 를 date 로"""
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.datetime.strptime(value.replace("-", ""), "%Y%m%d").date()
+
+
+def split_windows(start: datetime.date, end: datetime.date, window_days: int = DEFAULT_WINDOW_DAYS) -> list:
+    """[start, end] 를 window_days 일 단위 구간으로 나눈다 (최근 구간부터, 목록이 DESC 정렬이므로)"""
+    assert start <= end
+    assert window_days >= 1
+
+    windows = []
+    window_end = end
+    while window_end >= start:
+        window_start = max(start, window_end - timedelta(days=window_days - 1))
+        windows.append((window_start, window_end))
+        window_end = window_start - timedelta(days=1)
+    return windows
+
+
+def _read_buy_list_page(soup):
+    """구매 내역 한 페이지 -> {"rows": [...], "last_page": int, "has_next": bool}"""
+    table = soup.select_one("table.tbl_data.tbl_data_col")
+    if table is None:
+        return None
+
+    rows = []
+    for tr in table.select("tbody tr"):
+        tds = tr.find_all("td")
+        # 조회 결과가 없으면 colspan 된 안내 문구 한 칸만 있다
+        if len(tds) < 8:
+            continue
+
+        cells = [td.get_text().strip() for td in tds]
+        link = tds[3].find("a")
+        match = _DETAIL_POP.search(link.get("href", "")) if link is not None else None
+
+        rows.append({
+            "purchased_date": cells[0],
+            "lottery": cells[1],
+            "round": cells[2],
+            "ticket_no": " ".join(cells[3].split()),
+            "count": cells[4],
+            "result": cells[5],
+            "money": cells[6],
+            "winning_date": cells[7],
+            "detail": match.groups() if match else None,
+        })
+
+    pages = [int(text) for text in (a.get_text().strip() for a in soup.select("div.paginate_common a")) if text.isdigit()]
+    return {
+        "rows": rows,
+        "last_page": max(pages) if pages else 1,
+        # 페이지 번호는 10개씩만 보이므로 '다음' 링크가 있으면 더 있는 것으로 본다
+        "has_next": soup.select_one("div.paginate_common a[class*=next]") is not None,
+    }
+
+
+class BuyHistoryCrawler:
+    """
+    마이페이지 구매 내역(lottoBuyList) 크롤러
+    - 임의의 기간을 window_days 단위로 나누고, 각 기간의 모든 페이지(nowPage)를 순서대로 넘긴다
+    - 로또 6/45 상세 페이지(lotto645Detail)는 목록을 읽는 동안 AsyncHttpClient 로 최대 concurrency 개씩 동시에 받고
+      (스레드 대신 공용 이벤트 루프의 코루틴, 연결 풀 크기 = concurrency), 받은 순서대로 구매 기록을 내보낸다
+    """
+
+    def __init__(self, auth_ctrl: auth.AuthController, http_client=None,
+                 concurrency: int = DEFAULT_CONCURRENCY, window_days: int = DEFAULT_WINDOW_DAYS):
+        assert type(auth_ctrl) == auth.AuthController
+        assert concurrency >= 1
+
+        self.auth_ctrl = auth_ctrl
+        self.http_client = http_client or auth_ctrl.http_client
+        self.concurrency = concurrency
+        self.window_days = window_days
+        self.async_client = AsyncHttpClient(self.http_client, pool_size=concurrency)
+        self.pages = 0
+        self.details = 0
+
+    def _headers(self) -> dict:
+        return self.auth_ctrl.add_auth_cred_to_headers(Lotto645._REQ_HEADERS)
+
+    def iter_pages(self, lottery: str, start, end, win_grade: int = 2):
+        """기간 안의 구매 내역 페이지를 하나씩 돌려준다 (각 페이지는 행 목록)"""
+        lotto_id = LOTTO_IDS[lottery]
+        headers = self._headers()
+
+        for window_start, window_end in split_windows(parse_date(start), parse_date(end), self.window_days):
+            previous = None
+            for page in range(1, MAX_PAGES + 1):
+                data = {
+                    "nowPage": page,
+                    "searchStartDate": window_start.strftime("%Y%m%d"),
+                    "searchEndDate": window_end.strftime("%Y%m%d"),
+                    "winGrade": win_grade,
+                    "lottoId": lotto_id,
+                    "sortOrder": "DESC"
+                }
+                # 제너레이터라서 데코레이터 대신 요청마다 단계를 붙인다
+                with metrics.phase("history"):
+                    res = self.http_client.post(BUY_LIST_URL, headers=headers, data=data, retry=True)
+                self.pages += 1
+
+                parsed = html_parser.extract_soup(res.text, _read_buy_list_page)
+                if parsed is None:
+                    raise ValueError("구매 내역 테이블을 찾을 수 없습니다.")
+
+                rows = parsed["rows"]
+                # 없는 페이지를 요청했을 때 마지막 페이지를 다시 주는 경우도 멈춘다
+                if not rows or rows == previous:
+                    break
+                yield rows
+
+                if page >= parsed["last_page"] and not parsed["has_next"]:
+                    break
+                previous = rows
+
+    def iter_records(self, start, end, lottery: str = "lotto645", details: bool = True):
+        """
+        구매 기록을 하나씩 돌려준다
+        - 로또 6/45 는 상세 페이지의 게임별 번호/결과를 "lotto_details" 로 붙인다 (상세를 받은 순서대로)
+        - 상세 페이지를 받지 못한 기록은 "lotto_details" 가 None 이고 "error" 에 사유가 있다
+        """
+        fetch_details = details and lottery == "lotto645"
+        if not fetch_details:
+            for rows in self.iter_pages(lottery, start, end):
+                yield from rows
+            return
+
+        pending = set()
+        try:
+            for rows in self.iter_pages(lottery, start, end):
+                for row in rows:
+                    pending.add(self.async_client.submit(self._with_detail(row)))
+
+                # 끝난 상세부터 내보내고, 밀린 상세가 많으면 목록 읽기를 잠시 멈춘다
+                done, pending = wait(pending, timeout=0, return_when=FIRST_COMPLETED)
+                while len(pending) >= self.concurrency * 4:
+                    more, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    done |= more
+                for future in done:
+                    yield future.result()
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+            self.async_client.submit(self.async_client.aclose())
+
+    async def _with_detail(self, row: dict) -> dict:
+        record = dict(row)
+        record["lotto_details"] = None
+        if not row["detail"]:
+            record["error"] = "상세 링크 없음"
+            return record
+
+        order_no, barcode, issue_no = row["detail"]
+        try:
+            # 코루틴이라 데코레이터 대신 안에서 단계를 붙인다 (루프의 태스크마다 컨텍스트가 따로다)
+            with metrics.phase("history"):
+                res = await self.async_client.get(
+                    LOTTO645_DETAIL_URL,
+                    params={"orderNo": order_no, "barcode": barcode, "issueNo": issue_no}
+                )
+            self.details += 1
+            record["lotto_details"] = html_parser.extract_soup(
+                res.text, Lotto645._parse_lotto645_detail, only="div.selected"
+            ) or []
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+        return record
+
+
+def summarize(records: list) -> dict:
+    """구매 기록 목록의 구매 매수 / 당첨 건수 / 당첨금 합계"""
+    summary = {"purchases": len(records), "tickets": 0, "winnings": 0, "money": 0, "errors": 0}
+    for record in records:
+        summary["tickets"] += int(record["count"]) if record["count"].isdigit() else 0
+        money = int(re.sub(r"[^0-9]", "", record["money"]) or 0)
+        summary["money"] += money
+        summary["winnings"] += money > 0
+        summary["errors"] += "error" in record
+    return summary
@@ -0,0 +1,92 @@
+import datetime
+import threading
+
+from datetime import timedelta, timezone
+
+import html_parser
+from HttpClient import HttpClientSingleton
+
+KST = timezone(timedelta(hours=9))
+
+MAIN_PAGE_URL = "https://www.dhlottery.co.kr/common.do?method=main"
+
+# (요일, 시, 분) - 월요일=0
+LOTTO645_DRAW = (5, 20, 35)  # 토요일 20:35 추첨
+WIN720_DRAW = (3, 19, 5)     # 목요일 19:05 추첨
+
+# 추첨 직후에는 메인 페이지가 아직 갱신되지 않았을 수 있어 여유를 둔다
+PUBLISH_GRACE = timedelta(hours=1)
+
+
+def next_draw_time(draw: tuple, now: datetime.datetime = None) -> datetime.datetime:
+    """now 이후 처음 돌아오는 추첨 결과 반영 시각 (추첨 시각 + PUBLISH_GRACE, KST)"""
+    now = (now or datetime.datetime.now(KST)).astimezone(KST)
+    weekday, hour, minute = draw
+
+    candidate = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    candidate += timedelta(days=(weekday - now.weekday()) % 7)
+    candidate += PUBLISH_GRACE
+    if candidate <= now:
+        candidate += timedelta(days=7)
+    return candidate
+
+
+def next_update_time(now: datetime.datetime = None) -> datetime.datetime:
+    """로또/연금복권 중 먼저 오는 결과 반영 시각 - 메인 페이지 정보는 이때까지 유효하다"""
+    return min(next_draw_time(LOTTO645_DRAW, now), next_draw_time(WIN720_DRAW, now))
+
+
+class MainPageInfo:
+    """
+    메인 페이지(common.do?method=main)에서 얻는 회차 정보를 프로세스 전체에서 공유하는 캐시
+    - 한 번 파싱할 때 lottoDrwNo, drwNo720 을 함께 추출한다
+    - 고정 TTL 대신 다음 추첨 결과 반영 시각에 만료된다
+    """
+
+    _lock = threading.Lock()
+    _data = None
+    _expires_at = None
+
+    @classmethod
+    def get(cls, http_client=None) -> dict:
+        with cls._lock:
+            now = datetime.datetime.now(KST)
+            if cls._data is None or now >= cls._expires_at:
+                cls._data = cls._fetch(http_client or HttpClientSingleton.get_instance())
+                cls._expires_at = next_update_time(now)
+            return cls._data
+
+    @classmethod
+    def invalidate(cls) -> None:
+        with cls._lock:
+            cls._data = None
+            cls._expires_at = None
+
+    @staticmethod
+    def _fetch(http_client) -> dict:
+        res = http_client.get_cached(MAIN_PAGE_URL)
+        data = html_parser.extract(res.text, MainPageInfo._read_rounds, only="strong")
+        if data is None:
+            raise ValueError("메인 페이지에서 회차 정보를 찾을 수 없습니다.")
+        return data
+
+    @staticmethod
+    def _read_rounds(doc):
+        # 한 번의 파싱으로 두 상품의 회차를 함께 읽는다 (하나라도 없으면 None)
+        lotto_round, win720_round = doc.text("strong#lottoDrwNo"), doc.text("strong#drwNo720")
+        if not lotto_round or not win720_round:
+            return None
+        return {
+            "lottoDrwNo": int(lotto_round),
+            "drwNo720": int(win720_round),
+        }
+
+
+def get_lotto645_round(http_client=None) -> str:
+    """다음(구매 가능한) 로또 회차"""
+    return str(MainPageInfo.get(http_client)["lottoDrwNo"] + 1)
+
+
+def get_win720_round(http_client=None) -> str:
+    """다음(구매 가능한) 연금복권 회차"""
+    return str(MainPageInfo.get(http_client)["drwNo720"] + 1)
@@ -0,0 +1,162 @@
+import os
+import sqlite3
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+import draw_info
+from HttpClient import HttpClientSingleton
+
+DEFAULT_PATH = os.environ.get("DRAW_STORE_PATH", os.path.join("data", "lotto645.sqlite3"))
+
+DRAW_URL = "https://www.dhlottery.co.kr/common.do?method=getLottoNumber&drwNo={}"
+
+SYNC_WORKERS = 4
+
+
+class DrawStore:
+    """
+    로또 6/45 역대 당첨 번호 로컬 저장소 (SQLite)
+    - 한 행 = 회차, 추첨일, 번호 6개, 보너스
+    - 처음 읽을 때 전체를 메모리에 올려두고 이후 조회는 디스크/네트워크 없이 처리한다
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._rows = None
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS draws ("
+                "round INTEGER PRIMARY KEY, date TEXT NOT NULL, "
+                "n1 INTEGER, n2 INTEGER, n3 INTEGER, n4 INTEGER, n5 INTEGER, n6 INTEGER, "
+                "bonus INTEGER NOT NULL)"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path)
+
+    def rows(self) -> list:
+        """(round, date, n1, ..., n6, bonus) 튜플 목록 (회차 오름차순)"""
+        with self._lock:
+            if self._rows is None:
+                with self._connect() as conn:
+                    # 예전에 ISO 형식(2025-10-11)으로 저장한 행도 byWin 페이지와 같은 2025.10.11 로 읽는다
+                    self._rows = [(row[0], _display_date(row[1]), *row[2:])
+                                  for row in conn.execute("SELECT * FROM draws ORDER BY round")]
+            return self._rows
+
+    def draw(self, round_no: int):
+        """한 회차의 (round, date, n1, ..., n6, bonus), 저장되어 있지 않으면 None"""
+        rows = self.rows()
+        # 회차는 1부터 빠짐없이 저장되므로 보통 round_no - 1 번째 행이다
+        index = round_no - rows[0][0] if rows else -1
+        if 0 <= index < len(rows) and rows[index][0] == round_no:
+            return rows[index]
+        return next((row for row in rows if row[0] == round_no), None)
+
+    def last_round(self) -> int:
+        rows = self.rows()
+        return rows[-1][0] if rows else 0
+
+    def add(self, draws: list) -> None:
+        if not draws:
+            return
+
+        with self._lock:
+            with self._connect() as conn:
+                conn.executemany("INSERT OR REPLACE INTO draws VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", draws)
+            self._rows = None
+
+    def is_current(self, http_client=None) -> bool:
+        """가장 최근 추첨 회차까지 저장되어 있는지 (메인 페이지 캐시 사용)"""
+        latest = draw_info.MainPageInfo.get(http_client)["lottoDrwNo"]
+        return self.last_round() >= latest
+
+    def recent_winning_numbers(self, count: int = 10) -> list:
+        """Lotto645.fetch_recent_winning_numbers 와 같은 형식 (최신 회차부터)"""
+        return [
+            {
+                "round": str(row[0]),
+                "date": row[1],
+                "numbers": list(row[2:8]),
+                "bonus": row[8],
+            }
+            for row in reversed(self.rows()[-count:])
+        ] if count > 0 else []
+
+    def sync(self, http_client=None) -> int:
+        """마지막으로 저장된 회차 이후의 회차만 받아와 저장하고, 추가된 회차 수를 돌려준다"""
+        http_client = http_client or HttpClientSingleton.get_instance()
+
+        latest = draw_info.MainPageInfo.get(http_client)["lottoDrwNo"]
+        missing = list(range(self.last_round() + 1, latest + 1))
+        if not missing:
+            print(f"✅ 당첨 번호 저장소가 최신입니다 ({latest}회)")
+            return 0
+
+        print(f"📥 {missing[0]}회 ~ {missing[-1]}회 당첨 번호 동기화 ({len(missing)}회차)")
+
+        with ThreadPoolExecutor(max_workers=SYNC_WORKERS) as executor:
+            fetched = list(executor.map(lambda r: fetch_draw(http_client, r), missing))
+
+        draws = [draw for draw in fetched if draw is not None]
+        self.add(draws)
+
+        if len(draws) != len(missing):
+            print(f"⚠️ {len(missing) - len(draws)}개 회차를 가져오지 못했습니다. 다음 동기화 때 다시 시도합니다.")
+
+        # 중간 회차가 빠졌다면 다음 동기화가 그 회차부터 시작하도록 뒤쪽 회차는 저장하지 않는다
+        stored = {draw[0] for draw in draws}
+        first_missing = next((r for r in missing if r not in stored), None)
+        if first_missing is not None:
+            with self._lock:
+                with self._connect() as conn:
+                    conn.execute("DELETE FROM draws WHERE round > ?", (first_missing,))
+                self._rows = None
+
+        added = self.last_round() - (missing[0] - 1)
+        print(f"✅ {added}개 회차 저장 완료 (마지막 {self.last_round()}회)")
+        return added
+
+
+def _display_date(date: str) -> str:
+    """getLottoNumber 의 drwNoDate(2025-10-11) -> byWin 페이지 표기(2025.10.11), 프롬프트가 스크래핑한 것과 같아지도록"""
+    return date.replace("-", ".")
+
+
+def fetch_draw(http_client, round_no: int):
+    try:
+        res = http_client.get(DRAW_URL.format(round_no))
+        data = res.json()
+    except Exception as e:
+        print(f"❌ {round_no}회 당첨 번호 조회 실패: {e}")
+        return None
+
+    if data.get("returnValue") != "success":
+        return None
+
+    return (
+        int(data["drwNo"]),
+        _display_date(data["drwNoDate"]),
+        *sorted(int(data[f"drwtNo{i}"]) for i in range(1, 7)),
+        int(data["bnusNo"]),
+    )
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_store():
+    """동기화된 적이 있는(파일이 있는) 경우에만 기본 저장소를 돌려준다"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None and os.path.exists(DEFAULT_PATH):
+            _default_store = DrawStore(DEFAULT_PATH)
+        return _default_store
@@ -0,0 +1,406 @@
+"""
+동행복권 사이트 로컬 대역 서버 (오프라인 종단 간 지연 시간 측정용)
+
+    python3 fakes/dhlottery_server.py [--port 8766] [--latency 0.05] [--accounts accounts.json]
+    DHLOTTERY_ORIGIN=http://127.0.0.1:8766 RECOMMENDER=local python3 controller.py buy
+
+- HttpClient 가 DHLOTTERY_ORIGIN 으로 보내는 요청을 경로(+ method 파라미터)로 나눠 처리한다
+  (dhlottery.co.kr / www. / ol. / el. 은 경로가 겹치지 않아 서버 하나로 충분하다)
+- HTML 은 fixtures/html 의 저장된 페이지, JSON 은 실제 응답과 같은 키를 쓴다
+- 로그인: byWin 페이지가 JSESSIONID 쿠키를 주고, userSsl.do?method=login 이 그 세션을 로그인 상태로 만든다
+  (accounts 가 있으면 아이디/비밀번호를 확인하고, 없으면 어떤 계정이든 통과)
+- 연금복권 makeAutoNo / makeOrderNo / connPro 는 win720_crypto 와 같은 AES 형식(키 = JSESSIONID 앞 32자)으로 주고받는다
+- 로또 구매(execBuy)는 계정별로 기억해 두었다가 구매 내역(lottoBuyList) 첫 페이지 맨 위에 최신 구매부터 보여준다
+  (복권번호 칸 = 바코드 앞 두 묶음, 상세 보기 링크의 barcode = 바코드 전체)
+- 공개 결과 페이지(statByNumber / noViewNumber / byWin)는 ETag 를 주고 If-None-Match 가 맞으면 304 로 답한다
+  (메인 페이지는 검증 헤더 없이), Accept-Encoding 에 gzip 이 있으면 큰 응답은 gzip 으로 보낸다
+- 모든 요청은 latency 초(+-jitter 비율)를 기다린 뒤 응답한다
+"""
+import argparse
+import datetime
+import gzip
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from win720_crypto import CryptoContext  # noqa: E402
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "fixtures", "html")
+
+# fixtures/html/main.html 기준 (구매 회차 = 마지막 추첨 회차 + 1)
+LOTTO645_LAST_ROUND = 1193
+WIN720_LAST_ROUND = 285
+FIRST_DRAW_DATE = datetime.date(2002, 12, 7)
+
+# (경로, method 파라미터) -> fixtures/html 파일
+PAGES = {
+    ("/gameResult.do", "byWin"): "by_win.html",
+    ("/gameResult.do", "statByNumber"): "stat_by_number.html",
+    ("/gameResult.do", "noViewNumber"): "no_view_number.html",
+    ("/common.do", "main"): "main.html",
+    ("/olotto/game/game645.do", None): "game645.html",
+    ("/myPage.do", "lottoBuyList"): "lotto_buy_list.html",
+    ("/myPage.do", "lotto645Detail"): "lotto645_detail.html",
+}
+
+# ETag 를 주는 공개 결과 페이지
+VALIDATED_PAGES = {"by_win.html", "stat_by_number.html", "no_view_number.html"}
+GZIP_MIN_BYTES = 1024
+
+LOGIN_REQUIRED_PAGE = "<html><body><div class=\"login_wrap\">로그인이 필요합니다.</div></body></html>"
+
+
+class FakeDhlotteryServer:
+    """테스트/벤치마크 안에서 스레드로 띄우는 가짜 동행복권 서버 (with 문으로 사용)"""
+
+    def __init__(self, port: int = 0, latency: float = 0.05, jitter: float = 0.2,
+                 accounts: dict = None, seed: int = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.accounts = accounts
+        self.hits = Counter()
+        self.purchases = 0
+        self.tickets = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._crypto = {}
+        self._pages = {}
+        for name in set(PAGES.values()) | {"my_page.html"}:
+            with open(os.path.join(FIXTURE_DIR, name), encoding="utf-8") as f:
+                self._pages[name] = f.read()
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def origin(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def webhook_url(self) -> str:
+        return f"{self.origin}/webhook"
+
+    def start(self) -> "FakeDhlotteryServer":
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def delay(self) -> float:
+        with self._lock:
+            return self.latency * self._random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def new_session(self) -> str:
+        session_id = uuid.uuid4().hex.upper() + uuid.uuid4().hex.upper()[:8]
+        with self._lock:
+            self._sessions[session_id] = None
+        return session_id
+
+    def login(self, session_id: str, user_id: str, password: str) -> bool:
+        if self.accounts is not None and self.accounts.get(user_id) != password:
+            return False
+        with self._lock:
+            if session_id not in self._sessions:
+                return False
+            self._sessions[session_id] = user_id
+        return True
+
+    def user_of(self, session_id: str):
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def crypto(self, session_id: str) -> CryptoContext:
+        with self._lock:
+            context = self._crypto.get(session_id)
+            if context is None:
+                context = self._crypto[session_id] = CryptoContext(session_id, reuse_salt=False)
+            return context
+
+    def page(self, name: str) -> str:
+        return self._pages[name]
+
+    def random_numbers(self) -> list:
+        with self._lock:
+            return sorted(self._random.sample(range(1, 46), 6))
+
+    def random_digits(self, count: int) -> str:
+        with self._lock:
+            return "".join(str(self._random.randrange(10)) for _ in range(count))
+
+    def add_ticket(self, user_id: str, ticket: dict) -> None:
+        with self._lock:
+            self.tickets.setdefault(user_id, []).append(ticket)
+
+    def buy_list_rows(self, user_id: str) -> str:
+        """계정의 로또 구매를 구매 내역 표의 행으로 (최신 구매부터)"""
+        with self._lock:
+            tickets = list(self.tickets.get(user_id, []))
+        return "".join(
+            f"<tr><td>{t['date']}</td><td>로또6/45</td><td>{t['round']}</td>"
+            f"<td class=\"nolink\"><a href=\"javascript:detailPop('{t['order_no']}', '{''.join(t['barcodes'])}', '{t['issue_no']}');\">"
+            f"{' '.join(t['barcodes'][:2])}</a></td><td>{t['count']}</td><td>미추첨</td><td>-</td><td>{t['draw_date']}</td></tr>\n"
+            for t in reversed(tickets)
+        )
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                self._dispatch({})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length).decode("utf-8") if length else ""
+                self._dispatch({k: v[0] for k, v in parse_qs(body, keep_blank_values=True).items()})
+
+            def _dispatch(self, form: dict):
+                parts = urlsplit(self.path)
+                query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+                method = query.get("method")
+                path = parts.path
+                fake.hits[f"{path}?method={method}" if method else path] += 1
+
+                if path == "/webhook":
+                    self._send(204, b"", "text/plain")
+                    return
+
+                time.sleep(fake.delay())
+
+                if path == "/common.do" and method == "getLottoNumber":
+                    self._json(draw_result(int(query.get("drwNo", 0))))
+                elif path == "/userSsl.do" and method == "login":
+                    self._login(form)
+                elif path == "/userSsl.do" and method == "myPage":
+                    self._logged_in_page("my_page.html")
+                elif path == "/olotto/game/egovUserReadySocket.json":
+                    self._json({"ready_ip": "127.0.0.1", "ready_time": "0", "ready_cnt": "0"})
+                elif path == "/olotto/game/execBuy.do":
+                    self._exec_buy(form)
+                elif path.startswith("/game/pension720/process/"):
+                    self._pension720(path.rsplit("/", 1)[-1], form)
+                elif path == "/myPage.do" and method == "lottoBuyList" and form.get("nowPage", "1") == "1":
+                    # 첫 페이지에만 이 계정이 산 표를 앞에 붙인다 (그 뒤 페이지는 저장된 표 그대로)
+                    rows = fake.buy_list_rows(fake.user_of(self._session_id()))
+                    self._html(fake.page(PAGES[(path, method)]).replace("<tbody>\n", "<tbody>\n" + rows, 1))
+                elif (path, method) in PAGES:
+                    # 첫 방문 페이지(byWin)는 새 세션 쿠키를 준다
+                    cookie = fake.new_session() if method == "byWin" else None
+                    name = PAGES[(path, method)]
+                    if name in VALIDATED_PAGES:
+                        self._validated_html(fake.page(name), cookie)
+                    else:
+                        self._html(fake.page(name), cookie)
+                elif (path, None) in PAGES:
+                    self._html(fake.page(PAGES[(path, None)]))
+                else:
+                    self._send(404, f"unknown path {self.path}".encode("utf-8"), "text/plain")
+
+            def _session_id(self) -> str:
+                for item in self.headers.get("Cookie", "").split(";"):
+                    name, _, value = item.strip().partition("=")
+                    if name == "JSESSIONID":
+                        return value
+                return ""
+
+            def _login(self, form: dict):
+                fake.login(self._session_id(), form.get("userId", ""), form.get("password", ""))
+                # 실제 사이트처럼 로그인 응답은 새 JSESSIONID 를 내려준다 (클라이언트는 쓰지 않는다)
+                self._html(fake.page("main.html"), fake.new_session())
+
+            def _logged_in_page(self, name: str):
+                if fake.user_of(self._session_id()) is None:
+                    self._html(LOGIN_REQUIRED_PAGE)
+                    return
+                self._html(fake.page(name))
+
+            def _exec_buy(self, form: dict):
+                user_id = fake.user_of(self._session_id())
+                if user_id is None:
+                    self._json({"loginYn": "N", "result": {"resultCode": "-1", "resultMsg": "로그인이 필요합니다."}})
+                    return
+
+                games = []
+                for game in json.loads(form.get("param", "[]")):
+                    if game.get("genType") == "1":
+                        numbers, kind = [int(x) for x in game["arrGameChoiceNum"].split(",")], "1"
+                    else:
+                        numbers, kind = fake.random_numbers(), "3"
+                    games.append("|".join([game["alpabet"]] + [f"{n:02d}" for n in sorted(numbers)]) + kind)
+
+                with fake._lock:
+                    fake.purchases += 1
+
+                today = datetime.date.today()
+                buy_round = form.get("round", str(LOTTO645_LAST_ROUND + 1))
+                barcodes = [fake.random_digits(5) for _ in range(6)]
+                fake.add_ticket(user_id, {
+                    "date": today.isoformat(),
+                    "round": buy_round,
+                    "order_no": fake.random_digits(10),
+                    "barcodes": barcodes,
+                    "issue_no": fake.random_digits(4),
+                    "count": len(games),
+                    "draw_date": form.get("ROUND_DRAW_DATE", ""),
+                })
+                self._json({
+                    "loginYn": "Y",
+                    "result": {
+                        "oltInetUserId": user_id,
+                        "issueDay": today.strftime("%Y/%m/%d"),
+                        "issueTime": time.strftime("%H:%M:%S"),
+                        "drawDate": form.get("ROUND_DRAW_DATE", ""),
+                        "payLimitDate": form.get("WAMT_PAY_TLMT_END_DT", ""),
+                        "buyRound": buy_round,
+                        **{f"barCode{i}": barcode for i, barcode in enumerate(barcodes, 1)},
+                        "nBuyAmount": int(form.get("nBuyAmount", 0) or 0),
+                        "arrGameChoiceNum": games,
+                        "weekDay": "토",
+                        "resultCode": "100",
+                        "resultMsg": "SUCCESS",
+                    },
+                })
+
+            def _pension720(self, name: str, form: dict):
+                session_id = self._session_id()
+                crypto = fake.crypto(session_id)
+                try:
+                    request = {k: v[0] for k, v in parse_qs(crypto.decrypt(unquote(form.get("q", "")))).items()}
+                except Exception:
+                    self._json({"resultCode": "-1", "resultMsg": "복호화 실패"})
+                    return
+
+                win720_round = request.get("ROUND", str(WIN720_LAST_ROUND + 1))
+                if name == "makeAutoNo.jsp":
+                    payload = {"resultCode": "100", "resultMsg": "SUCCESS", "selLotNo": fake.random_digits(6)}
+                elif name == "makeOrderNo.jsp":
+                    payload = {
+                        "resultCode": "100",
+                        "resultMsg": "SUCCESS",
+                        "orderNo": fake.random_digits(14),
+                        "orderDate": time.strftime("%Y%m%d%H%M%S"),
+                    }
+                elif name == "connPro.jsp":
+                    if fake.user_of(session_id) is None:
+                        payload = {"loginYn": "N", "resultCode": "-1", "resultMsg": "로그인이 필요합니다."}
+                    else:
+                        with fake._lock:
+                            fake.purchases += 1
+                        payload = {
+                            "loginYn": "Y",
+                            "resultCode": "100",
+                            "resultMsg": f"SUCCESS|{request.get('orderNo', '')}|{request.get('orderDate', '')}|{win720_round}|5000",
+                            "saleTicket": request.get("BUY_NO", ""),
+                            "result": {"resultCode": "100", "resultMsg": "SUCCESS"},
+                        }
+                else:
+                    self._send(404, f"unknown path {self.path}".encode("utf-8"), "text/plain")
+                    return
+
+                self._json({"q": crypto.encrypt(json.dumps(payload, ensure_ascii=False))})
+
+            def _html(self, html: str, cookie: str = None):
+                self._send(200, html.encode("utf-8"), "text/html; charset=UTF-8", cookie)
+
+            def _validated_html(self, html: str, cookie: str = None):
+                data = html.encode("utf-8")
+                etag = f'"{hashlib.sha1(data).hexdigest()[:16]}"'
+                if self.headers.get("If-None-Match") == etag:
+                    fake.hits["304"] += 1
+                    self._send(304, b"", "text/html; charset=UTF-8", cookie, etag=etag)
+                else:
+                    self._send(200, data, "text/html; charset=UTF-8", cookie, etag=etag)
+
+            def _json(self, payload: dict):
+                self._send(200, json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json; charset=UTF-8")
+
+            def _send(self, status: int, data: bytes, content_type: str, cookie: str = None, etag: str = None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                if len(data) >= GZIP_MIN_BYTES and "gzip" in self.headers.get("Accept-Encoding", ""):
+                    data = gzip.compress(data, compresslevel=6)
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(data)))
+                if etag:
+                    self.send_header("ETag", etag)
+                if cookie:
+                    self.send_header("Set-Cookie", f"JSESSIONID={cookie}; Path=/")
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def draw_result(round_no: int) -> dict:
+    """common.do?method=getLottoNumber 형식 - 회차 번호로 정해지는 당첨 번호 (마지막 추첨 회차까지)"""
+    if not 1 <= round_no <= LOTTO645_LAST_ROUND:
+        return {"returnValue": "fail"}
+
+    numbers = random.Random(round_no).sample(range(1, 46), 7)
+    winners = sorted(numbers[:6])
+    result = {
+        "returnValue": "success",
+        "drwNo": round_no,
+        "drwNoDate": (FIRST_DRAW_DATE + datetime.timedelta(weeks=round_no - 1)).isoformat(),
+        "bnusNo": numbers[6],
+        "firstWinamnt": 2_000_000_000,
+        "firstPrzwnerCo": 10,
+    }
+    for i, number in enumerate(winners, 1):
+        result[f"drwtNo{i}"] = number
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 동행복권 서버")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--accounts", help="이 계정 파일(controller.py buy-all 형식)의 아이디/비밀번호만 로그인 허용")
+    args = parser.parse_args()
+
+    accounts = None
+    if args.accounts:
+        with open(args.accounts, encoding="utf-8") as f:
+            accounts = {account["username"]: account["password"] for account in json.load(f)}
+
+    fake = FakeDhlotteryServer(args.port, args.latency, args.jitter, accounts)
+    print(f"🎰 가짜 동행복권 서버: {fake.origin} (DHLOTTERY_ORIGIN={fake.origin})")
+    try:
+        fake.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fake.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+OpenAI Chat Completions API 로컬 대역 서버 (오프라인 지연 시간 측정용)
+
+    python3 fakes/openai_server.py [--port 8765] [--latency 0.8] [--tail-ratio 0.1] [--tail-latency 6] [--invalid-ratio 0.1]
+                                   [--token-latency 0.02] [--verbose-chars 1500]
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 python3 controller.py buy
+
+- POST /v1/chat/completions 에 OpenAI 형식의 응답을 돌려준다
+- 응답 시간: 기본 latency 초 (+-20%), tail_ratio 비율로 tail_latency 초 (느린 꼬리)
+- invalid_ratio 비율로 번호가 없는 응답을 돌려준다 (fallback 경로 확인용)
+- "stream": true 요청에는 SSE(chat.completion.chunk)로 chunk_size 글자씩 token_latency 초 간격으로 보낸다
+  (스트림이 아니어도 같은 생성 시간을 기다린 뒤 한 번에 보낸다)
+- verbose_chars 만큼의 설명을 번호 뒤에 붙여 장황한 응답을 흉내 낸다
+- 응답을 다 보내기 전에 클라이언트가 연결을 끊으면 disconnects 를 센다 (hedge 취소 확인용)
+"""
+import argparse
+import json
+import random
+import select
+import socket
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REFUSAL = "죄송하지만 로또 번호는 예측할 수 없습니다. 무작위로 선택하시는 것을 권장합니다."
+EXPLANATION = "각 세트는 과거 당첨 빈도와 최근 미출현 번호, 홀짝 및 구간 균형을 함께 고려해 구성했습니다. "
+
+
+class FakeOpenAIServer:
+    """테스트/벤치마크 안에서 스레드로 띄우는 가짜 OpenAI 서버 (with 문으로 사용)"""
+
+    def __init__(self, port: int = 0, latency: float = 0.8, tail_ratio: float = 0.0, tail_latency: float = 6.0,
+                 invalid_ratio: float = 0.0, token_latency: float = 0.0, chunk_size: int = 4,
+                 verbose_chars: int = 0, seed: int = None):
+        self.latency = latency
+        self.tail_ratio = tail_ratio
+        self.tail_latency = tail_latency
+        self.invalid_ratio = invalid_ratio
+        self.token_latency = token_latency
+        self.chunk_size = chunk_size
+        self.verbose_chars = verbose_chars
+        self.requests = 0
+        self.sent_chars = 0
+        self.disconnects = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeOpenAIServer":
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def plan(self) -> tuple:
+        """이번 요청의 (첫 토큰까지 지연, 응답 내용)"""
+        with self._lock:
+            self.requests += 1
+            if self._random.random() < self.tail_ratio:
+                delay = self.tail_latency
+            else:
+                delay = self.latency * self._random.uniform(0.8, 1.2)
+            valid = self._random.random() >= self.invalid_ratio
+            sets = [sorted(self._random.sample(range(1, 46), 6)) for _ in range(5)]
+
+        if not valid:
+            return delay, REFUSAL
+        if not self.verbose_chars:
+            return delay, json.dumps(sets)
+
+        lines = "\n".join(f"{i}. {numbers}" for i, numbers in enumerate(sets, 1))
+        explanation = (EXPLANATION * (self.verbose_chars // len(EXPLANATION) + 1))[:self.verbose_chars]
+        return delay, f"통계를 분석해 다음 5세트를 추천합니다.\n{lines}\n\n{explanation}"
+
+    def chunks(self, content: str) -> list:
+        return [content[i:i + self.chunk_size] for i in range(0, len(content), self.chunk_size)]
+
+    def add_sent(self, count: int) -> None:
+        with self._lock:
+            self.sent_chars += count
+
+    def add_disconnect(self) -> None:
+        with self._lock:
+            self.disconnects += 1
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send(404, {"error": {"message": f"unknown path {self.path}"}})
+                    return
+
+                model = body.get("model", "gpt-3.5-turbo")
+                delay, content = fake.plan()
+                time.sleep(delay)
+                if self._client_gone():
+                    # 기다리는 동안 클라이언트가 요청을 취소했다
+                    fake.add_disconnect()
+                    self.close_connection = True
+                    return
+
+                if body.get("stream"):
+                    self._stream(model, fake.chunks(content))
+                    return
+
+                time.sleep(fake.token_latency * len(fake.chunks(content)))
+                try:
+                    self._send(200, completion(model, content))
+                    fake.add_sent(len(content))
+                except (BrokenPipeError, ConnectionResetError):
+                    fake.add_disconnect()
+
+            def _stream(self, model: str, pieces: list):
+                events = [completion_chunk(model, {"role": "assistant", "content": ""})]
+                events += [completion_chunk(model, {"content": piece}) for piece in pieces]
+                events.append(completion_chunk(model, {}, finish_reason="stop"))
+
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/event-stream")
+                    self.send_header("Cache-Control", "no-cache")
+                    self.send_header("Connection", "close")
+                    self.end_headers()
+                    self.close_connection = True
+
+                    for index, event in enumerate(events):
+                        if 0 < index <= len(pieces):
+                            time.sleep(fake.token_latency)
+                        self.wfile.write(f"data: {json.dumps(event, ensure_ascii=False)}\n\n".encode("utf-8"))
+                        self.wfile.flush()
+                        if 0 < index <= len(pieces):
+                            fake.add_sent(len(pieces[index - 1]))
+                    self.wfile.write(b"data: [DONE]\n\n")
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    # 클라이언트가 필요한 만큼 받고 스트림을 끊었거나, hedge 에서 져서 요청이 취소된 경우
+                    fake.add_disconnect()
+
+            def _client_gone(self) -> bool:
+                readable, _, _ = select.select([self.connection], [], [], 0)
+                if not readable:
+                    return False
+                try:
+                    return not self.connection.recv(1, socket.MSG_PEEK)
+                except ConnectionResetError:
+                    return True
+
+            def _send(self, status: int, payload: dict):
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def completion(model: str, content: str) -> dict:
+    return {
+        "id": "chatcmpl-fake",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+
+def completion_chunk(model: str, delta: dict, finish_reason: str = None) -> dict:
+    return {
+        "id": "chatcmpl-fake",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 OpenAI Chat Completions 서버")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.8)
+    parser.add_argument("--tail-ratio", type=float, default=0.0)
+    parser.add_argument("--tail-latency", type=float, default=6.0)
+    parser.add_argument("--invalid-ratio", type=float, default=0.0)
+    parser.add_argument("--token-latency", type=float, default=0.0)
+    parser.add_argument("--chunk-size", type=int, default=4)
+    parser.add_argument("--verbose-chars", type=int, default=0)
+    args = parser.parse_args()
+
+    fake = FakeOpenAIServer(args.port, args.latency, args.tail_ratio, args.tail_latency, args.invalid_ratio,
+                            args.token_latency, args.chunk_size, args.verbose_chars)
+    print(f"🤖 가짜 OpenAI 서버: {fake.base_url}")
+    try:
+        fake.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fake.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import json
+import os
+import time
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import auth
+import session_store
+import steps
+from HttpClient import HttpClient
+
+DEFAULT_WORKERS = 4
+
+
+def load_accounts(path: str) -> list:
+    """
+    계정 목록 파일을 읽는다
+    - 형식: [{"username": "...", "password": "...", "count": 5, "webhook_url": "..."}, ...]
+    - count, webhook_url 은 생략 가능 (환경변수 COUNT, SLACK_WEBHOOK_URL 사용)
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        raw_accounts = json.load(f)
+
+    if not isinstance(raw_accounts, list):
+        raise ValueError("계정 파일은 JSON 배열이어야 합니다.")
+
+    default_count = int(os.environ.get('COUNT', 5))
+    default_webhook_url = os.environ.get('SLACK_WEBHOOK_URL')
+
+    accounts = []
+    for i, raw in enumerate(raw_accounts):
+        if not raw.get("username") or not raw.get("password"):
+            raise ValueError(f"{i}번째 계정에 username/password 가 없습니다.")
+
+        accounts.append({
+            "username": raw["username"],
+            "password": raw["password"],
+            "count": int(raw.get("count", default_count)),
+            "webhook_url": raw.get("webhook_url", default_webhook_url),
+        })
+
+    return accounts
+
+
+def run_accounts(accounts: list, action: str, max_workers: int = DEFAULT_WORKERS, options: dict = None) -> list:
+    """
+    여러 계정의 buy/check/history 흐름을 제한된 워커 풀에서 동시에 실행한다
+    - 계정마다 HttpClient 와 AuthController 를 새로 만들어 쿠키가 섞이지 않도록 한다
+    - options: history 의 조회 기간 {"start": "YYYYMMDD", "end": "YYYYMMDD"}
+    """
+    assert action in ("buy", "check", "history")
+    assert max_workers >= 1
+
+    results = []
+    started_at = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_run_account, i, account, action, options or {}) for i, account in enumerate(accounts)]
+        for future in as_completed(futures):
+            results.append(future.result())
+
+    elapsed = time.perf_counter() - started_at
+    results.sort(key=lambda r: r["index"])
+    for result in results:
+        result["fleet_elapsed"] = elapsed
+
+    return results
+
+
+def _run_account(index: int, account: dict, action: str, options: dict) -> dict:
+    result = {
+        "index": index,
+        "username": _mask_username(account["username"]),
+        "action": action,
+        "status": "OK",
+        "detail": "",
+        "login_elapsed": 0.0,
+        "elapsed": 0.0,
+    }
+
+    started_at = time.perf_counter()
+    try:
+        authCtrl = auth.AuthController(HttpClient())
+        logged_in = authCtrl.login(account["username"], account["password"], session_store.from_env())
+        result["login_elapsed"] = time.perf_counter() - started_at
+
+        if not logged_in:
+            result["status"] = "ERROR"
+            result["detail"] = "로그인 실패"
+            return result
+
+        if action == "buy":
+            bought = steps.buy_account(authCtrl, account["username"], account["count"], account["webhook_url"])
+            result["detail"] = _describe_buy(bought)
+        elif action == "history":
+            summary = steps.history_account(authCtrl, options["start"], options["end"], verbose=False)
+            result["detail"] = _describe_history(summary)
+        else:
+            steps.check_account(authCtrl, account["webhook_url"], account["username"])
+            result["detail"] = "당첨 확인 완료"
+    except Exception as e:
+        result["status"] = "ERROR"
+        result["detail"] = f"{type(e).__name__}: {e}"
+    finally:
+        result["elapsed"] = time.perf_counter() - started_at
+
+    return result
+
+
+def _describe_buy(bought: dict) -> str:
+    def result_msg(response):
+        if not response:
+            return "-"
+        return response.get("result", {}).get("resultMsg") or response.get("resultMsg") or "-"
+
+    return f"로또: {result_msg(bought.get('lotto'))} / 연금복권: {result_msg(bought.get('win720'))}"
+
+
+def _describe_history(summary: dict) -> str:
+    return (f"구매 {summary['purchases']}건 ({summary['tickets']}매) / 당첨 {summary['winnings']}건 {summary['money']:,}원"
+            f" / 오류 {summary['errors']}건")
+
+
+def _mask_username(username: str) -> str:
+    if len(username) <= 3:
+        return username[0] + "*" * (len(username) - 1)
+    return username[:3] + "*" * (len(username) - 3)
+
+
+def print_summary(results: list) -> None:
+    if not results:
+        print("⚠️ 처리할 계정이 없습니다.")
+        return
+
+    ok_count = sum(1 for r in results if r["status"] == "OK")
+    sequential_elapsed = sum(r["elapsed"] for r in results)
+    fleet_elapsed = results[0]["fleet_elapsed"]
+
+    print(f"📋 계정별 실행 결과 ({ok_count}/{len(results)} 성공)")
+    for r in results:
+        emoji = "✅" if r["status"] == "OK" else "❌"
+        print(f"{emoji} {r['username']:<12} {r['action']:<7} 로그인 {r['login_elapsed']:6.2f}s / 전체 {r['elapsed']:6.2f}s  {r['detail']}")
+
+    print(f"⏱️ 전체 소요 시간: {fleet_elapsed:.2f}s (계정별 합계 {sequential_elapsed:.2f}s)")
@@ -0,0 +1,161 @@
+import os
+import re
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as _SelectolaxParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as _SelectolaxParser  # selectolax < 0.3.13
+    except ImportError:
+        _SelectolaxParser = None
+
+try:
+    import lxml  # noqa: F401 - BeautifulSoup 의 "lxml" 빌더 사용 가능 여부 확인용
+    _HAS_LXML = True
+except ImportError:
+    _HAS_LXML = False
+
+FALLBACK_BACKEND = "html5lib"
+
+# 첫 번째 단순 선택자(tag#id.class)만 뽑아 SoupStrainer 로 바꾼다
+_COMPOUND_RE = re.compile(r"^(?P<tag>[a-zA-Z][a-zA-Z0-9]*)?(?:#(?P<id>[\w-]+))?(?P<classes>(?:\.[\w-]+)*)")
+
+
+def available_backends() -> list:
+    backends = []
+    if _SelectolaxParser is not None:
+        backends.append("selectolax")
+    if _HAS_LXML:
+        backends.append("lxml")
+    backends.append("html.parser")
+    backends.append(FALLBACK_BACKEND)
+    return backends
+
+
+def default_backend() -> str:
+    """HTML_PARSER_BACKEND 환경변수가 없으면 설치된 것 중 가장 빠른 파서를 쓴다"""
+    backend = os.environ.get("HTML_PARSER_BACKEND")
+    if backend:
+        return backend
+    return available_backends()[0]
+
+
+def _soup(html: str, builder: str, parse_only=None):
+    # bs4 는 html5lib 빌더까지 함께 불러와 import 가 무거우므로 BeautifulSoup 트리가 처음 필요할 때 가져온다
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(html, builder, parse_only=parse_only)
+
+
+class _SoupDocument:
+    def __init__(self, html: str, builder: str, only: str = None):
+        parse_only = _make_strainer(only) if only and builder != FALLBACK_BACKEND else None
+        self.soup = _soup(html, builder, parse_only)
+
+    def text(self, selector: str):
+        node = self.soup.select_one(selector)
+        return node.get_text().strip() if node is not None else None
+
+    def attr(self, selector: str, name: str):
+        node = self.soup.select_one(selector)
+        return node.get(name) if node is not None else None
+
+    def texts(self, selector: str) -> list:
+        return [node.get_text().strip() for node in self.soup.select(selector)]
+
+    def attrs(self, selector: str, name: str) -> list:
+        return [node.get(name) for node in self.soup.select(selector)]
+
+    def rows(self, table_index: int = 0, table_selector: str = "table") -> list:
+        tables = self.soup.select(table_selector)
+        if len(tables) <= table_index:
+            return []
+        return [
+            [td.get_text().strip() for td in tr.find_all("td")]
+            for tr in tables[table_index].find_all("tr")
+        ]
+
+
+class _SelectolaxDocument:
+    def __init__(self, html: str):
+        self.tree = _SelectolaxParser(html)
+
+    def text(self, selector: str):
+        node = self.tree.css_first(selector)
+        return node.text().strip() if node is not None else None
+
+    def attr(self, selector: str, name: str):
+        node = self.tree.css_first(selector)
+        return node.attributes.get(name) if node is not None else None
+
+    def texts(self, selector: str) -> list:
+        return [node.text().strip() for node in self.tree.css(selector)]
+
+    def attrs(self, selector: str, name: str) -> list:
+        return [node.attributes.get(name) for node in self.tree.css(selector)]
+
+    def rows(self, table_index: int = 0, table_selector: str = "table") -> list:
+        tables = self.tree.css(table_selector)
+        if len(tables) <= table_index:
+            return []
+        return [
+            [td.text().strip() for td in tr.css("td")]
+            for tr in tables[table_index].css("tr")
+        ]
+
+
+def parse(html: str, backend: str = None, only: str = None):
+    """
+    text/attr/texts/attrs/rows 를 제공하는 문서 객체를 만든다
+    - only: 필요한 영역의 CSS 선택자 (lxml/html.parser 는 그 영역만 트리로 만든다)
+    """
+    backend = backend or default_backend()
+    if backend == "selectolax":
+        return _SelectolaxDocument(html)
+    return _SoupDocument(html, backend, only)
+
+
+def extract(html: str, fn, only: str = None, backend: str = None):
+    """
+    빠른 파서로 fn(doc) 을 실행하고, 예외가 나거나 None 이면 그때만 html5lib 로 다시 시도한다
+    ('html5lib' : in case that the html don't have clean tag pairs)
+    """
+    backend = backend or default_backend()
+    if backend != FALLBACK_BACKEND:
+        try:
+            result = fn(parse(html, backend, only))
+            if result is not None:
+                return result
+        except Exception:
+            pass
+
+    return fn(parse(html, FALLBACK_BACKEND))
+
+
+def extract_soup(html: str, fn, only: str = None):
+    """
+    BeautifulSoup 트리가 꼭 필요한 복잡한 추출용
+    - lxml(없으면 html.parser) 로 먼저 파싱하고, 실패할 때만 html5lib 로 다시 시도한다
+    """
+    builder = "lxml" if _HAS_LXML else "html.parser"
+    try:
+        result = fn(_SoupDocument(html, builder, only).soup)
+        if result is not None:
+            return result
+    except Exception:
+        pass
+
+    return fn(_soup(html, FALLBACK_BACKEND))
+
+
+def _make_strainer(selector: str):
+    from bs4 import SoupStrainer
+
+    match = _COMPOUND_RE.match(selector.strip())
+    tag = match.group("tag") if match else None
+    attrs = {}
+    if match and match.group("id"):
+        attrs["id"] = match.group("id")
+    if match and match.group("classes"):
+        attrs["class"] = match.group("classes").split(".")[1]
+    return SoupStrainer(tag, attrs=attrs)
@@ -0,0 +1,216 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_DIR = os.environ.get("HTTP_CACHE_DIR", os.path.join(".cache", "http"))
+# 로그인 없이 보는 공개 페이지만 저장하므로 계정 사이에 같은 디렉터리를 써도 된다 (HTTP_CACHE=0 이면 사용 안 함)
+ENABLED = os.environ.get("HTTP_CACHE", "1").lower() not in ("0", "false", "no")
+
+# ETag / Last-Modified 가 있는 항목을 서버에 다시 묻지 않고 쓰는 시간 (초, 0 이면 쓸 때마다 조건부 요청)
+REVALIDATE_AFTER = float(os.environ.get("HTTP_CACHE_REVALIDATE_AFTER", 0))
+
+# 로그인 없이 보는 공개 결과 페이지만 캐시한다 (경로, method 파라미터) - 쿠키를 받아야 하는 요청은 get() 을 그대로 쓴다
+CACHEABLE = {
+    ("/gameResult.do", "statByNumber"),
+    ("/gameResult.do", "noViewNumber"),
+    ("/gameResult.do", "byWin"),
+    ("/common.do", "main"),
+}
+
+# 저장해 두었다가 캐시 응답에 다시 붙이는 헤더
+_STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+def is_cacheable(url: str) -> bool:
+    parts = urlsplit(url)
+    query = parse_qs(parts.query)
+    # method 외의 파라미터(wiselog 등)가 붙은 URL 은 다른 용도로 보고 캐시하지 않는다
+    return list(query) == ["method"] and (parts.path, query["method"][0]) in CACHEABLE
+
+
+def _response_from(entry: dict, body: bytes) -> requests.Response:
+    res = requests.Response()
+    res.status_code = 200
+    res.reason = "OK"
+    res.url = entry["url"]
+    res.headers = CaseInsensitiveDict(entry["headers"])
+    res.encoding = entry["encoding"]
+    res._content = body
+    return res
+
+
+class HttpCache:
+    """
+    공개 결과 페이지(GET)의 디스크 캐시
+    - 키: URL 의 sha256, 파일: <키>.json (헤더/인코딩/만료 시각 등) + <키>.body (압축을 푼 본문)
+    - ETag / Last-Modified 가 있으면 REVALIDATE_AFTER 뒤부터는 조건부 GET 으로 확인하고, 304 면 저장된 본문을 쓴다
+    - 검증 헤더가 없으면(실제 동행복권 페이지) 다음 추첨 결과 반영 시각(draw_info.next_update_time)까지 서버에 묻지 않고 쓴다
+    - 받은 바이트 / 캐시 덕분에 받지 않은 바이트를 센다
+    """
+
+    def __init__(self, directory: str = DEFAULT_DIR, revalidate_after: float = REVALIDATE_AFTER):
+        self.directory = directory
+        self.revalidate_after = revalidate_after
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.wire_bytes = 0
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def get(self, send, url: str, params: dict = None) -> requests.Response:
+        """
+        send(url, headers) 는 실제 GET (HttpClient.get) - 캐시에 없거나 만료됐을 때만 부른다
+        같은 URL 을 동시에 요청하면 하나만 보내고 나머지는 그 결과를 디스크에서 읽는다
+        """
+        if params:
+            url = f"{url}&{urlencode(sorted(params.items()))}" if "?" in url else f"{url}?{urlencode(sorted(params.items()))}"
+        key = self.key(url)
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            entry, body = self._read(key)
+            if entry is not None and time.time() < entry["expires_at"]:
+                with self._lock:
+                    self.hits += 1
+                    self.bytes_saved += entry["wire_bytes"]
+                return _response_from(entry, body)
+
+            headers = {}
+            if entry is not None:
+                if entry["headers"].get("ETag"):
+                    headers["If-None-Match"] = entry["headers"]["ETag"]
+                if entry["headers"].get("Last-Modified"):
+                    headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+
+            res = send(url, headers)
+            wire_bytes = self._wire_bytes(res)
+
+            if res.status_code == 304 and entry is not None:
+                entry["expires_at"] = self._expires_at(entry["headers"])
+                self._write_meta(key, entry)
+                with self._lock:
+                    self.revalidated += 1
+                    self.bytes_saved += max(entry["wire_bytes"] - wire_bytes, 0)
+                    self.wire_bytes += wire_bytes
+                return _response_from(entry, body)
+
+            with self._lock:
+                self.misses += 1
+                self.wire_bytes += wire_bytes
+            if res.status_code == 200:
+                self._store(key, url, res, wire_bytes)
+            return res
+
+    def report(self) -> None:
+        total = self.hits + self.revalidated + self.misses
+        if not total:
+            return
+        print(f"🗄️ HTTP 캐시: 적중 {self.hits} / 재검증 {self.revalidated} / 미스 {self.misses}"
+              f" (적중률 {(self.hits + self.revalidated) / total * 100:.0f}%),"
+              f" 받은 전송량 {self.wire_bytes / 1024:.0f}KB / 아낀 전송량 {self.bytes_saved / 1024:.0f}KB")
+
+    def clear(self) -> int:
+        removed = 0
+        for name in os.listdir(self.directory):
+            if name.endswith((".json", ".body")):
+                os.remove(os.path.join(self.directory, name))
+                removed += 1
+        return removed
+
+    def _expires_at(self, headers: dict) -> float:
+        if headers.get("ETag") or headers.get("Last-Modified"):
+            return time.time() + self.revalidate_after
+        # draw_info 는 HttpClient 를 import 하므로 순환 import 를 피해 여기서 가져온다
+        import draw_info
+        return draw_info.next_update_time().timestamp()
+
+    @staticmethod
+    def _wire_bytes(res: requests.Response) -> int:
+        """실제로 받은 바이트 수 (urllib3 가 센 값, 없으면 Content-Length / 본문 크기)"""
+        raw = getattr(res, "raw", None)
+        try:
+            return int(raw.tell())
+        except (AttributeError, TypeError, ValueError, OSError):
+            return int(res.headers.get("Content-Length") or len(res.content))
+
+    def _path(self, key: str, ext: str) -> str:
+        return os.path.join(self.directory, f"{key}{ext}")
+
+    def _read(self, key: str) -> tuple:
+        try:
+            with open(self._path(key, ".json"), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            with open(self._path(key, ".body"), "rb") as f:
+                body = f.read()
+        except FileNotFoundError:
+            return None, None
+        except ValueError:
+            print(f"⚠️ HTTP 캐시 파일이 손상되어 무시합니다: {key[:12]}")
+            return None, None
+
+        if len(body) != entry.get("size"):
+            return None, None
+        return entry, body
+
+    def _store(self, key: str, url: str, res: requests.Response, wire_bytes: int) -> None:
+        headers = {name: res.headers[name] for name in _STORED_HEADERS if name in res.headers}
+        entry = {
+            "url": url,
+            "headers": headers,
+            "encoding": res.encoding,
+            "size": len(res.content),
+            "wire_bytes": wire_bytes,
+            "stored_at": time.time(),
+            "expires_at": self._expires_at(headers),
+        }
+
+        # 본문을 먼저 바꿔 넣고 메타를 쓴다 (중간에 멈추면 크기가 맞지 않아 다음 실행에서 미스로 처리된다)
+        path = self._path(key, ".body")
+        with open(f"{path}.tmp", "wb") as f:
+            f.write(res.content)
+        os.replace(f"{path}.tmp", path)
+        self._write_meta(key, entry)
+
+    def _write_meta(self, key: str, entry: dict) -> None:
+        path = self._path(key, ".json")
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(f"{path}.tmp", path)
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """프로세스 공용 캐시 (HTTP_CACHE=0 이면 None)"""
+    global _default_cache
+    if not ENABLED:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = HttpCache(DEFAULT_DIR)
+        return _default_cache
+
+
+def report() -> None:
+    with _default_cache_lock:
+        cache = _default_cache
+    if cache is not None:
+        cache.report()
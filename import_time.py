@@ -0,0 +1,81 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# controller 만 import 하는 시간 = 모든 명령의 공통 시작 비용
+DEFAULT_MODULES = ("controller",)
+# 0 이 아니면 합계가 이 값(ms)을 넘을 때 실패로 본다 (CI 에서 import 시간 회귀 확인용)
+BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", 0))
+TOP = 15
+
+_PREFIX = "import time:"
+
+
+def parse(text: str) -> list:
+    """
+    python -X importtime 출력 -> [(깊이, 모듈, 자체 시간 us, 누적 시간 us), ...]
+    - 출력 순서 그대로 (하위 모듈이 먼저, 그 모듈을 import 한 모듈이 나중에 나온다)
+    """
+    entries = []
+    for line in text.splitlines():
+        if not line.startswith(_PREFIX):
+            continue
+        fields = line[len(_PREFIX):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        name = fields[2].strip()
+        # 이름 앞 공백: 최상위는 1칸, 한 단계 들어갈 때마다 2칸씩
+        depth = (len(fields[2]) - len(fields[2].lstrip()) - 1) // 2
+        entries.append((depth, name, int(fields[0]), int(fields[1])))
+    return entries
+
+
+def measure(modules=DEFAULT_MODULES) -> list:
+    """새 인터프리터에서 modules 를 차례로 import 하고 parse() 결과를 돌려준다 (이미 불러온 모듈은 다시 재지 않는다)"""
+    code = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        lines = result.stderr.strip().splitlines()
+        raise RuntimeError(lines[-1] if lines else f"종료 코드 {result.returncode}")
+    return parse(result.stderr)
+
+
+def subtrees(entries: list, modules) -> dict:
+    """요청한 최상위 모듈별로 그 import 가 불러온 모듈 목록 (인터프리터 시작 시 site 등은 빠진다)"""
+    trees = {}
+    pending = []
+    for entry in entries:
+        pending.append(entry)
+        depth, name = entry[0], entry[1]
+        if depth == 0:
+            if name in modules:
+                trees[name] = pending
+            pending = []
+    return trees
+
+
+def print_report(entries: list, modules=DEFAULT_MODULES, top: int = TOP, budget_ms: float = BUDGET_MS) -> bool:
+    """모듈별 누적 import 시간을 출력하고, 예산을 넘으면 False"""
+    trees = subtrees(entries, modules)
+    total = sum(tree[-1][3] for tree in trees.values())
+
+    print(f"⏱️ import 시간: {' + '.join(modules)} = {total / 1000:.1f}ms")
+    for module in modules:
+        tree = trees.get(module)
+        if tree is None:
+            print(f"   {module}: 앞의 모듈이 이미 불러왔습니다")
+            continue
+        print(f"   {module}: {tree[-1][3] / 1000:.1f}ms (모듈 {len(tree)}개)")
+
+    nested = [entry for tree in trees.values() for entry in tree if entry[0] > 0]
+    print(f"   누적 시간 상위 {min(top, len(nested))}개 모듈:")
+    for depth, name, self_us, cumulative_us in sorted(nested, key=lambda entry: -entry[3])[:top]:
+        print(f"     {name:<44} {cumulative_us / 1000:8.1f}ms  (자체 {self_us / 1000:.1f}ms, 깊이 {depth})")
+
+    if budget_ms and total / 1000 > budget_ms:
+        print(f"❌ import 시간이 예산 {budget_ms:g}ms 를 넘었습니다")
+        return False
+    return True
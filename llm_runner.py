@@ -0,0 +1,255 @@
+import os
+import threading
+
+import number_parser
+
+MODEL = "gpt-3.5-turbo"
+SYSTEM_PROMPT = "You are a professional lottery number recommendation expert. You must ONLY respond with valid lottery numbers between 1-45. NEVER include any symbols like '*', '***', or any other invalid characters. NEVER use placeholders or incomplete numbers. Always return exactly 5 sets of 6 numbers each in the specified format. Each number must be a complete integer between 1 and 45."
+
+# 요청 하나의 타임아웃 / 추천 전체에 쓸 수 있는 시간 / 첫 요청이 이만큼 늦으면 다음 프롬프트를 함께 보낸다
+DEFAULT_TIMEOUT = float(os.environ.get("OPENAI_TIMEOUT", 20))
+DEFAULT_DEADLINE = float(os.environ.get("LLM_DEADLINE", 30))
+DEFAULT_HEDGE_DELAY = float(os.environ.get("LLM_HEDGE_DELAY", 3))
+# 동시에 보내는 요청 수 상한 (hedge 포함, 가득 차 있으면 하나가 끝날 때까지 다음 프롬프트를 미룬다)
+DEFAULT_MAX_IN_FLIGHT = int(os.environ.get("LLM_MAX_IN_FLIGHT", 2))
+
+# 응답을 스트림으로 받아 필요한 세트가 모이면 바로 끊는다 (OPENAI_STREAM=0 이면 전체 응답을 기다린다)
+DEFAULT_STREAM = os.environ.get("OPENAI_STREAM", "1") != "0"
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def get_client(api_key: str, base_url: str = None, timeout: float = DEFAULT_TIMEOUT):
+    """같은 설정의 AsyncOpenAI 클라이언트(연결 풀)는 프로세스에서 하나만 만든다 (공용 이벤트 루프 안에서만 쓴다)"""
+    # openai 는 import 에만 1초 넘게 걸리므로 GPT 추천을 실제로 할 때 처음 가져온다 (check 는 쓰지 않음)
+    from openai import AsyncOpenAI
+
+    key = (api_key, base_url, timeout)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = AsyncOpenAI(api_key=api_key, base_url=base_url, timeout=timeout, max_retries=1)
+        return client
+
+
+def _get_loop():
+    """OpenAI 요청을 돌리는 프로세스 공용 이벤트 루프 (데몬 스레드 하나, 클라이언트 연결 풀이 이 루프에 묶인다)"""
+    # asyncio 도 import 가 수십 ms 라서 GPT 추천을 실제로 할 때 처음 가져온다
+    import asyncio
+
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="llm", daemon=True).start()
+        return _loop
+
+
+def _run(coro):
+    """coro 를 공용 루프에서 실행하고 끝날 때까지 기다린다 (coro 가 띄운 요청은 돌아오기 전에 모두 끝나거나 취소된다)"""
+    import asyncio
+
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+
+class LLMRunner:
+    """
+    ChatGPT 추천 요청 실행기
+    - 클라이언트 재사용 + 요청별 타임아웃 + 전체 마감 시간
+    - 응답은 스트림으로 받아 필요한 세트 수가 모이는 즉시 끊는다
+    - 여러 프롬프트를 순서대로 hedge: 앞 요청이 hedge_delay 안에 끝나지 않거나 번호가 부족하면 다음 프롬프트를 바로 보내고,
+      필요한 세트 수를 먼저 채운 응답을 쓴다 (동시에 max_in_flight 개까지, 남은 요청은 돌아가기 전에 취소한다)
+    - 요청은 공용 이벤트 루프의 코루틴으로 보내므로 취소하면 연결이 바로 끊긴다
+    """
+
+    def __init__(self, api_key: str = None, base_url: str = None, model: str = MODEL,
+                 timeout: float = DEFAULT_TIMEOUT, deadline: float = DEFAULT_DEADLINE,
+                 hedge_delay: float = DEFAULT_HEDGE_DELAY, cache=None, round_no: str = None,
+                 stream: bool = DEFAULT_STREAM, account: str = None, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT):
+        assert max_in_flight >= 1
+
+        self.client = get_client(api_key or os.environ.get("OPEN_API_KEY"),
+                                 base_url or os.environ.get("OPENAI_BASE_URL"), timeout)
+        self.model = model
+        self.deadline = deadline
+        self.hedge_delay = hedge_delay
+        self.max_in_flight = max_in_flight
+        self.cache = cache
+        self.round_no = round_no
+        self.stream = stream
+        # 추천 캐시를 계정별로 나눈다 (계정마다 다른 번호를 사도록)
+        self.account = account
+
+    def recommend(self, prompt_text: str, attempt_type: str = "main", need: int = 5) -> list:
+        """ChatGPT API 호출 및 파싱 (최대 need 세트, 실패 시 빈 목록)"""
+        return _run(self._recommend(prompt_text, attempt_type, need))
+
+    async def _recommend(self, prompt_text: str, attempt_type: str, need: int) -> list:
+        # 취소(asyncio.CancelledError)는 Exception 이 아니므로 아래에서 잡히지 않고 그대로 올라간다
+        messages = [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt_text}
+        ]
+
+        # 같은 회차에 같은 프롬프트로 이미 받은 추천이 있으면 재사용
+        if self.cache is not None and self.round_no:
+            cached = self.cache.get(self.round_no, self.model, messages, self.account)
+            if cached and len(cached) >= need:
+                print(f"🗃️ {self.round_no}회 추천 번호 캐시 사용 ({attempt_type}): {cached}")
+                return cached[:need]
+
+        try:
+            if self.stream:
+                generated_text, numbers = await self._stream(messages, need, attempt_type)
+            else:
+                generated_text, numbers = await self._complete(messages, need)
+
+            print(f"🤖 ChatGPT 응답 ({attempt_type}):")
+            print(f"   📝 원본 응답: {repr(generated_text)}")
+            print(f"   📊 응답 길이: {len(generated_text or '')}자")
+
+            # 응답 유효성 검사
+            if not generated_text or not generated_text.strip():
+                print(f"❌ ChatGPT 응답이 비어있습니다 ({attempt_type})")
+                return []
+
+            if len(generated_text.strip()) < 10:
+                print(f"❌ ChatGPT 응답이 너무 짧습니다: {len(generated_text)}자 ({attempt_type})")
+                return []
+
+            if numbers:
+                if len(numbers) >= need:
+                    print(f"✅ 최종 파싱 성공: {len(numbers)}개 세트 ({attempt_type})")
+                    if self.cache is not None and self.round_no:
+                        self.cache.put(self.round_no, self.model, messages, numbers, self.account)
+                else:
+                    print(f"⚠️ 일부 유효한 번호 발견: {len(numbers)}개 세트 ({attempt_type})")
+                return numbers
+
+            print(f"   ❌ 유효한 번호를 찾을 수 없음 ({attempt_type})")
+            return []
+
+        except Exception as e:
+            print(f"ChatGPT API 호출 중 오류 발생 ({attempt_type}): {e}")
+            describe_error(e)
+            return []
+
+    async def _complete(self, messages: list, need: int) -> tuple:
+        """전체 응답을 받은 뒤 한 번의 스캔으로 유효한 세트를 모두 찾는다"""
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=messages
+        )
+        generated_text = response.choices[0].message.content
+        return generated_text, number_parser.parse_number_sets(generated_text or "", limit=need)
+
+    async def _stream(self, messages: list, need: int, attempt_type: str) -> tuple:
+        """토큰이 오는 대로 파싱하고, need 개의 서로 다른 세트가 모이면 스트림을 끊는다"""
+        parser = number_parser.NumberSetParser(limit=need)
+        parts = []
+
+        stream = await self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            stream=True
+        )
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                parts.append(delta)
+                parser.feed(delta)
+                if parser.done:
+                    print(f"✂️ {need}개 세트를 모두 받아 응답 수신을 중단합니다 ({attempt_type})")
+                    break
+        finally:
+            await stream.close()
+
+        return "".join(parts), parser.close()
+
+    def first_valid(self, prompts: list, need: int = 5, max_requests: int = None) -> list:
+        """
+        prompts: [(attempt_type, prompt_text), ...] - 앞쪽일수록 우선
+        need 개 이상을 채운 첫 응답을 돌려주고, 마감 시간까지 없으면 가장 많이 찾은 응답을 돌려준다
+        프롬프트를 모두 보낸 뒤에도 응답이 늦으면 첫 프롬프트를 한 번 더 보낸다 (전체 요청 수는 max_requests 까지)
+        """
+        if not prompts:
+            return []
+        if max_requests is None:
+            max_requests = len(prompts) + 1
+        return _run(self._first_valid(prompts, need, max_requests))
+
+    async def _first_valid(self, prompts: list, need: int, max_requests: int) -> list:
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        best = []
+        remaining = list(prompts)
+        for attempt_type, prompt_text in prompts[:1] * (max_requests - len(prompts)):
+            remaining.append((f"{attempt_type}-재시도", prompt_text))
+        remaining = remaining[:max_requests]
+
+        pending = set()
+        next_launch = started_at
+        try:
+            while remaining or pending:
+                now = loop.time()
+                if now >= started_at + self.deadline:
+                    print(f"⏰ 추천 마감 시간 {self.deadline:.0f}초 초과 - 지금까지 받은 응답 사용")
+                    break
+
+                can_launch = remaining and len(pending) < self.max_in_flight
+                if can_launch and (now >= next_launch or not pending):
+                    attempt_type, prompt_text = remaining.pop(0)
+                    pending.add(asyncio.ensure_future(self._recommend(prompt_text, attempt_type, need)))
+                    next_launch = loop.time() + self.hedge_delay
+                    continue
+
+                timeout = started_at + self.deadline - now
+                if can_launch:
+                    timeout = min(timeout, max(next_launch - now, 0))
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    numbers = task.result()
+                    if len(numbers) >= need:
+                        return numbers[:need]
+                    if len(numbers) > len(best):
+                        best = numbers
+                if done:
+                    # 번호가 부족한 응답이 왔으면 다음 프롬프트를 기다리지 않고 보낸다
+                    next_launch = loop.time()
+            return best
+        finally:
+            # 이긴 응답이 있거나 마감이 지났으면 남은 요청을 끊고, 정리가 끝난 뒤에 돌아간다
+            # (호출이 끝난 뒤에 늦게 끝난 요청이 출력하거나 캐시에 쓰지 않도록)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+
+def describe_error(e: Exception) -> None:
+    """OpenAI 오류 종류별 안내"""
+    error_str = str(e).lower()
+    if "invalid_api_key" in error_str or "401" in error_str:
+        print("🔑 API 키 인증 오류 - GitHub Secrets에서 OPEN_API_KEY 확인 필요")
+        print("💡 GitHub 저장소 > Settings > Secrets and variables > Actions에서 확인")
+    elif "quota" in error_str or "billing" in error_str:
+        print("💰 API 할당량 초과 또는 결제 문제")
+    elif "rate_limit" in error_str:
+        print("⏱️ API 호출 제한 초과")
+    elif "timeout" in error_str or "timed out" in error_str:
+        print("⏰ API 호출 타임아웃")
+    elif "connection" in error_str:
+        print("🌐 네트워크 연결 오류")
+    else:
+        print(f"❓ 기타 오류: {type(e).__name__}")
@@ -2,14 +2,23 @@ import datetime
 import json
 import re
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 from enum import Enum
 
-from bs4 import BeautifulSoup as BS
-
 import auth
+import draw_info
+import draw_store
+import html_parser
+import metrics
+import purchase_store
+import ticket
 from HttpClient import HttpClientSingleton
 
+STAT_BY_NUMBER_URL = "https://www.dhlottery.co.kr/gameResult.do?method=statByNumber"
+NO_VIEW_NUMBER_URL = "https://www.dhlottery.co.kr/gameResult.do?method=noViewNumber"
+BY_WIN_URL = "https://www.dhlottery.co.kr/gameResult.do?method=byWin"
+
 
 def safe_json_parse(text, fallback=None):
     """
@@ -57,8 +66,8 @@ class Lotto645:
         "Accept-Language": "ko,en-US;q=0.9,en;q=0.8,ko-KR;q=0.7",
     }
 
-    def __init__(self):
-        self.http_client = HttpClientSingleton.get_instance()
+    def __init__(self, http_client=None):
+        self.http_client = http_client or HttpClientSingleton.get_instance()
 
     def buy_lotto645(
         self, 
@@ -119,6 +128,7 @@ class Lotto645:
 
 
 
+    @metrics.phase("requirements")
     def _getRequirements(self, headers: dict) -> list: 
         org_headers = headers.copy()
 
@@ -130,7 +140,8 @@ class Lotto645:
 		#no param needed at now
         res = self.http_client.post(
             url="https://ol.dhlottery.co.kr/olotto/game/egovUserReadySocket.json", 
-            headers=headers
+            headers=headers,
+            retry=True
         )
         
         direct = json.loads(res.text)["ready_ip"]
@@ -138,28 +149,19 @@ class Lotto645:
 
         res = self.http_client.post(
             url="https://ol.dhlottery.co.kr/olotto/game/game645.do", 
-            headers=org_headers
+            headers=org_headers,
+            retry=True
         )
         html = res.text
-        soup = BS(
-            html, "html5lib"
-        )
-        # 안전한 요소 찾기 및 값 추출
-        draw_date_elem = soup.find("input", id="ROUND_DRAW_DATE")
-        tlmt_date_elem = soup.find("input", id="WAMT_PAY_TLMT_END_DT")
-        
-        if draw_date_elem is None:
-            print("❌ ROUND_DRAW_DATE 요소를 찾을 수 없습니다.")
-            print(f"🔍 페이지 내용 일부: {html[:500]}...")
-            raise ValueError("ROUND_DRAW_DATE 요소를 찾을 수 없습니다. 로그인 상태나 페이지 구조를 확인해주세요.")
+        # 안전한 요소 찾기 및 값 추출 (input 태그만 파싱)
+        dates = html_parser.extract(html, self._read_draw_dates, only="input")
         
-        if tlmt_date_elem is None:
-            print("❌ WAMT_PAY_TLMT_END_DT 요소를 찾을 수 없습니다.")
+        if dates is None:
+            print("❌ ROUND_DRAW_DATE / WAMT_PAY_TLMT_END_DT 요소를 찾을 수 없습니다.")
             print(f"🔍 페이지 내용 일부: {html[:500]}...")
-            raise ValueError("WAMT_PAY_TLMT_END_DT 요소를 찾을 수 없습니다. 로그인 상태나 페이지 구조를 확인해주세요.")
+            raise ValueError("ROUND_DRAW_DATE / WAMT_PAY_TLMT_END_DT 요소를 찾을 수 없습니다. 로그인 상태나 페이지 구조를 확인해주세요.")
         
-        draw_date = draw_date_elem.get('value')
-        tlmt_date = tlmt_date_elem.get('value')
+        draw_date, tlmt_date = dates
         
         if not draw_date or not tlmt_date:
             print(f"❌ 날짜 값이 비어있습니다. draw_date: {draw_date}, tlmt_date: {tlmt_date}")
@@ -167,30 +169,33 @@ class Lotto645:
 
         return [direct, draw_date, tlmt_date]
 
+    @staticmethod
+    def _read_draw_dates(doc):
+        dates = (
+            doc.attr("input#ROUND_DRAW_DATE", "value"),
+            doc.attr("input#WAMT_PAY_TLMT_END_DT", "value"),
+        )
+        return dates if None not in dates else None
+
     def _get_round(self) -> str:
-        res = self.http_client.get("https://www.dhlottery.co.kr/common.do?method=main")
-        html = res.text
-        soup = BS(
-            html, "html5lib"
-        )  # 'html5lib' : in case that the html don't have clean tag pairs
-        last_drawn_round = int(soup.find("strong", id="lottoDrwNo").text)
-        return str(last_drawn_round + 1)
+        # 메인 페이지는 추첨 주기마다 한 번만 받아서 모든 계정/상품이 공유한다
+        return draw_info.get_lotto645_round(self.http_client)
 
     def get_balance(self, auth_ctrl: auth.AuthController) -> str: 
 
         headers = self._generate_req_headers(auth_ctrl)
         res = self.http_client.post(
             url="https://dhlottery.co.kr/userSsl.do?method=myPage", 
-            headers=headers
+            headers=headers,
+            retry=True
         )
 
-        html = res.text
-        soup = BS(
-            html, "html5lib"
-        )
-        balance = soup.find("p", class_="total_new").find('strong').text
+        balance = html_parser.extract(res.text, lambda doc: doc.text("p.total_new strong"), only="p.total_new")
+        if balance is None:
+            raise ValueError("마이페이지에서 잔액 정보를 찾을 수 없습니다.")
         return balance
         
+    @metrics.phase("execBuy")
     def _try_buying(self, headers: dict, data: dict) -> dict:
         assert type(headers) == dict
         assert type(data) == dict
@@ -212,11 +217,8 @@ class Lotto645:
                 
                 # HTML에서 오류 메시지 추출 시도
                 try:
-                    from bs4 import BeautifulSoup
-                    soup = BeautifulSoup(res.text, 'html.parser')
-                    error_text = soup.find('td', class_='lt_text2')
-                    if error_text:
-                        error_msg = error_text.get_text(strip=True)
+                    error_msg = html_parser.parse(res.text, only="td.lt_text2").text("td.lt_text2")
+                    if error_msg:
                         print(f"💡 서버 오류 메시지: {error_msg}")
                         return {
                             "error": "서버 오류",
@@ -248,7 +250,14 @@ class Lotto645:
                 "exception_type": type(e).__name__
             }
 
-    def check_winning(self, auth_ctrl: auth.AuthController) -> dict:
+    @metrics.phase("check")
+    def check_winning(self, auth_ctrl: auth.AuthController, purchases: dict = None) -> dict:
+        """
+        마지막 구매 회차의 당첨 결과
+        - purchases: PurchaseStore.load() 결과 ({"회차": [{"ticket_id": 바코드, "games": [...]}, ...]})
+          구매 내역 첫 행과 바코드가 맞는 기록이 있으면 당첨 번호로 직접 채점하고, 당첨 게임이 있을 때만 lotto645Detail 로 확인한다
+          (사이트에서 직접 산 표 등 맞는 기록이 없으면 언제나 상세 페이지를 본다)
+        """
         assert type(auth_ctrl) == auth.AuthController
 
         headers = self._generate_req_headers(auth_ctrl)
@@ -272,60 +281,112 @@ class Lotto645:
             res = self.http_client.post(
                 "https://dhlottery.co.kr/myPage.do?method=lottoBuyList",
                 headers=headers,
-                data=data
+                data=data,
+                retry=True
             )
 
-            html = res.text
-            soup = BS(html, "html5lib")
+            buy_list = html_parser.extract_soup(res.text, self._read_buy_list, only="table.tbl_data")
+            if buy_list is None:
+                raise ValueError("구매 내역 테이블을 찾을 수 없습니다.")
 
-            winnings = soup.find("table", class_="tbl_data tbl_data_col").find_all("tbody")[0].find_all("td")
+            winnings = buy_list["cells"]
+            if len(winnings) == 1:
+                return result_data
 
-            get_detail_info = winnings[3].find("a").get("href")
+            order_no, barcode, issue_no = buy_list["detail_href"].split("'")[1::2]
+            games = purchase_store.find_games((purchases or {}).get(winnings[2]), (winnings[3], barcode))
+            lotto_results = self._grade_locally(winnings[2], games)
+            if lotto_results is None or any(line["grade"] > 0 for line in lotto_results):
+                url = f"https://dhlottery.co.kr/myPage.do?method=lotto645Detail&orderNo={order_no}&barcode={barcode}&issueNo={issue_no}"
 
-            order_no, barcode, issue_no = get_detail_info.split("'")[1::2]
-            url = f"https://dhlottery.co.kr/myPage.do?method=lotto645Detail&orderNo={order_no}&barcode={barcode}&issueNo={issue_no}"
+                response = self.http_client.get(url)
 
-            response = self.http_client.get(url)
+                lotto_results = html_parser.extract_soup(response.text, self._parse_lotto645_detail, only="div.selected") or []
 
-            soup = BS(response.text, "html5lib")
+            result_data = {
+                "round": winnings[2],
+                "money": winnings[6],
+                "purchased_date": winnings[0],
+                "winning_date": winnings[7],
+                "lotto_details": lotto_results
+            }
+        except:
+            pass
 
-            lotto_results = []
+        return result_data
 
-            for li in soup.select("div.selected li"):
-                label = li.find("strong").find_all("span")[0].text.strip()
-                status = li.find("strong").find_all("span")[1].text.strip().replace("낙첨","0등")
-                nums = li.select("div.nums > span")
+    def _grade_locally(self, round_no: str, games: list):
+        """
+        저장된 구매 게임을 그 회차 당첨 번호로 채점한다 -> lotto645Detail 과 같은 형식 (+ grade)
+        - 당첨 번호는 로컬 저장소(draw_store)에서 먼저 찾고, 없을 때만 서버에 묻는다
+        - 구매 기록이 없거나 아직 추첨 전(당첨 번호 없음)이면 None
+        """
+        if not games or not round_no.isdigit():
+            return None
+
+        store = draw_store.get_store()
+        draw = store.draw(int(round_no)) if store is not None else None
+        if draw is None:
+            draw = draw_store.fetch_draw(self.http_client, int(round_no))
+        if draw is None:
+            return None
+
+        numbers, bonus = ticket.Ticket.of(draw[2:8]), draw[8]
+        lotto_results = []
+        for entry in games:
+            label, game = ticket.Ticket.from_game_choice(entry)
+            grade = game.grade(numbers, bonus)
+            lotto_results.append({
+                "label": label,
+                "status": f"{grade}등",
+                "result": [f"✨{n:02d}" if n in numbers else f"{n:02d}" for n in game],
+                "grade": grade,
+            })
+        return lotto_results
+
+    @staticmethod
+    def _read_buy_list(soup):
+        """구매 내역 표의 첫 번째 tbody 칸과, 네 번째 칸(선택번호/복권번호)의 상세 보기 링크"""
+        table = soup.select_one("table.tbl_data.tbl_data_col")
+        tbody = table.select_one("tbody") if table is not None else None
+        if tbody is None:
+            return None
+
+        tds = tbody.find_all("td")
+        if not tds:
+            return None
+        link = tds[3].find("a") if len(tds) > 3 else None
+        return {
+            "cells": [td.get_text().strip() for td in tds],
+            "detail_href": link.get("href") if link is not None else None
+        }
 
-                status = " ".join(status.split())
+    @staticmethod
+    def _parse_lotto645_detail(soup):
+        lotto_results = []
 
-                formatted_nums = []
-                for num in nums:
-                    ball = num.find("span", class_="ball_645")
-                    if ball:
-                        formatted_nums.append(f"✨{ball.text.strip()}")
-                    else:
-                        formatted_nums.append(num.text.strip())
+        for li in soup.select("div.selected li"):
+            label = li.find("strong").find_all("span")[0].text.strip()
+            status = li.find("strong").find_all("span")[1].text.strip().replace("낙첨","0등")
+            nums = li.select("div.nums > span")
 
-                lotto_results.append({
-                    "label": label,
-                    "status": status,
-                    "result": formatted_nums
-                })
+            status = " ".join(status.split())
 
-            if len(winnings) == 1:
-                return result_data
+            formatted_nums = []
+            for num in nums:
+                ball = num.find("span", class_="ball_645")
+                if ball:
+                    formatted_nums.append(f"✨{ball.text.strip()}")
+                else:
+                    formatted_nums.append(num.text.strip())
 
-            result_data = {
-                "round": winnings[2].text.strip(),
-                "money": winnings[6].text.strip(),
-                "purchased_date": winnings[0].text.strip(),
-                "winning_date": winnings[7].text.strip(),
-                "lotto_details": lotto_results
-            }
-        except:
-            pass
+            lotto_results.append({
+                "label": label,
+                "status": status,
+                "result": formatted_nums
+            })
 
-        return result_data
+        return lotto_results or None
     
     def _make_search_date(self) -> dict:
         today = datetime.datetime.today()
@@ -360,8 +421,8 @@ class Lotto645:
             "param": json.dumps(
                 [
                     # 동행복권 API는 arrGameChoiceNum을 콤마 구분자 문자열로 요구
-                    # 예: [5, 12, 17, 27, 33, 43] -> "5,12,17,27,33,43"
-                    {"genType": "1", "arrGameChoiceNum": ",".join(map(str, numbers)), "alpabet": slot}
+                    # 예: [5, 12, 17, 27, 33, 43] -> "5,12,17,27,33,43" (번호 목록 또는 Ticket, 잘못된 번호면 ValueError)
+                    {"genType": "1", "arrGameChoiceNum": ticket.Ticket.of(numbers).to_choice(), "alpabet": slot}
                     for slot, numbers in zip(SLOTS[:cnt], manual_numbers)
                 ]
             ),
@@ -370,30 +431,41 @@ class Lotto645:
             "gameCnt": cnt
         }
 
+    def prefetch_statistics(self) -> None:
+        """
+        프롬프트에 필요한 페이지(번호별 통계 / 미출현 번호 / 최근 당첨 번호 / 메인 페이지)를 동시에 받아둔다
+        이후 fetch_* 는 같은 응답을 재사용하므로 통계 수집이 왕복 한 번 시간에 끝난다
+        """
+        urls = (STAT_BY_NUMBER_URL, NO_VIEW_NUMBER_URL, BY_WIN_URL)
+        with ThreadPoolExecutor(max_workers=len(urls) + 1) as executor:
+            futures = [executor.submit(self.http_client.get_coalesced, url) for url in urls]
+            futures.append(executor.submit(draw_info.MainPageInfo.get, self.http_client))
+
+            for future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    # 실패한 페이지는 fetch_* 가 다시 요청하고 오류를 처리한다
+                    print(f"⚠️ 통계 페이지 미리 받기 실패: {e}")
+
     def fetch_lotto_statistics(self) -> dict:
         """로또 당첨 번호 통계를 크롤링"""
-        url = "https://www.dhlottery.co.kr/gameResult.do?method=statByNumber"
         try:
-            res = self.http_client.get(url)
-            soup = BS(res.text, "html.parser")
+            res = self.http_client.get_coalesced(STAT_BY_NUMBER_URL)
 
             stats = {}
-            # 번호별 통계 테이블 찾기 (두 번째 테이블)
-            tables = soup.find_all("table")
-            if len(tables) > 1:
-                table = tables[1]  # 두 번째 테이블이 번호별 통계
-                rows = table.find_all("tr")
-                for row in rows[1:]:  # 헤더 제외
-                    cols = row.find_all("td")
-                    if len(cols) >= 3:
-                        number = cols[0].text.strip()
-                        percentage = cols[1].text.strip()
-                        frequency = cols[2].text.strip()
-                        if number.isdigit() and 1 <= int(number) <= 45:
-                            stats[number] = {
-                                "percentage": percentage,
-                                "frequency": int(frequency) if frequency.isdigit() else 0
-                            }
+            # 번호별 통계 테이블 찾기 (두 번째 테이블이 번호별 통계)
+            rows = html_parser.extract(res.text, lambda doc: doc.rows(1) or None, only="table") or []
+            for cols in rows[1:]:  # 헤더 제외
+                if len(cols) >= 3:
+                    number = cols[0]
+                    percentage = cols[1]
+                    frequency = cols[2]
+                    if number.isdigit() and 1 <= int(number) <= 45:
+                        stats[number] = {
+                            "percentage": percentage,
+                            "frequency": int(frequency) if frequency.isdigit() else 0
+                        }
             
             return stats
         except Exception as e:
@@ -402,21 +474,17 @@ class Lotto645:
 
     def fetch_recent_no_show_numbers(self) -> list:
         """최근 미출현 번호 가져오기"""
-        url = "https://www.dhlottery.co.kr/gameResult.do?method=noViewNumber"
         try:
-            res = self.http_client.get(url)
-            soup = BS(res.text, "html.parser")
+            res = self.http_client.get_coalesced(NO_VIEW_NUMBER_URL)
             
             no_show_numbers = []
             # 미출현 번호 테이블 찾기
-            table = soup.find("table")
-            if table:
-                for row in table.find_all("tr")[1:]:  # 헤더 제외
-                    cols = row.find_all("td")
-                    if len(cols) >= 2:
-                        numbers = cols[1].text.strip()
-                        if numbers:
-                            no_show_numbers.extend(numbers.split())
+            rows = html_parser.extract(res.text, lambda doc: doc.rows(0) or None, only="table") or []
+            for cols in rows[1:]:  # 헤더 제외
+                if len(cols) >= 2:
+                    numbers = cols[1]
+                    if numbers:
+                        no_show_numbers.extend(numbers.split())
             
             return list(set(no_show_numbers))  # 중복 제거
         except Exception as e:
@@ -425,32 +493,35 @@ class Lotto645:
 
     def fetch_recent_winning_numbers(self, count: int = 10) -> list:
         """최근 당첨 번호 가져오기"""
-        url = "https://www.dhlottery.co.kr/gameResult.do?method=byWin"
+        # 최신 회차까지 동기화된 로컬 저장소가 있으면 스크래핑하지 않는다
+        store = draw_store.get_store()
+        try:
+            if store is not None and store.is_current(self.http_client):
+                return store.recent_winning_numbers(count)
+        except Exception as e:
+            print(f"⚠️ 로컬 당첨 번호 저장소 조회 실패: {e}")
+
         try:
-            res = self.http_client.get(url)
-            soup = BS(res.text, "html.parser")
+            res = self.http_client.get_coalesced(BY_WIN_URL)
             
             recent_numbers = []
             # 최근 당첨 번호 테이블 찾기
-            table = soup.find("table")
-            if table:
-                rows = table.find_all("tr")[1:count+1]  # 헤더 제외하고 count만큼
-                for row in rows:
-                    cols = row.find_all("td")
-                    if len(cols) >= 4:
-                        round_num = cols[0].text.strip()
-                        date = cols[1].text.strip()
-                        numbers = cols[2].text.strip()
-                        bonus = cols[3].text.strip()
-                        
-                        if numbers:
-                            number_list = [int(x.strip()) for x in numbers.split(',') if x.strip().isdigit()]
-                            recent_numbers.append({
-                                "round": round_num,
-                                "date": date,
-                                "numbers": number_list,
-                                "bonus": int(bonus) if bonus.isdigit() else 0
-                            })
+            rows = html_parser.extract(res.text, lambda doc: doc.rows(0) or None, only="table") or []
+            for cols in rows[1:count+1]:  # 헤더 제외하고 count만큼
+                if len(cols) >= 4:
+                    round_num = cols[0]
+                    date = cols[1]
+                    numbers = cols[2]
+                    bonus = cols[3]
+                    
+                    if numbers:
+                        number_list = [int(x.strip()) for x in numbers.split(',') if x.strip().isdigit()]
+                        recent_numbers.append({
+                            "round": round_num,
+                            "date": date,
+                            "numbers": number_list,
+                            "bonus": int(bonus) if bonus.isdigit() else 0
+                        })
             
             return recent_numbers
         except Exception as e:
@@ -0,0 +1,139 @@
+import numpy as np
+
+DECADES = ((1, 10), (11, 20), (21, 30), (31, 40), (41, 45))
+
+
+class DrawHistory:
+    """
+    역대 당첨 번호를 NumPy 배열로 들고 있는 통계 엔진
+    - numbers: (회차 수, 6) 당첨 번호, bonus: (회차 수,) 보너스 번호, 회차 오름차순
+    - 모든 통계는 번호별 출현 행렬 (회차 수, 46) 하나로 벡터 연산한다
+    """
+
+    def __init__(self, rounds, dates, numbers, bonus):
+        self.rounds = np.asarray(rounds, dtype=np.int32)
+        self.dates = list(dates)
+        self.numbers = np.asarray(numbers, dtype=np.int16).reshape(-1, 6)
+        self.bonus = np.asarray(bonus, dtype=np.int16)
+        self._presence = {}
+
+    @classmethod
+    def from_rows(cls, rows: list) -> "DrawHistory":
+        """DrawStore.rows() 형식 (round, date, n1..n6, bonus)"""
+        if not rows:
+            return cls([], [], np.empty((0, 6)), [])
+        return cls(
+            [row[0] for row in rows],
+            [row[1] for row in rows],
+            [row[2:8] for row in rows],
+            [row[8] for row in rows],
+        )
+
+    @classmethod
+    def from_store(cls, store) -> "DrawHistory":
+        return cls.from_rows(store.rows())
+
+    def __len__(self) -> int:
+        return len(self.rounds)
+
+    def window(self, last: int = None) -> "DrawHistory":
+        """최근 last 회차만 남긴 뷰 (None 이면 전체)"""
+        if last is None or last >= len(self):
+            return self
+        start = len(self) - last
+        return DrawHistory(self.rounds[start:], self.dates[start:], self.numbers[start:], self.bonus[start:])
+
+    def presence(self, include_bonus: bool = True) -> np.ndarray:
+        """(회차 수, 46) bool 행렬 - [i, n] 은 i 번째 회차에 번호 n 이 나왔는지 (0번 열은 사용하지 않음)"""
+        matrix = self._presence.get(include_bonus)
+        if matrix is None:
+            matrix = np.zeros((len(self), 46), dtype=bool)
+            rows = np.arange(len(self))[:, None]
+            matrix[rows, self.numbers] = True
+            if include_bonus and len(self):
+                matrix[rows[:, 0], self.bonus] = True
+            self._presence[include_bonus] = matrix
+        return matrix
+
+    def summary(self, include_bonus: bool = True) -> dict:
+        """번호별 빈도 / 마지막 출현 후 경과 회차 / 홀짝 / 구간 / 합계 분포를 한 번에 계산한다"""
+        n = len(self)
+        matrix = self.presence(include_bonus)
+
+        frequency = matrix.sum(axis=0)
+        seen = matrix.any(axis=0)
+        # 뒤에서부터 처음 True 인 위치 = 마지막 출현 이후 지난 회차 수 (한 번도 안 나왔으면 n)
+        last_seen = np.argmax(matrix[::-1], axis=0) if n else np.zeros(46, dtype=np.int64)
+        gaps = np.where(seen, last_seen, n)
+
+        odd_counts = (self.numbers % 2 == 1).sum(axis=1)
+        decade_index = np.minimum((self.numbers - 1) // 10, len(DECADES) - 1)
+        decade_counts = np.zeros((n, len(DECADES)), dtype=np.int16)
+        np.add.at(decade_counts, (np.arange(n)[:, None], decade_index), 1)
+        sums = self.numbers.sum(axis=1)
+
+        return {
+            "draws": n,
+            "frequency": frequency[1:],
+            "gaps": gaps[1:],
+            "odd_even": np.bincount(odd_counts, minlength=7),
+            "decades": decade_counts.sum(axis=0),
+            "decade_spread": np.bincount((decade_counts > 0).sum(axis=1), minlength=len(DECADES) + 1),
+            "sum_range": {
+                "min": int(sums.min()) if n else 0,
+                "max": int(sums.max()) if n else 0,
+                "mean": float(sums.mean()) if n else 0.0,
+                "p10": float(np.percentile(sums, 10)) if n else 0.0,
+                "p90": float(np.percentile(sums, 90)) if n else 0.0,
+            },
+        }
+
+    def number_statistics(self, include_bonus: bool = True) -> dict:
+        """Lotto645.fetch_lotto_statistics 와 같은 형식: {"1": {"percentage": "2.34%", "frequency": 170}, ...}"""
+        frequency = self.presence(include_bonus).sum(axis=0)[1:]
+        total = int(frequency.sum()) or 1
+        return {
+            str(number): {
+                "percentage": f"{count / total * 100:.2f}%",
+                "frequency": int(count),
+            }
+            for number, count in zip(range(1, 46), frequency)
+        }
+
+    def no_show_numbers(self, window: int = 10, minimum: int = 0, include_bonus: bool = True) -> list:
+        """
+        Lotto645.fetch_recent_no_show_numbers 와 같은 형식 (문자열 목록)
+        - 최근 window 회차에 나오지 않은 번호, minimum 개보다 적으면 창을 줄여가며 다시 계산한다
+        """
+        matrix = self.presence(include_bonus)
+        while True:
+            recent = matrix[-window:] if window > 0 else matrix[:0]
+            unseen = np.flatnonzero(~recent.any(axis=0)[1:]) + 1
+            if len(unseen) >= minimum or window <= 1:
+                return [str(number) for number in unseen]
+            window -= 1
+
+    def recent_winning_numbers(self, count: int = 10) -> list:
+        """Lotto645.fetch_recent_winning_numbers 와 같은 형식 (최신 회차부터)"""
+        count = min(count, len(self))
+        return [
+            {
+                "round": str(int(self.rounds[i])),
+                "date": self.dates[i],
+                "numbers": [int(x) for x in self.numbers[i]],
+                "bonus": int(self.bonus[i]),
+            }
+            for i in range(len(self) - 1, len(self) - 1 - count, -1)
+        ]
+
+
+def prompt_inputs(history: DrawHistory, recent_count: int = 5, no_show_window: int = 10) -> tuple:
+    """
+    ChatGPT 프롬프트가 쓰는 세 가지 데이터를 로컬 이력으로 만든다
+    (fetch_lotto_statistics, fetch_recent_no_show_numbers, fetch_recent_winning_numbers 대체)
+    """
+    return (
+        history.number_statistics(),
+        history.no_show_numbers(no_show_window, minimum=6),
+        history.recent_winning_numbers(recent_count),
+    )
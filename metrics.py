@@ -0,0 +1,185 @@
+import collections
+import contextlib
+import contextvars
+import json
+import os
+import threading
+import time
+
+# 설정하면 실행이 끝날 때 요청 기록을 spans.jsonl (이어 쓰기) / metrics.prom (Prometheus 텍스트 형식) 으로 남긴다
+METRICS_DIR = os.environ.get("METRICS_DIR", "")
+# 켜면 실행별 요청 지연 요약을 웹훅 메시지 끝에 붙여 보낸다
+LATENCY_SUMMARY = os.environ.get("NOTIFY_LATENCY_SUMMARY", "").lower() in ("1", "true", "yes")
+
+# 한 프로세스가 들고 있는 최대 요청 기록 수 (구매 내역 크롤링처럼 요청이 많아도 메모리가 늘지 않도록)
+MAX_SPANS = 10000
+
+# 요청 시간 히스토그램 구간 (초)
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STAGES = ("dns", "connect", "tls", "ttfb")
+
+# 같은 파일에 여러 실행을 이어 쓰므로 실행마다 구분자를 붙인다
+RUN_ID = f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}"
+
+_phase = contextvars.ContextVar("metrics_phase", default="other")
+
+
+@contextlib.contextmanager
+def phase(name: str):
+    """
+    이 안에서 보낸 요청을 name 단계(login, requirements, execBuy, connPro, check ...)로 기록한다
+    - with metrics.phase("login"): 또는 @metrics.phase("login") 데코레이터로 쓴다
+    """
+    token = _phase.set(name)
+    try:
+        yield
+    finally:
+        _phase.reset(token)
+
+
+def current_phase() -> str:
+    return _phase.get()
+
+
+def percentile(values: list, q: float) -> float:
+    """정렬된 값 목록의 nearest-rank 백분위수"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, int(q * len(values) + 0.5) - 1))
+    return values[index]
+
+
+def _labels(span: dict) -> tuple:
+    return (span["host"], span["endpoint"], span["method"], span["phase"], str(span["status"]))
+
+
+def _format_labels(names: tuple, values: tuple) -> str:
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in values)
+    return ",".join(f'{name}="{value}"' for name, value in zip(names, escaped))
+
+
+class SpanRecorder:
+    """
+    HttpClient 가 보낸 요청 하나하나의 기록(span)을 모은다
+    - span: host, endpoint, method, status, bytes, dns/connect/tls/ttfb/total 시간(초), phase
+    - 여러 스레드(계정별 워커, 파이프라인)에서 동시에 record 해도 된다
+    """
+
+    LABEL_NAMES = ("host", "endpoint", "method", "phase", "status")
+
+    def __init__(self, max_spans: int = MAX_SPANS):
+        self._spans = collections.deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+
+    def record(self, span: dict) -> None:
+        span.setdefault("phase", current_phase())
+        with self._lock:
+            self._spans.append(span)
+
+    def spans(self) -> list:
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+    def write_jsonl(self, path: str) -> int:
+        spans = self.spans()
+        with open(path, "a", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json.dumps({"run": RUN_ID, **span}, ensure_ascii=False) + "\n")
+        return len(spans)
+
+    def write_prometheus(self, path: str) -> None:
+        """node_exporter textfile collector 가 읽을 수 있도록 임시 파일에 쓰고 바꿔 넣는다"""
+        histograms = {}
+        stages = collections.Counter()
+        sizes = collections.Counter()
+        for span in self.spans():
+            labels = _labels(span)
+            buckets, total, count = histograms.get(labels, ([0] * len(BUCKETS), 0.0, 0))
+            for i, bound in enumerate(BUCKETS):
+                if span["total"] <= bound:
+                    buckets[i] += 1
+            histograms[labels] = (buckets, total + span["total"], count + 1)
+            sizes[labels] += span["bytes"]
+            for stage in STAGES:
+                stages[labels + (stage,)] += span[stage] or 0.0
+
+        lines = [
+            "# HELP dhlottery_http_request_duration_seconds 동행복권 요청 하나의 전체 시간",
+            "# TYPE dhlottery_http_request_duration_seconds histogram",
+        ]
+        for labels, (buckets, total, count) in sorted(histograms.items()):
+            base = _format_labels(self.LABEL_NAMES, labels)
+            for bound, cumulative in zip(BUCKETS, buckets):
+                lines.append(f'dhlottery_http_request_duration_seconds_bucket{{{base},le="{bound}"}} {cumulative}')
+            lines.append(f'dhlottery_http_request_duration_seconds_bucket{{{base},le="+Inf"}} {count}')
+            lines.append(f"dhlottery_http_request_duration_seconds_sum{{{base}}} {total:.6f}")
+            lines.append(f"dhlottery_http_request_duration_seconds_count{{{base}}} {count}")
+
+        lines += [
+            "# HELP dhlottery_http_request_stage_seconds_total 요청 단계(dns/connect/tls/ttfb)별 누적 시간",
+            "# TYPE dhlottery_http_request_stage_seconds_total counter",
+        ]
+        for labels, seconds in sorted(stages.items()):
+            base = _format_labels(self.LABEL_NAMES + ("stage",), labels)
+            lines.append(f"dhlottery_http_request_stage_seconds_total{{{base}}} {seconds:.6f}")
+
+        lines += [
+            "# HELP dhlottery_http_response_bytes_total 받은 응답 본문 크기",
+            "# TYPE dhlottery_http_response_bytes_total counter",
+        ]
+        for labels, size in sorted(sizes.items()):
+            lines.append(f"dhlottery_http_response_bytes_total{{{_format_labels(self.LABEL_NAMES, labels)}}} {size}")
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+
+    def summary(self) -> str:
+        """실행 하나의 요청 지연 요약 (콘솔 / 웹훅 메시지용), 기록이 없으면 빈 문자열"""
+        spans = self.spans()
+        if not spans:
+            return ""
+
+        totals = sorted(span["total"] for span in spans)
+        lines = [f"⏱️ 요청 {len(spans)}건 / 합계 {sum(totals):.2f}s / "
+                 f"p50 {percentile(totals, 0.5):.3f}s / p95 {percentile(totals, 0.95):.3f}s"]
+
+        by_phase = collections.OrderedDict()
+        for span in spans:
+            count, total = by_phase.get(span["phase"], (0, 0.0))
+            by_phase[span["phase"]] = (count + 1, total + span["total"])
+        lines.append("   " + ", ".join(f"{name} {count}건 {total:.2f}s" for name, (count, total) in by_phase.items()))
+
+        slowest = max(spans, key=lambda span: span["total"])
+        lines.append(f"   가장 느린 요청: {slowest['method']} {slowest['host']}{slowest['endpoint']} "
+                     f"{slowest['total']:.3f}s ({slowest['phase']}, 상태 {slowest['status']})")
+        return "\n".join(lines)
+
+    def export(self, directory: str = None) -> bool:
+        """directory (기본 METRICS_DIR) 에 spans.jsonl / metrics.prom 을 남긴다, 설정이 없으면 아무것도 안 한다"""
+        directory = directory or METRICS_DIR
+        if not directory:
+            return False
+
+        os.makedirs(directory, exist_ok=True)
+        count = self.write_jsonl(os.path.join(directory, "spans.jsonl"))
+        self.write_prometheus(os.path.join(directory, "metrics.prom"))
+        print(f"📈 요청 기록 {count}건을 {directory} 에 저장했습니다")
+        return True
+
+
+_default_recorder = None
+_default_recorder_lock = threading.Lock()
+
+
+def get_recorder() -> SpanRecorder:
+    global _default_recorder
+    with _default_recorder_lock:
+        if _default_recorder is None:
+            _default_recorder = SpanRecorder()
+        return _default_recorder
@@ -1,5 +1,24 @@
-import requests
+import os
+import queue
 import re
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import ticket
+
+WEBHOOK_TIMEOUT = 5
+WEBHOOK_MAX_RETRIES = 3
+WEBHOOK_BACKOFF = 0.5
+
+# 첫 메시지 뒤 이 시간 동안 들어온 메시지를 같은 웹훅끼리 묶어 한 번에 보낸다 (flush 중에는 기다리지 않음)
+BATCH_WINDOW = float(os.environ.get("NOTIFY_BATCH_WINDOW", 2))
+MAX_BATCH_CHARS = 3000
+
+# 프로그램 종료 시 남은 알림을 보내는 데 기다릴 최대 시간
+FLUSH_TIMEOUT = float(os.environ.get("NOTIFY_FLUSH_TIMEOUT", 30))
 
 class Notification:
     def send_lotto_buying_message(self, body: dict, webhook_url: str) -> None:
@@ -23,6 +42,9 @@ class Notification:
             if purchase_method == "CHATGPT_MANUAL":
                 method_emoji = "🤖"
                 method_text = "ChatGPT 추천 번호로 수동 구매"
+            elif purchase_method == "LOCAL_MANUAL":
+                method_emoji = "📊"
+                method_text = "통계 기반 추천 번호로 수동 구매"
             elif purchase_method == "AUTO_FALLBACK":
                 method_emoji = "🔄"
                 method_text = "ChatGPT 실패 → 자동 번호 구매"
@@ -57,16 +79,16 @@ class Notification:
     def make_lotto_number_message(self, lotto_number: list) -> str:
         assert type(lotto_number) == list
 
-        # parse list without last number 3
-        lotto_number = [x[:-1] for x in lotto_number]
-        
-        # remove alphabet and | replace white space  from lotto_number
-        lotto_number = [x.replace("|", " ") for x in lotto_number]
-        
-        # lotto_number to string 
-        lotto_number = '\n'.join(x for x in lotto_number)
-        
-        return lotto_number
+        # "A|01|05|12|23|34|453" -> "A 01 05 12 23 34 45" (마지막 선택 방식 글자는 버린다)
+        lines = []
+        for entry in lotto_number:
+            try:
+                label, game = ticket.Ticket.from_game_choice(entry)
+                lines.append(game.to_game_choice(label).replace("|", " "))
+            except ValueError:
+                lines.append(entry[:-1].replace("|", " "))
+
+        return '\n'.join(lines)
 
     def send_win720_buying_message(self, body: dict, webhook_url: str) -> None:
         
@@ -143,7 +165,195 @@ class Notification:
             self._send_discord_webhook(webhook_url, message)
             return
 
-    def _send_discord_webhook(self, webhook_url: str, message: str) -> None:        
-        payload = { "text": message }
+    def _send_discord_webhook(self, webhook_url: str, message: str) -> None:
+        # 구매 흐름을 막지 않도록 큐에 넣기만 하고, 전송은 백그라운드 워커가 한다
+        get_queue().put(webhook_url, message)
+
+
+class WebhookQueue:
+    """
+    웹훅 알림 전송 큐
+    - 백그라운드 워커 하나가 커넥션 풀을 가진 세션으로 보낸다 (타임아웃 + 제한된 재시도/백오프)
+    - BATCH_WINDOW 안에 모인 메시지는 웹훅별로 합쳐 한 번에 보낸다 (계정 하나의 로또/연금복권, 여러 계정)
+    - 웹훅이 느리거나 죽어 있어도 put() 은 바로 돌아온다, 종료 전에 flush() 로 남은 메시지를 보낸다
+    """
+
+    def __init__(self, timeout: float = WEBHOOK_TIMEOUT, max_retries: int = WEBHOOK_MAX_RETRIES,
+                 backoff: float = WEBHOOK_BACKOFF, batch_window: float = BATCH_WINDOW):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.batch_window = batch_window
+
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+        self.sent = 0
+        self.failed = 0
+        self.posts = 0
+
+        self._queue = queue.Queue()
+        self._pending = 0
+        self._idle = threading.Condition()
+        self._draining = threading.Event()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+    def put(self, webhook_url: str, message: str) -> None:
+        if not webhook_url:
+            return
+        with self._idle:
+            self._pending += 1
+        self._queue.put((webhook_url, message))
+        self._ensure_worker()
+
+    def flush(self, timeout: float = FLUSH_TIMEOUT) -> bool:
+        """큐에 남은 메시지를 모두 보낼 때까지 (최대 timeout 초) 기다린다"""
+        deadline = time.monotonic() + timeout
+        self._draining.set()
+        # 배치 창을 기다리며 자고 있는 워커를 깨운다 (None 은 메시지가 아님)
+        self._queue.put(None)
+        try:
+            with self._idle:
+                while self._pending:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        print(f"⚠️ 알림 {self._pending}건을 보내지 못하고 종료합니다")
+                        return False
+                    self._idle.wait(remaining)
+            return True
+        finally:
+            self._draining.clear()
+
+    def _ensure_worker(self) -> None:
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="webhook", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.batch_window
+            while True:
+                try:
+                    if self._draining.is_set():
+                        batch.append(self._queue.get_nowait())
+                    else:
+                        batch.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+
+            batch = [item for item in batch if item is not None]
+            if not batch:
+                continue
+
+            # 어떤 오류가 나도 _pending 을 줄여야 flush() 가 끝나고, 워커도 다음 배치를 계속 처리한다
+            try:
+                grouped = {}
+                for webhook_url, message in batch:
+                    grouped.setdefault(webhook_url, []).append(message)
+
+                for webhook_url, messages in grouped.items():
+                    for text, count in _join_messages(messages):
+                        try:
+                            posted = self._post(webhook_url, text)
+                        except Exception as e:
+                            print(f"❌ 알림 전송 중 오류 ({type(e).__name__}: {e}) - 재시도하지 않습니다")
+                            posted = False
+                        if posted:
+                            self.sent += count
+                        else:
+                            self.failed += count
+            finally:
+                with self._idle:
+                    self._pending -= len(batch)
+                    self._idle.notify_all()
+
+    def _post(self, webhook_url: str, text: str) -> bool:
+        payload = { "text": text }
         headers = { "Content-Type": "application/json" }
-        requests.post(webhook_url, json=payload, headers=headers)
+
+        for attempt in range(self.max_retries + 1):
+            wait = self.backoff * (2 ** attempt)
+            try:
+                self.posts += 1
+                res = self.session.post(webhook_url, json=payload, headers=headers, timeout=self.timeout)
+                if res.status_code < 400:
+                    return True
+                if res.status_code != 429 and res.status_code < 500:
+                    print(f"❌ 알림 전송 실패 (HTTP {res.status_code}) - 재시도하지 않습니다")
+                    return False
+                retry_after = res.headers.get("Retry-After", "")
+                if retry_after.replace(".", "", 1).isdigit():
+                    wait = max(wait, float(retry_after))
+                error = f"HTTP {res.status_code}"
+            except requests.RequestException as e:
+                error = type(e).__name__
+
+            if attempt < self.max_retries:
+                time.sleep(wait)
+
+        print(f"❌ 알림 전송 실패 ({error}) - {self.max_retries}회 재시도 후 포기")
+        return False
+
+
+def _join_messages(messages: list) -> list:
+    """
+    메시지를 MAX_BATCH_CHARS 를 넘지 않게 묶는다 -> [(합친 텍스트, 메시지 수), ...]
+    - 혼자서도 넘치는 메시지는 줄 단위(그래도 길면 글자 수)로 나누고, 메시지 수는 마지막 조각에만 센다
+    """
+    chunks = []
+    current, count = "", 0
+    for message in messages:
+        if current and len(current) + 2 + len(message) > MAX_BATCH_CHARS:
+            chunks.append((current, count))
+            current, count = "", 0
+        if len(message) > MAX_BATCH_CHARS:
+            pieces = _split_message(message)
+            chunks.extend((piece, 0) for piece in pieces[:-1])
+            message = pieces[-1]
+        current = f"{current}\n\n{message}" if current else message
+        count += 1
+    if current:
+        chunks.append((current, count))
+    return chunks
+
+
+def _split_message(message: str) -> list:
+    """MAX_BATCH_CHARS 보다 긴 메시지 하나 -> 그 길이를 넘지 않는 조각들"""
+    pieces = []
+    current = ""
+    for line in message.split("\n"):
+        while len(line) > MAX_BATCH_CHARS:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(line[:MAX_BATCH_CHARS])
+            line = line[MAX_BATCH_CHARS:]
+        if current and len(current) + 1 + len(line) > MAX_BATCH_CHARS:
+            pieces.append(current)
+            current = line
+        else:
+            current = f"{current}\n{line}" if current else line
+    pieces.append(current)
+    return pieces
+
+
+_default_queue = None
+_default_queue_lock = threading.Lock()
+
+
+def get_queue() -> WebhookQueue:
+    global _default_queue
+    with _default_queue_lock:
+        if _default_queue is None:
+            _default_queue = WebhookQueue()
+        return _default_queue
+
+
+def flush(timeout: float = FLUSH_TIMEOUT) -> bool:
+    """프로그램 종료 전에 호출 - 보낼 알림이 없으면 바로 돌아온다"""
+    with _default_queue_lock:
+        pending_queue = _default_queue
+    return pending_queue.flush(timeout) if pending_queue is not None else True
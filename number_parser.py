@@ -0,0 +1,108 @@
+import re
+
+import ticket
+
+SET_SIZE = 6
+MIN_NUMBER = 1
+MAX_NUMBER = 45
+
+# 가장 안쪽 대괄호 하나 (안에 다른 대괄호가 없는 [ ... ])
+_GROUP = re.compile(r"\[([^\[\]]*)\]")
+
+# 대괄호 안 내용이 콤마로 나뉜 숫자 정확히 6개인지
+_SIX = r"(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)"
+_GROUP_SET = re.compile(r"\s*" + _SIX + r"\s*")
+
+# 대괄호 세트가 하나도 없을 때만 쓰는 "n, n, n, n, n, n"
+_BARE_SET = re.compile(_SIX)
+
+
+def _numbers(tokens: tuple):
+    """숫자 토큰 6개가 모두 1~45 이고 서로 다르면 int 목록, 아니면 None ("07" 처럼 앞의 0 은 허용)"""
+    numbers = []
+    for token in tokens:
+        digits = token.lstrip("0")
+        if not digits or len(digits) > 2:
+            return None
+        value = int(digits)
+        if value < MIN_NUMBER or value > MAX_NUMBER:
+            return None
+        numbers.append(value)
+    return numbers if len(set(numbers)) == SET_SIZE else None
+
+
+class NumberSetParser:
+    """
+    ChatGPT 응답에서 로또 번호 세트를 한 번의 스캔으로 뽑아낸다
+    - 대괄호 세트: 가장 안쪽 [ ... ] 가 콤마로 나뉜 숫자 6개이고, 모두 1~45 이며 중복이 없으면 채택
+    - 대괄호 세트가 하나도 없을 때만 "n, n, n, n, n, n" 처럼 콤마로 이어진 숫자 6개를 세트로 본다
+    - 응답이 잘려 마지막 [ 가 닫히지 않았어도 그 뒤가 숫자 6개면 세트로 본다 (close() 에서)
+    - 같은 번호 조합(순서 무관)은 한 번만 남긴다
+    - feed() 로 조각을 나눠 넣을 수 있고 (스트리밍), 이미 읽은 부분은 다시 스캔하지 않는다
+    """
+
+    def __init__(self, limit: int = None):
+        self.limit = limit
+        self.sets = []
+        self._seen = set()
+        self._buffer = ""
+        self._pos = 0
+
+    @property
+    def done(self) -> bool:
+        return self.limit is not None and len(self.sets) >= self.limit
+
+    def feed(self, text: str) -> list:
+        """text 를 이어서 읽고, 이번에 새로 완성된 대괄호 세트 목록을 돌려준다"""
+        if self.done:
+            return []
+
+        self._buffer += text
+        found = []
+        for match in _GROUP.finditer(self._buffer, self._pos):
+            self._pos = match.end()
+            content = _GROUP_SET.fullmatch(match.group(1))
+            numbers = _numbers(content.groups()) if content else None
+            if numbers is not None and self._add(numbers):
+                found.append(numbers)
+                if self.done:
+                    return found
+
+        # 아직 닫히지 않은 마지막 [ 부터 다음 조각과 이어서 본다
+        start = self._buffer.rfind("[", self._pos)
+        self._pos = start if start >= 0 else len(self._buffer)
+        return found
+
+    def close(self) -> list:
+        """최종 세트 목록을 돌려준다"""
+        # feed() 가 닫히지 않은 마지막 [ 위치에 멈춰 있다 (max_tokens 로 잘린 응답)
+        tail = self._buffer[self._pos:]
+        if tail.startswith("[") and not self.done:
+            content = _GROUP_SET.fullmatch(tail[1:].rstrip().rstrip(","))
+            numbers = _numbers(content.groups()) if content else None
+            if numbers is not None:
+                self._add(numbers)
+            self._pos = len(self._buffer)
+
+        if not self.sets:
+            for tokens in _BARE_SET.findall(self._buffer):
+                numbers = _numbers(tokens)
+                if numbers is not None:
+                    self._add(numbers)
+
+        return self.sets[:self.limit] if self.limit is not None else list(self.sets)
+
+    def _add(self, numbers: list) -> bool:
+        key = ticket.mask_of(numbers)
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        self.sets.append(numbers)
+        return True
+
+
+def parse_number_sets(text: str, limit: int = None) -> list:
+    """응답 전체에서 유효한 번호 세트 목록 (원문 순서, 각 세트는 응답에 적힌 순서의 int 목록)"""
+    parser = NumberSetParser(limit)
+    parser.feed(text)
+    return parser.close()
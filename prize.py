@@ -0,0 +1,117 @@
+import numpy as np
+
+import ticket
+
+# 등수 -> 표시 이름 (0 은 낙첨, lotto645Detail 페이지의 "낙첨" 을 "0등" 으로 바꿔 쓰는 것과 맞춘다)
+GRADE_NAMES = {
+    1: "1등",
+    2: "2등",
+    3: "3등",
+    4: "4등",
+    5: "5등",
+    0: "0등",
+}
+
+# 맞힌 번호 수 -> 등수 (5개는 보너스 여부로 2/3등이 갈린다)
+_GRADE_BY_MATCHES = np.array(ticket.GRADE_BY_MATCHES, dtype=np.int8)
+
+
+def parse_game_choice(entry: str) -> tuple:
+    """
+    구매 응답의 arrGameChoiceNum 한 줄 -> (게임 라벨, 번호 6개)
+    - 형식: "A|01|05|12|23|34|45" + 선택 방식 한 글자 (make_lotto_number_message 와 같이 마지막 글자는 버린다)
+    """
+    assert type(entry) == str
+
+    label, game = ticket.Ticket.from_game_choice(entry)
+    return label, game.numbers
+
+
+def tickets_from_purchase(arr_game_choice_num: list) -> tuple:
+    """arrGameChoiceNum 목록 -> (라벨 목록, (게임 수, 6) 번호 행렬)"""
+    assert type(arr_game_choice_num) == list
+
+    labels, rows = [], []
+    for entry in arr_game_choice_num:
+        label, numbers = parse_game_choice(entry)
+        labels.append(label)
+        rows.append(numbers)
+    return labels, np.asarray(rows, dtype=np.int16).reshape(-1, 6)
+
+
+def _grade_from_hits(hits: np.ndarray, tickets: np.ndarray, bonus) -> np.ndarray:
+    """hits: (게임 수, 6) 번호별 적중 여부, bonus: 보너스 번호 (스칼라 또는 게임별 배열)"""
+    matches = hits.view(np.uint8).sum(axis=1, dtype=np.int8)
+    grades = _GRADE_BY_MATCHES[matches]
+
+    # 5개를 맞힌 게임만 보너스 번호를 확인한다 (5개 + 보너스 = 2등)
+    five = np.flatnonzero(matches == 5)
+    if len(five):
+        five_bonus = np.reshape(bonus if np.ndim(bonus) == 0 else np.asarray(bonus)[five], (-1, 1))
+        grades[five[(tickets[five] == five_bonus).any(axis=1)]] = 2
+    return grades
+
+
+def grade(tickets, numbers, bonus: int) -> np.ndarray:
+    """
+    한 회차의 당첨 번호 6개 + 보너스로 모든 게임의 등수(1~5, 낙첨 0)를 한 번에 계산한다
+    - tickets: (게임 수, 6) 번호 행렬 (중복 없는 1~45)
+    """
+    tickets = np.asarray(tickets, dtype=np.intp).reshape(-1, 6)
+
+    drawn = np.zeros(46, dtype=bool)
+    drawn[np.asarray(numbers, dtype=np.intp)] = True
+
+    return _grade_from_hits(drawn[tickets], tickets, bonus)
+
+
+def grade_rounds(tickets, rounds, history) -> np.ndarray:
+    """
+    서로 다른 회차에 산 게임들을 DrawHistory 로 한 번에 채점한다
+    - rounds: 게임별 구매 회차 (게임 수,)
+    - 아직 추첨하지 않은(이력에 없는) 회차의 게임은 -1
+    """
+    tickets = np.asarray(tickets, dtype=np.intp).reshape(-1, 6)
+    rounds = np.asarray(rounds, dtype=np.int32)
+    assert len(tickets) == len(rounds)
+
+    index = np.searchsorted(history.rounds, rounds)
+    found = index < len(history)
+    found[found] = history.rounds[index[found]] == rounds[found]
+
+    grades = np.full(len(tickets), -1, dtype=np.int8)
+    if not found.any():
+        return grades
+
+    # (회차 수 * 46) 평탄화 출현 행렬에서 게임별 (회차, 번호) 위치를 바로 읽는다
+    rows = index[found]
+    played = tickets[found]
+    drawn = history.presence(include_bonus=False).ravel()
+    hits = drawn[rows[:, None] * 46 + played]
+    grades[found] = _grade_from_hits(hits, played, history.bonus[rows])
+    return grades
+
+
+def count_grades(grades) -> dict:
+    """등수 배열 -> {1: 0, 2: 0, 3: 0, 4: 1, 5: 2, 0: 7} (미추첨 -1 은 세지 않는다)"""
+    grades = np.asarray(grades)
+    counts = np.bincount(grades[grades >= 0], minlength=6)
+    return {g: int(counts[g]) for g in GRADE_NAMES}
+
+
+def grade_purchase(body: dict, numbers, bonus: int) -> list:
+    """
+    로또 구매 응답(buy_lotto645 결과)의 게임들을 채점한다
+    -> [{"label": "A", "numbers": [...], "grade": 5, "status": "5등"}, ...]
+    """
+    labels, tickets = tickets_from_purchase(body.get("result", {}).get("arrGameChoiceNum") or [])
+    grades = grade(tickets, numbers, bonus)
+    return [
+        {
+            "label": label,
+            "numbers": [int(x) for x in row],
+            "grade": int(g),
+            "status": GRADE_NAMES[int(g)],
+        }
+        for label, row, g in zip(labels, tickets, grades)
+    ]
@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+import re
+import threading
+
+DEFAULT_DIR = os.environ.get("PURCHASE_STORE_DIR", os.path.join("data", "purchases"))
+
+# 최근 몇 회차의 구매 기록을 남길지 (당첨 확인은 보통 마지막 구매 회차만 본다)
+KEEP_ROUNDS = 4
+
+# 구매 내역의 복권번호 / 상세 보기 링크의 barcode 가 이보다 짧으면 같은 구매인지 판단하지 않는다
+MIN_ID_DIGITS = 10
+
+_NON_DIGIT = re.compile(r"\D")
+
+
+def ticket_id(result: dict) -> str:
+    """구매 응답(result)의 바코드 barCode1~6 을 이어 붙인 숫자열 (없으면 빈 문자열)"""
+    return "".join(_NON_DIGIT.sub("", str(result.get(f"barCode{i}", ""))) for i in range(1, 7))
+
+
+def find_games(records: list, identifiers) -> list:
+    """
+    한 회차의 구매 기록 중 구매 내역 행(복권번호, 상세 보기 barcode 등)과 같은 구매의 게임 목록
+    - 행의 식별 숫자가 저장된 바코드에 들어 있어야 같은 구매로 본다, 맞는 기록이 없으면 None
+    """
+    for identifier in identifiers:
+        digits = _NON_DIGIT.sub("", identifier or "")
+        if len(digits) < MIN_ID_DIGITS:
+            continue
+        for record in records or []:
+            if isinstance(record, dict) and digits in record.get("ticket_id", ""):
+                return record["games"]
+    return None
+
+
+class PurchaseStore:
+    """
+    계정별로 산 로또 게임(구매 응답의 arrGameChoiceNum)을 회차별로 저장한다
+    - 파일 이름은 아이디의 해시, 내용: {"회차": [{"ticket_id": 바코드, "games": ["A|01|05|12|23|34|453", ...]}, ...]}
+    - 같은 회차에 여러 번 사면 구매마다 따로 남기고, 당첨 확인 때 구매 내역 행과 바코드가 맞는 기록만 쓴다
+    """
+
+    def __init__(self, directory: str, keep_rounds: int = KEEP_ROUNDS):
+        self.directory = directory
+        self.keep_rounds = keep_rounds
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def add(self, user_id: str, body: dict) -> bool:
+        """구매 응답(buy_lotto645 결과)의 게임을 기록한다, 기록할 게임이나 바코드가 없으면 False"""
+        result = body.get("result", {}) if body else {}
+        games = result.get("arrGameChoiceNum")
+        round_no = str(result.get("buyRound", ""))
+        identifier = ticket_id(result)
+        if not games or not round_no.isdigit() or len(identifier) < MIN_ID_DIGITS:
+            return False
+
+        with self._lock:
+            rounds = self._read(user_id)
+            records = [record for record in rounds.get(round_no, [])
+                       if isinstance(record, dict) and record.get("ticket_id") != identifier]
+            rounds[round_no] = records + [{"ticket_id": identifier, "games": list(games)}]
+            for old in sorted(rounds, key=int)[:-self.keep_rounds]:
+                del rounds[old]
+            self._write(user_id, rounds)
+        return True
+
+    def load(self, user_id: str) -> dict:
+        """{"회차": [{"ticket_id": ..., "games": [arrGameChoiceNum 항목, ...]}, ...]}"""
+        with self._lock:
+            return self._read(user_id)
+
+    def _path(self, user_id: str) -> str:
+        name = hashlib.sha256(user_id.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.directory, f"{name}.json")
+
+    def _read(self, user_id: str) -> dict:
+        try:
+            with open(self._path(user_id), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            print("⚠️ 구매 기록 파일이 손상되어 무시합니다")
+            return {}
+
+    def _write(self, user_id: str, rounds: dict) -> None:
+        path = self._path(user_id)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(rounds, f)
+        os.replace(tmp_path, path)
+
+
+def from_env():
+    """기본으로 DEFAULT_DIR(data/purchases, PURCHASE_STORE_DIR 로 변경)에 남기고, PURCHASE_STORE=0 이면 사용하지 않는다"""
+    if os.environ.get("PURCHASE_STORE", "1").lower() in ("0", "false", "no"):
+        return None
+    return PurchaseStore(os.environ.get("PURCHASE_STORE_DIR", DEFAULT_DIR))
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+import threading
+
+DEFAULT_DIR = os.environ.get("RECOMMENDATION_CACHE_DIR", os.path.join(".cache", "recommendations"))
+
+# 현재 회차와 직전 회차 기록만 남긴다
+KEEP_ROUNDS = 2
+
+# 켜면 여러 계정(buy-all)이 같은 프롬프트의 추천을 함께 쓴다 (모든 계정이 같은 번호를 사게 된다)
+SHARED = os.environ.get("RECOMMENDATION_CACHE_SHARED", "").lower() in ("1", "true", "yes")
+
+
+class RecommendationCache:
+    """
+    검증을 통과한 ChatGPT 추천 번호를 회차별 JSON 파일로 저장한다
+    - 키: (구매 회차, 모델, 계정 + 프롬프트 메시지의 sha256) - shared 이면 계정을 빼고 모든 계정이 같이 쓴다
+    - 같은 계정이 같은 회차에 같은 프롬프트로 다시 실행하면 (예: execBuy 실패 후 재실행) OpenAI 를 호출하지 않는다
+    - 오래된 회차 파일은 evict() 로 지운다
+    """
+
+    def __init__(self, directory: str = DEFAULT_DIR, keep_rounds: int = KEEP_ROUNDS, shared: bool = SHARED):
+        self.directory = directory
+        self.keep_rounds = keep_rounds
+        self.shared = shared
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, model: str, messages: list, account: str = None) -> str:
+        scope = None if self.shared else account
+        payload = json.dumps([scope, messages], ensure_ascii=False, sort_keys=True)
+        return f"{model}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+    def get(self, round_no: str, model: str, messages: list, account: str = None):
+        """저장된 번호 세트 목록 (없으면 None)"""
+        with self._lock:
+            numbers = self._read(round_no).get(self.key(model, messages, account))
+            if numbers:
+                self.hits += 1
+                return numbers
+            self.misses += 1
+            return None
+
+    def put(self, round_no: str, model: str, messages: list, numbers: list, account: str = None) -> None:
+        """numbers 는 필요한 세트 수를 모두 채운 응답만 넘긴다 (부족한 응답을 저장하면 재실행도 부족한 번호를 받는다)"""
+        if not numbers:
+            return
+        with self._lock:
+            entries = self._read(round_no)
+            entries[self.key(model, messages, account)] = numbers
+            self._write(round_no, entries)
+            self._evict(int(round_no))
+
+    def evict(self, current_round: str) -> int:
+        with self._lock:
+            return self._evict(int(current_round))
+
+    def report(self) -> None:
+        total = self.hits + self.misses
+        if total:
+            print(f"🗃️ 추천 번호 캐시: 적중 {self.hits} / 미스 {self.misses} (적중률 {self.hits / total * 100:.0f}%)")
+
+    def _path(self, round_no) -> str:
+        return os.path.join(self.directory, f"{round_no}.json")
+
+    def _read(self, round_no: str) -> dict:
+        try:
+            with open(self._path(round_no), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            print(f"⚠️ 추천 번호 캐시 파일이 손상되어 무시합니다: {round_no}회")
+            return {}
+
+    def _write(self, round_no: str, entries: dict) -> None:
+        path = self._path(round_no)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, path)
+
+    def _evict(self, current_round: int) -> int:
+        removed = 0
+        for name in os.listdir(self.directory):
+            stem, ext = os.path.splitext(name)
+            if ext == ".json" and stem.isdigit() and int(stem) <= current_round - self.keep_rounds:
+                os.remove(os.path.join(self.directory, name))
+                removed += 1
+        return removed
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_cache() -> RecommendationCache:
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = RecommendationCache(DEFAULT_DIR)
+        return _default_cache
@@ -0,0 +1,119 @@
+import numpy as np
+
+import lotto_stats
+import ticket
+
+# 프롬프트가 요구하는 균형 조건
+ODD_RANGE = (2, 4)      # 세트당 홀수 개수
+MIN_DECADES = 3         # 1-10 / 11-20 / 21-30 / 31-40 / 41-45 중 최소 몇 구간에 걸칠지
+MAX_RUN = 2             # 연속 번호는 최대 2개까지 (예: 7, 8 은 허용, 7, 8, 9 는 제외)
+
+# 가중치 조정 값
+FREQUENCY_WEIGHT = 0.5  # 0 이면 빈도 무시, 1 이면 빈도에 정비례
+NO_SHOW_BOOST = 1.5     # 최근 미출현 번호 가중치
+LAST_DRAW_PENALTY = 0.7 # 직전 회차 당첨 번호 가중치
+
+# 한 번에 뽑아볼 후보 세트 수 = 필요한 세트 수 x BATCH_FACTOR
+BATCH_FACTOR = 32
+MAX_BATCHES = 16
+
+
+class LocalRecommender:
+    """
+    ChatGPT 없이 통계만으로 로또 6/45 번호를 추천한다
+    - 번호별 가중치 = 역대 빈도 (완화) x 최근 미출현 보정 x 직전 회차 보정
+    - 가중치 비복원 추출(Gumbel top-k)로 후보 세트를 한꺼번에 뽑고, 홀짝 / 구간 / 연속 번호 조건을 벡터 연산으로 거른다
+    """
+
+    def __init__(self, frequency, no_show_numbers=(), last_numbers=(), recent_sets=(), seed=None):
+        frequency = np.asarray(frequency, dtype=np.float64)
+        assert frequency.shape == (45,)
+
+        mean = frequency.mean()
+        relative = frequency / mean if mean > 0 else np.ones(45)
+        weights = np.clip(1.0 + FREQUENCY_WEIGHT * (relative - 1.0), 0.1, None)
+
+        for number in no_show_numbers:
+            weights[int(number) - 1] *= NO_SHOW_BOOST
+        for number in last_numbers:
+            weights[int(number) - 1] *= LAST_DRAW_PENALTY
+
+        self.weights = weights / weights.sum()
+        self.recent_sets = {ticket.mask_of(int(n) for n in numbers) for numbers in recent_sets}
+        self.rng = np.random.default_rng(seed)
+
+    @classmethod
+    def from_history(cls, history: lotto_stats.DrawHistory, no_show_window: int = 10, seed=None) -> "LocalRecommender":
+        """로컬 당첨 번호 저장소(DrawHistory)로 만든다"""
+        recent = history.recent_winning_numbers(10)
+        return cls(
+            history.summary()["frequency"],
+            no_show_numbers=history.no_show_numbers(no_show_window, minimum=6),
+            last_numbers=recent[0]["numbers"] if recent else (),
+            recent_sets=[winner["numbers"] for winner in recent],
+            seed=seed,
+        )
+
+    @classmethod
+    def from_statistics(cls, stats: dict, no_show_numbers: list, recent_winners: list, seed=None) -> "LocalRecommender":
+        """동행복권 통계 페이지 스크래핑 결과(fetch_lotto_statistics 등)로 만든다"""
+        frequency = [stats.get(str(number), {}).get("frequency", 0) for number in range(1, 46)]
+        return cls(
+            frequency,
+            no_show_numbers=no_show_numbers or (),
+            last_numbers=recent_winners[0]["numbers"] if recent_winners else (),
+            recent_sets=[winner["numbers"] for winner in recent_winners or ()],
+            seed=seed,
+        )
+
+    def sample(self, size: int) -> np.ndarray:
+        """가중치대로 중복 없이 6개씩 뽑은 (size, 6) 정렬된 후보 세트"""
+        gumbel = -np.log(-np.log(self.rng.random((size, 45))))
+        keys = np.log(self.weights) + gumbel
+        picks = np.argpartition(-keys, 6, axis=1)[:, :6] + 1
+        picks.sort(axis=1)
+        return picks
+
+    @staticmethod
+    def balanced(sets: np.ndarray) -> np.ndarray:
+        """홀짝 / 구간 분포 / 연속 번호 조건을 만족하는 행 마스크"""
+        odd = (sets % 2).sum(axis=1)
+        mask = (odd >= ODD_RANGE[0]) & (odd <= ODD_RANGE[1])
+
+        decades = np.minimum((sets - 1) // 10, len(lotto_stats.DECADES) - 1)
+        mask &= 1 + (np.diff(decades, axis=1) != 0).sum(axis=1) >= MIN_DECADES
+
+        # MAX_RUN 개의 연속된 '차이 1' 이 있으면 MAX_RUN + 1 개짜리 연속 번호
+        steps = np.diff(sets, axis=1) == 1
+        width = steps.shape[1] - MAX_RUN + 1
+        run = steps[:, :width].copy()
+        for offset in range(1, MAX_RUN):
+            run &= steps[:, offset:offset + width]
+        mask &= ~run.any(axis=1)
+
+        return mask
+
+    def recommend(self, count: int = 5) -> list:
+        """조건을 만족하는 서로 다른 세트 count 개 (각 세트는 오름차순 int 목록)"""
+        chosen = []
+        seen = set(self.recent_sets)
+
+        for _ in range(MAX_BATCHES):
+            candidates = self.sample(count * BATCH_FACTOR)
+            for row in candidates[self.balanced(candidates)].tolist():
+                key = ticket.mask_of(row)
+                if key in seen:
+                    continue
+                seen.add(key)
+                chosen.append(row)
+                if len(chosen) == count:
+                    return chosen
+
+        # 조건이 지나치게 빡빡한 경우에도 개수는 채운다
+        while len(chosen) < count:
+            row = self.sample(1)[0].tolist()
+            key = ticket.mask_of(row)
+            if key not in seen:
+                seen.add(key)
+                chosen.append(row)
+        return chosen
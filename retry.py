@@ -0,0 +1,236 @@
+import os
+import random
+import threading
+import time
+
+from urllib.parse import urlsplit
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+# 재시도 횟수(첫 시도 포함) / 백오프 시작·최대 간격 / 재시도를 포함한 요청 하나의 최대 시간 (초)
+DEFAULT_ATTEMPTS = int(os.environ.get("RETRY_ATTEMPTS", 3))
+DEFAULT_BASE_DELAY = float(os.environ.get("RETRY_BASE_DELAY", 0.5))
+DEFAULT_MAX_DELAY = float(os.environ.get("RETRY_MAX_DELAY", 4))
+DEFAULT_DEADLINE = float(os.environ.get("RETRY_DEADLINE", 20))
+
+# 호스트별 연속 실패 몇 번에 차단할지 / 차단 후 몇 초 뒤에 시험 요청을 하나 보낼지
+DEFAULT_FAILURE_THRESHOLD = int(os.environ.get("CIRCUIT_FAILURES", 5))
+DEFAULT_RESET_TIMEOUT = float(os.environ.get("CIRCUIT_RESET", 30))
+
+# 돈이 나가는 요청 - retry=True 로 불러도 서버에 닿지 않은 것이 확실한 실패(연결 실패)만 다시 보낸다
+NEVER_RETRY_PATHS = (
+    "/olotto/game/execBuy.do",
+    "/game/pension720/process/makeOrderNo.jsp",
+    "/game/pension720/process/connPro.jsp",
+)
+
+# 서버가 잠시 처리하지 못한 응답 (이 상태 코드는 다시 보내 볼 만하다)
+RETRYABLE_STATUS = (429, 500, 502, 503, 504)
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """호스트가 연속으로 실패해서 요청을 보내지 않고 바로 실패시켰다"""
+
+
+def _status_of(error: Exception) -> int:
+    response = getattr(error, "response", None)
+    return response.status_code if response is not None else 0
+
+
+def is_unsent(error: Exception) -> bool:
+    """요청이 서버에 전혀 닿지 않은 실패인가 (연결을 맺지 못함 / 회로 차단)"""
+    if isinstance(error, (requests.exceptions.ConnectTimeout, CircuitOpenError)):
+        return True
+    if isinstance(error, requests.ConnectionError) and error.args:
+        return isinstance(getattr(error.args[0], "reason", None), NewConnectionError)
+    return False
+
+
+def is_transient(error: Exception) -> bool:
+    """다시 보내면 성공할 수도 있는 실패인가 (연결 오류 / 타임아웃 / 429·5xx)"""
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    return isinstance(error, requests.HTTPError) and _status_of(error) in RETRYABLE_STATUS
+
+
+def is_host_failure(error: Exception) -> bool:
+    """회로 차단기에 실패로 셀 오류인가 (429 는 살아 있는 서버의 속도 제한이라 세지 않는다)"""
+    return is_transient(error) and _status_of(error) != 429
+
+
+class CircuitBreaker:
+    """
+    호스트 하나의 회로 차단기
+    - 연속 failure_threshold 번 실패하면 열려서 reset_timeout 동안 요청을 바로 실패시킨다
+    - reset_timeout 이 지나면 시험 요청 하나만 통과시키고, 성공하면 닫히고 실패하면 다시 열린다
+    """
+
+    def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD, reset_timeout: float = DEFAULT_RESET_TIMEOUT):
+        assert failure_threshold >= 1 and reset_timeout > 0
+
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self._opened_at >= self.reset_timeout:
+                # 시험 요청 하나만 보내고, 결과가 나오기 전 다른 요청은 다시 reset_timeout 동안 막는다
+                self._opened_at = now
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self) -> bool:
+        """실패를 기록하고, 이번 실패로 회로가 열렸으면 True"""
+        with self._lock:
+            self._failures += 1
+            if self._failures < self.failure_threshold:
+                return False
+            opened = self._opened_at is None
+            self._opened_at = time.monotonic()
+            return opened
+
+
+class HostCircuitBreakers:
+    """호스트마다 CircuitBreaker 를 하나씩 두고, 같은 프로세스의 모든 HttpClient 가 공유한다 (HostRateLimiter 와 같은 방식)"""
+
+    def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD, reset_timeout: float = DEFAULT_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).hostname or ""
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        return breaker
+
+
+class RetryPolicy:
+    """
+    요청 하나를 지수 백오프(full jitter)로 다시 보내는 정책
+    - retryable 인 요청만 일시적 실패(연결 오류 / 타임아웃 / 429·5xx)에서 다시 보낸다
+    - 그 밖의 요청(돈이 나가는 요청 등)은 서버에 닿지 않은 것이 확실한 실패만 다시 보낸다
+    - 첫 시도부터 deadline 초가 지나기 전에 끝나지 않을 대기는 하지 않고 마지막 오류를 그대로 올린다
+    """
+
+    def __init__(self, attempts: int = DEFAULT_ATTEMPTS, base_delay: float = DEFAULT_BASE_DELAY,
+                 max_delay: float = DEFAULT_MAX_DELAY, deadline: float = DEFAULT_DEADLINE, rng: random.Random = None):
+        assert attempts >= 1
+        assert 0 < base_delay <= max_delay
+
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.rng = rng or random.Random()
+        self.retries = 0
+
+    def backoff(self, attempt: int, error: Exception = None) -> float:
+        """attempt 번째 실패 뒤 기다릴 시간 - 0 ~ base * 2^(attempt-1) 의 균등 분포, Retry-After 가 있으면 그 이상"""
+        delay = self.rng.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("Retry-After", "") if response is not None else ""
+        if retry_after.replace(".", "", 1).isdigit():
+            delay = max(delay, float(retry_after))
+        return delay
+
+    def should_retry(self, error: Exception, retryable: bool) -> bool:
+        return is_unsent(error) if not retryable else is_transient(error)
+
+    def call(self, send, url: str, retryable: bool, breaker: CircuitBreaker):
+        """
+        send(attempt, timeout) 를 성공하거나 포기할 때까지 부른다
+        - timeout 은 남은 deadline 을 넘지 않는 요청 타임아웃
+        """
+        retryable = self._retryable(url, retryable)
+        deadline = time.monotonic() + self.deadline
+        attempt = 0
+        while True:
+            attempt += 1
+            self._check_breaker(url, breaker)
+
+            try:
+                res = send(attempt, max(deadline - time.monotonic(), 0.1))
+            except Exception as e:
+                delay = self._on_failure(e, url, attempt, retryable, deadline, breaker)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+
+            breaker.record_success()
+            return res
+
+    async def call_async(self, send, url: str, retryable: bool, breaker: CircuitBreaker):
+        """call() 의 asyncio 판 - send(attempt, timeout) 는 코루틴, 백오프 동안 이벤트 루프를 막지 않는다"""
+        import asyncio
+
+        retryable = self._retryable(url, retryable)
+        deadline = time.monotonic() + self.deadline
+        attempt = 0
+        while True:
+            attempt += 1
+            self._check_breaker(url, breaker)
+
+            try:
+                res = await send(attempt, max(deadline - time.monotonic(), 0.1))
+            except Exception as e:
+                delay = self._on_failure(e, url, attempt, retryable, deadline, breaker)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+
+            breaker.record_success()
+            return res
+
+    @staticmethod
+    def _retryable(url: str, retryable: bool) -> bool:
+        return retryable and urlsplit(url).path not in NEVER_RETRY_PATHS
+
+    @staticmethod
+    def _check_breaker(url: str, breaker: CircuitBreaker) -> None:
+        if not breaker.allow():
+            raise CircuitOpenError(f"{urlsplit(url).hostname} 이(가) 연속으로 실패해서 {breaker.reset_timeout:g}초 동안 요청을 막았습니다")
+
+    def _on_failure(self, error: Exception, url: str, attempt: int, retryable: bool, deadline: float,
+                    breaker: CircuitBreaker):
+        """실패 하나를 회로 차단기에 기록하고, 다시 보낼 거면 기다릴 시간(초), 포기할 거면 None"""
+        if not is_host_failure(error):
+            breaker.record_success()
+        elif breaker.record_failure():
+            print(f"⛔ {urlsplit(url).hostname} 연속 실패 {breaker.failure_threshold}회 - {breaker.reset_timeout:g}초 동안 요청을 막습니다")
+
+        if attempt >= self.attempts or not self.should_retry(error, retryable):
+            return None
+        delay = self.backoff(attempt, error)
+        if time.monotonic() + delay >= deadline:
+            return None
+
+        self.retries += 1
+        reason = f"HTTP {_status_of(error)}" if isinstance(error, requests.HTTPError) else type(error).__name__
+        print(f"🔁 {urlsplit(url).path} {reason} - {delay:.2f}초 후 다시 시도합니다 ({attempt + 1}/{self.attempts})")
+        return delay
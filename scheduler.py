@@ -0,0 +1,70 @@
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+class PipelineScheduler:
+    """
+    서로 의존하지 않는 단계를 겹쳐서 실행하고 단계별 소요 시간을 기록한다
+    - submit: 백그라운드에서 미리 실행 (예: 연금복권 회차 조회/번호 발급)
+    - run: 현재 스레드에서 바로 실행 (예: 로또 구매)
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pipeline")
+        self._futures = {}
+        self._timings = []
+        self._started_at = time.perf_counter()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def submit(self, name: str, fn, *args, **kwargs):
+        future = self._executor.submit(self._timed, name, fn, *args, **kwargs)
+        self._futures[name] = future
+        return future
+
+    def run(self, name: str, fn, *args, **kwargs):
+        return self._timed(name, fn, *args, **kwargs)
+
+    def result(self, name: str, default=None):
+        """submit 한 단계의 결과를 기다린다. 실패했으면 default 를 돌려준다"""
+        future = self._futures.get(name)
+        if future is None:
+            return default
+
+        try:
+            return future.result()
+        except Exception as e:
+            print(f"⚠️ {name} 단계 실패: {type(e).__name__}: {e}")
+            return default
+
+    def _timed(self, name: str, fn, *args, **kwargs):
+        started_at = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self._timings.append((name, time.perf_counter() - started_at))
+
+    def report(self, title: str, removed_wait: float = 0.0) -> dict:
+        """
+        순차 실행했을 때의 시간(단계 합계 + 없앤 대기 시간)과 실제 소요 시간을 비교해 출력한다
+        """
+        elapsed = time.perf_counter() - self._started_at
+        sequential = sum(t for _, t in self._timings) + removed_wait
+
+        for name, t in self._timings:
+            print(f"   ⏱️ {name}: {t:.2f}s")
+        print(f"⏱️ {title} 소요 시간: 기존 방식 기준 {sequential:.2f}s → {elapsed:.2f}s")
+
+        return {
+            "steps": dict(self._timings),
+            "sequential": sequential,
+            "elapsed": elapsed,
+        }
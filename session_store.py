@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+import time
+
+KDF_ITERATIONS = 20000
+
+# 서버 세션이 이보다 오래됐으면 확인 요청도 하지 않고 바로 새로 로그인한다
+DEFAULT_MAX_AGE = 12 * 60 * 60
+
+# 같은 비밀번호로 로그인에 실패했으면 이 시간 동안은 다시 시도하지 않는다 (5회 실패 시 계정 잠김)
+DEFAULT_FAILURE_TTL = 6 * 60 * 60
+
+
+class SessionStore:
+    """
+    계정별 JSESSIONID 를 디스크에 암호화해 저장한다
+    - 파일 이름은 아이디의 해시, 내용은 AES-GCM 으로 암호화
+    - 키는 계정 비밀번호 (+ SESSION_STORE_KEY) 에서 파생하므로 비밀번호가 바뀌면 기존 기록(로그인 실패 기록 포함)은 자동으로 무시된다
+    """
+
+    def __init__(self, directory: str, secret: str = None,
+                 max_age: float = DEFAULT_MAX_AGE, failure_ttl: float = DEFAULT_FAILURE_TTL):
+        self.directory = directory
+        self.secret = secret
+        self.max_age = max_age
+        self.failure_ttl = failure_ttl
+        os.makedirs(directory, exist_ok=True)
+
+    def load(self, user_id: str, password: str):
+        """유효 기간 안의 JSESSIONID 를 돌려준다 (없으면 None)"""
+        entry = self._read(user_id, password)
+        if not entry or "jsessionid" not in entry:
+            return None
+        if time.time() - entry.get("saved_at", 0) > self.max_age:
+            return None
+        return entry["jsessionid"]
+
+    def save(self, user_id: str, password: str, j_session_id: str) -> None:
+        self._write(user_id, password, {"jsessionid": j_session_id, "saved_at": time.time()})
+
+    def has_recent_failure(self, user_id: str, password: str) -> bool:
+        entry = self._read(user_id, password)
+        if not entry or "failed_at" not in entry:
+            return False
+        return time.time() - entry["failed_at"] < self.failure_ttl
+
+    def mark_failed(self, user_id: str, password: str) -> None:
+        self._write(user_id, password, {"failed_at": time.time()})
+
+    def clear(self, user_id: str) -> None:
+        try:
+            os.remove(self._path(user_id))
+        except FileNotFoundError:
+            pass
+
+    def _path(self, user_id: str) -> str:
+        name = hashlib.sha256(user_id.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.directory, f"{name}.session")
+
+    def _key(self, user_id: str, password: str, salt: bytes) -> bytes:
+        # pycryptodome 은 세션을 실제로 읽고 쓸 때만 가져온다 (SESSION_STORE_DIR 이 없으면 import 하지 않음)
+        from Crypto.Hash import SHA256
+        from Crypto.Protocol.KDF import PBKDF2
+
+        # SESSION_STORE_KEY 가 있어도 비밀번호는 항상 섞는다 (다른 비밀번호로 실패한 기록이 맞는 비밀번호를 막지 않도록)
+        secret = f"{password}:{self.secret}" if self.secret else password
+        return PBKDF2(f"{user_id}:{secret}", salt, 32, count=KDF_ITERATIONS, hmac_hash_module=SHA256)
+
+    def _read(self, user_id: str, password: str):
+        from Crypto.Cipher import AES
+
+        try:
+            with open(self._path(user_id), "r", encoding="utf-8") as f:
+                stored = json.load(f)
+
+            key = self._key(user_id, password, bytes.fromhex(stored["salt"]))
+            aes = AES.new(key, AES.MODE_GCM, nonce=bytes.fromhex(stored["nonce"]))
+            plain = aes.decrypt_and_verify(bytes.fromhex(stored["ciphertext"]), bytes.fromhex(stored["tag"]))
+            return json.loads(plain.decode("utf-8"))
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError) as e:
+            # 비밀번호가 바뀌었거나 파일이 손상된 경우
+            print(f"⚠️ 저장된 세션을 읽을 수 없습니다: {type(e).__name__}")
+            return None
+
+    def _write(self, user_id: str, password: str, entry: dict) -> None:
+        from Crypto.Cipher import AES
+        from Crypto.Random import get_random_bytes
+
+        salt = get_random_bytes(16)
+        aes = AES.new(self._key(user_id, password, salt), AES.MODE_GCM)
+        ciphertext, tag = aes.encrypt_and_digest(json.dumps(entry).encode("utf-8"))
+
+        path = self._path(user_id)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "salt": salt.hex(),
+                "nonce": aes.nonce.hex(),
+                "tag": tag.hex(),
+                "ciphertext": ciphertext.hex(),
+            }, f)
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, path)
+
+
+def from_env():
+    """SESSION_STORE_DIR 이 설정된 경우에만 세션 저장소를 사용한다"""
+    directory = os.environ.get("SESSION_STORE_DIR")
+    if not directory:
+        return None
+    return SessionStore(directory, secret=os.environ.get("SESSION_STORE_KEY"))
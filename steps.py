@@ -0,0 +1,497 @@
+import os
+
+import auth
+import buy_history
+import draw_info
+import draw_store
+import llm_runner
+import lotto645
+import notification
+import purchase_store
+import recommendation_cache
+import scheduler
+import ticket
+import win720
+
+# 계정 하나(로그인된 AuthController)로 하는 구매 / 당첨 확인 / 구매 내역 단계
+# - controller 의 단일 계정 명령과 fleet 의 여러 계정 실행이 같이 쓴다
+# numpy 를 쓰는 통계/추천 모듈(lotto_stats, recommender)과 openai 는 쓰는 함수 안에서 처음 가져온다
+
+# 예전에는 로또/연금복권 요청 사이에 고정으로 10초씩 쉬었다 (지금은 호스트별 토큰 버킷이 속도를 조절)
+LEGACY_STEP_WAIT = 10
+
+
+def load_local_history(lotto: lotto645.Lotto645):
+    """최신 회차까지 동기화된 로컬 저장소가 있으면 통계 엔진을 돌려준다 (없으면 None)"""
+    import lotto_stats
+
+    store = draw_store.get_store()
+    if store is None:
+        return None
+
+    try:
+        if not store.is_current(lotto.http_client):
+            print("⚠️ 로컬 당첨 번호 저장소가 최신이 아닙니다 - sync-draws 를 실행해주세요")
+            return None
+        return lotto_stats.DrawHistory.from_store(store)
+    except Exception as e:
+        print(f"⚠️ 로컬 당첨 번호 저장소 사용 실패: {e}")
+        return None
+
+def build_detailed_prompt(stats: dict, no_show_numbers: list, recent_winners: list) -> str:
+    """번호별 통계 + 미출현 번호 + 최근 당첨 번호로 상세 분석 프롬프트를 만든다"""
+    # 통계 데이터 정리
+    stats_text = ""
+    if stats:
+        sorted_stats = sorted(stats.items(), key=lambda x: x[1]['frequency'], reverse=True)
+        stats_text = "📊 로또 당첨 번호 통계 (빈도 높은 순):\n"
+        for number, data in sorted_stats[:10]:  # 상위 10개만 표시
+            stats_text += f"번호 {number}: {data['frequency']}회 당첨 ({data['percentage']})\n"
+        
+        stats_text += "\n📉 빈도가 낮은 번호들:\n"
+        for number, data in sorted_stats[-10:]:  # 하위 10개
+            stats_text += f"번호 {number}: {data['frequency']}회 당첨 ({data['percentage']})\n"
+    
+    # 미출현 번호 정리
+    no_show_text = "⏰ 최근 미출현 번호들:\n"
+    if no_show_numbers:
+        no_show_text += f"{', '.join(no_show_numbers)}\n"
+    
+    # 최근 당첨 번호 정리
+    recent_text = "🎯 최근 당첨 번호 패턴:\n"
+    if recent_winners:
+        for winner in recent_winners:
+            recent_text += f"{winner['round']}회 ({winner['date']}): {winner['numbers']} (보너스: {winner['bonus']})\n"
+    
+    return f"""당신은 로또 번호 추천 전문가입니다. 다음 종합 통계 데이터를 기반으로 로또 6/45 번호 5세트를 추천해주세요.
+
+{stats_text}
+
+{no_show_text}
+
+{recent_text}
+
+통계적 분석 요청사항:
+1. 과거 당첨 빈도가 높은 번호와 낮은 번호를 적절히 조합
+2. 최근 미출현 번호를 우선적으로 고려 (출현 확률이 높아질 수 있음)
+3. 최근 당첨 번호 패턴을 분석하여 피해야 할 번호와 선택해야 할 번호 구분
+4. 번호 분포를 고려하여 1-45 범위에서 고르게 선택
+5. 연속된 번호 조합과 홀짝 균형을 고려
+6. 각 세트는 1~45 사이의 숫자 6개로 구성되어야 하며, 숫자는 중복되지 않아야 합니다.
+
+중요: 반드시 유효한 1-45 범위의 정수만 사용하세요. 
+응답은 반드시 다음 JSON 형식으로만 해주세요 (설명이나 다른 텍스트 없이):
+[[1,2,3,4,5,6],[7,8,9,10,11,12],[13,14,15,16,17,18],[19,20,21,22,23,24],[25,26,27,28,29,30]]"""
+
+def build_history_prompt(recent_winners: list) -> str:
+    """역대 당첨 번호만으로 fallback 프롬프트를 만든다"""
+    if recent_winners:
+        recent_text = "🎯 역대 당첨 번호 패턴 (최근 10회차):\n"
+        for winner in recent_winners:
+            recent_text += f"{winner['round']}회: {winner['numbers']}\n"
+    else:
+        recent_text = "역대 당첨 번호 데이터를 사용할 수 없습니다."
+    
+    return f"""당신은 로또 번호 추천 전문가입니다. 다음 역대 당첨 번호 패턴을 분석하여 로또 6/45 번호 5세트를 추천해주세요.
+
+{recent_text}
+
+분석 요청사항:
+1. 역대 당첨 번호에서 자주 나타나는 번호들을 파악
+2. 번호 분포 패턴을 고려하여 1-45 범위에서 고르게 선택
+3. 연속된 번호의 출현 빈도를 고려
+4. 홀수와 짝수의 균형을 맞춤
+5. 각 세트는 1~45 사이의 숫자 6개로 구성되어야 하며, 숫자는 중복되지 않아야 합니다.
+
+중요: 반드시 유효한 1-45 범위의 정수만 사용하세요. 
+응답은 반드시 다음 JSON 형식으로만 해주세요 (설명이나 다른 텍스트 없이):
+[[1,2,3,4,5,6],[7,8,9,10,11,12],[13,14,15,16,17,18],[19,20,21,22,23,24],[25,26,27,28,29,30]]"""
+
+def get_manual_numbers_from_gpt(cnt: int = 5, username: str = None):
+    """ChatGPT API를 사용하여 로또 번호 추천 받기 (최대 5세트, cnt 세트가 모이면 응답 수신 중단, 추천 캐시는 username 별)"""
+    
+    # API 키 디버깅
+    api_key = os.environ.get('OPEN_API_KEY')
+    if not api_key:
+        print("❌ OPEN_API_KEY 환경변수가 설정되지 않았습니다.")
+        return []
+    elif len(api_key) < 20:
+        print(f"❌ OPEN_API_KEY가 너무 짧습니다: {len(api_key)}자")
+        return []
+    else:
+        print(f"✅ OPEN_API_KEY 확인됨: {api_key[:10]}...{api_key[-4:]}")
+    
+    def generate_fallback_numbers(count=5, exclude=()):
+        """ChatGPT 실패 시 기본 번호 생성 (exclude 와 겹치지 않는 서로 다른 세트)"""
+        import random
+        seen = {ticket.Ticket.of(numbers) for numbers in exclude}
+        fallback_numbers = []
+        while len(fallback_numbers) < count:
+            game = ticket.Ticket.of(random.sample(range(1, 46), 6))
+            if game not in seen:
+                seen.add(game)
+                fallback_numbers.append(game.numbers)
+        return fallback_numbers
+    
+    # 로또 통계 데이터 가져오기
+    lotto = lotto645.Lotto645()
+
+    # 최신 로컬 당첨 번호 저장소가 있으면 스크래핑 없이 계산, 없으면 통계 페이지를 한꺼번에 미리 받아둔다
+    history = load_local_history(lotto)
+    if history is None:
+        lotto.prefetch_statistics()
+
+    # 추천 번호 캐시는 구매 회차 단위로 나뉜다
+    cache = recommendation_cache.get_cache()
+    try:
+        target_round = draw_info.get_lotto645_round(lotto.http_client)
+        cache.evict(target_round)
+    except Exception as e:
+        print(f"⚠️ 구매 회차 확인 실패 - 추천 번호 캐시를 사용하지 않습니다: {e}")
+        target_round = None
+
+    runner = llm_runner.LLMRunner(api_key, cache=cache, round_no=target_round, account=username)
+    prompts = []
+    
+    # 먼저 통계 데이터 수집 시도
+    try:
+        if history is not None:
+            import lotto_stats
+
+            print("📊 로컬 당첨 번호 이력으로 통계 계산")
+            stats, no_show_numbers, recent_winners = lotto_stats.prompt_inputs(history)
+        else:
+            stats = lotto.fetch_lotto_statistics()
+            no_show_numbers = lotto.fetch_recent_no_show_numbers()
+            recent_winners = lotto.fetch_recent_winning_numbers(5)
+        
+        # 통계 데이터가 충분히 수집되었는지 확인
+        stats_available = bool(stats and len(stats) > 30)  # 최소 30개 번호 통계
+        no_show_available = bool(no_show_numbers and len(no_show_numbers) > 5)  # 최소 5개 미출현 번호
+        recent_available = bool(recent_winners and len(recent_winners) > 3)  # 최소 3개 회차
+        
+        if stats_available and no_show_available and recent_available:
+            print("📊 통계 데이터 수집 성공 - 상세 분석 프롬프트 사용")
+            prompts.append(("상세분석", build_detailed_prompt(stats, no_show_numbers, recent_winners)))
+        else:
+            print("⚠️ 통계 데이터 불충분 또는 수집 실패 - 역대 당첨 번호 기반 프롬프트 사용")
+        
+    except Exception as e:
+        print(f"⚠️ 통계 데이터 수집 실패: {e} - 역대 당첨 번호 기반 프롬프트 사용")
+    
+    # Fallback: 역대 당첨 번호 기반 프롬프트 (상세 분석 응답이 늦거나 부족하면 이어서 바로 보낸다)
+    try:
+        if history is not None:
+            recent_winners = history.recent_winning_numbers(10)
+        else:
+            recent_winners = lotto.fetch_recent_winning_numbers(10)  # 더 많은 회차 수집
+        
+        prompts.append(("역대당첨번호기반", build_history_prompt(recent_winners)))
+        
+    except Exception as e:
+        print(f"⚠️ 역대 당첨 번호 수집 실패: {e}")
+    
+    if prompts:
+        need = max(1, min(cnt, 5))
+        numbers = runner.first_valid(prompts, need=need)
+        
+        if len(numbers) >= need:
+            print(f"✅ ChatGPT 추천 성공: {numbers}")
+            return numbers
+        elif numbers:
+            print(f"⚠️ 일부 유효한 번호 발견: {numbers}")
+            additional_sets = generate_fallback_numbers(need - len(numbers), exclude=numbers)
+            numbers.extend(additional_sets)
+            print(f"📝 기본값으로 채워진 최종 번호: {numbers}")
+            return numbers
+    
+    # 최종 Fallback: 기본 번호 생성
+    print("🔄 모든 ChatGPT 시도 실패 - 기본 번호 생성")
+    return generate_fallback_numbers()
+
+def get_manual_numbers_from_local(cnt: int = 5) -> list:
+    """로컬 통계 추천기로 로또 번호 생성 (OpenAI 호출 없음)"""
+    import recommender
+
+    lotto = lotto645.Lotto645()
+
+    history = load_local_history(lotto)
+    try:
+        if history is not None:
+            print("📊 로컬 당첨 번호 이력으로 번호 추천")
+            local = recommender.LocalRecommender.from_history(history)
+        else:
+            lotto.prefetch_statistics()
+            local = recommender.LocalRecommender.from_statistics(
+                lotto.fetch_lotto_statistics(),
+                lotto.fetch_recent_no_show_numbers(),
+                lotto.fetch_recent_winning_numbers(10),
+            )
+    except Exception as e:
+        print(f"⚠️ 통계 데이터 수집 실패: {e} - 빈도 정보 없이 추천")
+        local = recommender.LocalRecommender([1] * 45)
+
+    numbers = local.recommend(cnt)
+    print(f"✅ 로컬 통계 기반 추천 번호: {numbers}")
+    return numbers
+
+def get_manual_numbers(cnt: int, username: str = None) -> tuple:
+    """RECOMMENDER 환경변수(gpt / local)에 따라 추천 번호와 구매 방법을 돌려준다"""
+    strategy = os.environ.get("RECOMMENDER", "gpt").strip().lower()
+    if strategy == "local":
+        return get_manual_numbers_from_local(cnt), "LOCAL_MANUAL"
+    return get_manual_numbers_from_gpt(cnt, username), "CHATGPT_MANUAL"
+
+def buy_lotto645_manual(authCtrl: auth.AuthController, cnt: int, username: str = None):
+    """수동 번호 입력으로 로또 구매 (실패 시 자동 구매로 fallback)"""
+    lotto = lotto645.Lotto645(authCtrl.http_client)
+
+    # ChatGPT (또는 로컬 통계 추천기)로 생성한 번호 사용
+    manual_numbers, manual_method = get_manual_numbers(cnt, username)
+
+    if not manual_numbers:
+        print("⚠️ ChatGPT로부터 유효한 로또 번호를 가져오지 못했습니다.")
+        print("🔄 자동 번호 구매로 전환합니다.")
+        
+        # 자동 번호 구매로 fallback
+        try:
+            response = lotto.buy_lotto645(authCtrl, cnt, lotto645.Lotto645Mode.AUTO)
+            response['balance'] = lotto.get_balance(auth_ctrl=authCtrl)
+            
+            # 자동 구매 성공 시 메시지에 표시할 정보 추가
+            if response.get('result', {}).get('resultMsg', '').upper() == 'SUCCESS':
+                response['purchase_method'] = 'AUTO_FALLBACK'
+                print("✅ 자동 번호 구매 성공")
+            
+            return response
+            
+        except Exception as e:
+            print(f"❌ 자동 번호 구매도 실패: {e}")
+            return {
+                "result": {
+                    "resultMsg": f"ChatGPT 실패 후 자동 구매도 실패: {str(e)}",
+                    "buyRound": "알 수 없음"
+                },
+                "balance": "확인불가",
+                "purchase_method": "FAILED"
+            }
+
+    # cnt와 manual_numbers 길이 맞추기
+    if len(manual_numbers) > cnt:
+        print(f"📝 ChatGPT가 {len(manual_numbers)}개 세트를 추천했지만 {cnt}개만 구매합니다.")
+        manual_numbers = manual_numbers[:cnt]
+    elif len(manual_numbers) < cnt:
+        print(f"⚠️ ChatGPT가 {len(manual_numbers)}개 세트만 추천했지만 {cnt}개가 필요합니다.")
+        print("🔄 자동 번호 구매로 전환합니다.")
+        
+        # 자동 번호 구매로 fallback
+        try:
+            response = lotto.buy_lotto645(authCtrl, cnt, lotto645.Lotto645Mode.AUTO)
+            response['balance'] = lotto.get_balance(auth_ctrl=authCtrl)
+            
+            # 자동 구매 성공 시 메시지에 표시할 정보 추가
+            if response.get('result', {}).get('resultMsg', '').upper() == 'SUCCESS':
+                response['purchase_method'] = 'AUTO_FALLBACK'
+                print("✅ 자동 번호 구매 성공")
+            
+            return response
+            
+        except Exception as e:
+            print(f"❌ 자동 번호 구매도 실패: {e}")
+            return {
+                "result": {
+                    "resultMsg": f"ChatGPT 부족 후 자동 구매도 실패: {str(e)}",
+                    "buyRound": "알 수 없음"
+                },
+                "balance": "확인불가",
+                "purchase_method": "FAILED"
+            }
+
+    # ChatGPT 번호로 수동 구매 시도
+    try:
+        print(f"🤖 ChatGPT 추천 번호로 수동 구매 시도: {len(manual_numbers)}개 세트")
+        print(f"📋 추천 번호 상세: {manual_numbers}")
+        print(f"🔍 ChatGPT 응답 분석 완료 - 구매 API 호출 시작")
+        
+        response = lotto.buy_lotto645(authCtrl, cnt, lotto645.Lotto645Mode.MANUAL, manual_numbers)
+        
+        # response가 None인 경우 처리
+        if response is None:
+            print("❌ 로또 구매 API가 None을 반환했습니다")
+            return {
+                "result": {
+                    "resultMsg": "로또 구매 API 응답 없음",
+                    "buyRound": "알 수 없음"
+                },
+                "balance": "확인불가",
+                "purchase_method": "CHATGPT_MANUAL_FAILED"
+            }
+        
+        response['balance'] = lotto.get_balance(auth_ctrl=authCtrl)
+        
+        # 수동 구매 성공 시 메시지에 표시할 정보 추가
+        if response.get('result', {}).get('resultMsg', '').upper() == 'SUCCESS':
+            response['purchase_method'] = manual_method
+            print("✅ 추천 번호로 수동 구매 성공")
+        
+        return response
+        
+    except Exception as e:
+        print(f"⚠️ ChatGPT 추천 번호로 수동 구매 실패: {e}")
+        print(f"🔍 오류 상세 정보: {type(e).__name__}: {str(e)}")
+        
+        # 오류 타입별 상세 정보 출력
+        if "Expecting value" in str(e):
+            print("💡 JSON 파싱 오류로 추정됨 - 동행복권 API 응답 형식 문제")
+            print("💡 이는 ChatGPT 응답이 아닌 동행복권 서버 응답의 JSON 파싱 오류입니다")
+        elif "connection" in str(e).lower():
+            print("💡 네트워크 연결 오류로 추정됨")
+        elif "timeout" in str(e).lower():
+            print("💡 타임아웃 오류로 추정됨")
+        elif "authentication" in str(e).lower():
+            print("💡 인증 오류로 추정됨")
+        elif "서버 오류" in str(e):
+            print("💡 동행복권 서버 측 오류로 추정됨")
+            print("💡 잠시 후 다시 시도하거나 동행복권 사이트를 직접 확인해보세요")
+        
+        # 수동 구매 실패 시 오류 응답 반환 (자동 구매 fallback 제거)
+        return {
+            "result": {
+                "resultMsg": f"ChatGPT 추천 번호로 수동 구매 실패: {str(e)}",
+                "buyRound": "알 수 없음"
+            },
+            "balance": "확인불가",
+            "purchase_method": "CHATGPT_MANUAL_FAILED"
+        }
+
+
+def buy_lotto645(authCtrl: auth.AuthController, cnt: int, mode: str):
+    lotto = lotto645.Lotto645(authCtrl.http_client)
+    _mode = lotto645.Lotto645Mode[mode.upper()]
+    response = lotto.buy_lotto645(authCtrl, cnt, _mode)
+    response['balance'] = lotto.get_balance(auth_ctrl=authCtrl)
+    return response
+
+def check_winning_lotto645(authCtrl: auth.AuthController, username: str = None) -> dict:
+    lotto = lotto645.Lotto645(authCtrl.http_client)
+    # 구매 기록이 있으면 상세 페이지 대신 로컬에서 채점한다
+    store = purchase_store.from_env()
+    purchases = store.load(username) if store is not None and username else None
+    item = lotto.check_winning(authCtrl, purchases)
+    return item
+
+def prepare_win720(authCtrl: auth.AuthController) -> dict:
+    pension = win720.Win720(authCtrl.http_client)
+    return pension.prepare_Win720(authCtrl)
+
+def buy_win720(authCtrl: auth.AuthController, username: str, prepared: dict = None):
+    pension = win720.Win720(authCtrl.http_client)
+    response = pension.buy_Win720(authCtrl, username, prepared)
+    response['balance'] = pension.get_balance(auth_ctrl=authCtrl)
+    return response
+
+def check_winning_win720(authCtrl: auth.AuthController) -> dict:
+    pension = win720.Win720(authCtrl.http_client)
+    item = pension.check_winning(authCtrl)
+    return item
+
+def history_account(authCtrl: auth.AuthController, start: str, end: str, verbose: bool = True) -> dict:
+    """로그인된 계정 하나의 기간 내 로또 구매 기록을 모두 모아 요약한다 (상세 페이지는 동시에 받는다)"""
+    crawler = buy_history.BuyHistoryCrawler(authCtrl)
+    records = []
+    for record in crawler.iter_records(start, end):
+        records.append(record)
+        if verbose:
+            details = record.get("lotto_details") or []
+            games = " / ".join(f"{d['label']} {d['status']}" for d in details)
+            print(f"🧾 {record['purchased_date']} {record['round']}회 {record['count']}매 {record['result']} {record['money']}  {games}")
+
+    summary = buy_history.summarize(records)
+    summary["pages"] = crawler.pages
+    summary["details"] = crawler.details
+    return summary
+
+def send_message(mode: int, lottery_type: int, response: dict, webhook_url: str):
+    notify = notification.Notification()
+
+    if mode == 0:
+        if lottery_type == 0:
+            notify.send_lotto_winning_message(response, webhook_url)
+        else:
+            notify.send_win720_winning_message(response, webhook_url)
+    elif mode == 1: 
+        if lottery_type == 0:
+            notify.send_lotto_buying_message(response, webhook_url)
+        else:
+            notify.send_win720_buying_message(response, webhook_url)
+
+def check_account(authCtrl: auth.AuthController, webhook_url: str, username: str = None):
+    """로그인된 계정 하나의 당첨 여부를 확인하고 알림을 보낸다"""
+    with scheduler.PipelineScheduler() as pipeline:
+        # 두 당첨 확인은 서로 독립적이므로 연금복권 쪽을 먼저 띄워두고 로또를 확인한다
+        pipeline.submit("win720 당첨 확인", check_winning_win720, authCtrl)
+
+        response = pipeline.run("lotto645 당첨 확인", check_winning_lotto645, authCtrl, username)
+        send_message(0, 0, response=response, webhook_url=webhook_url)
+
+        response = pipeline.result("win720 당첨 확인", {})
+        send_message(0, 1, response=response, webhook_url=webhook_url)
+
+        pipeline.report("당첨 확인", removed_wait=LEGACY_STEP_WAIT)
+
+def buy_account(authCtrl: auth.AuthController, username: str, count: int, webhook_url: str) -> dict:
+    """로그인된 계정 하나로 로또 → 연금복권 순서로 구매하고 결과를 돌려준다"""
+    result = {"lotto": None, "win720": None}
+
+    with scheduler.PipelineScheduler() as pipeline:
+        # 연금복권 회차 조회와 자동 번호 발급은 돈이 나가지 않으므로 로또 구매와 겹쳐서 미리 해둔다
+        pipeline.submit("win720 준비", prepare_win720, authCtrl)
+
+        # ChatGPT API를 이용한 수동 번호 구매로 변경
+        response = pipeline.run("lotto645 구매", buy_lotto645_manual, authCtrl, count, username)
+        send_message(1, 0, response=response, webhook_url=webhook_url)
+        result["lotto"] = response
+
+        # 로또 구매 성공 여부 확인
+        lotto_success = False
+        
+        # response가 None인 경우 처리
+        if response is None:
+            print("❌ 로또 구매 실패 - 응답이 None입니다")
+            print("🛑 연금복권 구매를 건너뜁니다")
+            return result
+        
+        result_msg = response.get('result', {}).get('resultMsg', '')
+        
+        if result_msg.upper() == 'SUCCESS':
+            lotto_success = True
+            # 당첨 확인 때 로컬에서 채점할 수 있도록 산 번호를 남긴다 (PURCHASE_STORE_DIR)
+            store = purchase_store.from_env()
+            if store is not None:
+                store.add(username, response)
+            print("✅ 로또 구매 성공 - 연금복권 구매 진행")
+        else:
+            print("❌ 로또 구매 실패 - 연금복권 구매 중단")
+            print(f"실패 사유: {result_msg}")
+            
+            # 구매 방법도 확인
+            purchase_method = response.get('purchase_method', 'UNKNOWN')
+            if purchase_method == 'CHATGPT_MANUAL_FAILED':
+                print("💡 ChatGPT 추천 번호로 수동 구매 실패")
+            elif purchase_method == 'AUTO_FALLBACK':
+                print("💡 자동 구매로 fallback됨")
+            elif purchase_method == 'FAILED':
+                print("💡 모든 구매 방법 실패")
+
+        # 로또 구매 성공 시에만 연금복권 구매 진행
+        if lotto_success:
+            prepared = pipeline.result("win720 준비")
+            response = pipeline.run("win720 구매", buy_win720, authCtrl, username, prepared)
+            send_message(1, 1, response=response, webhook_url=webhook_url)
+            result["win720"] = response
+        else:
+            print("🛑 연금복권 구매를 건너뜁니다 (로또 구매 실패로 인해)")
+
+        result["timings"] = pipeline.report("구매", removed_wait=LEGACY_STEP_WAIT if lotto_success else 0.0)
+
+    return result
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 저장소 최상위의 모듈(controller, lotto645 ...)을 그대로 import 한다 (benchmarks/ 와 같은 방식)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
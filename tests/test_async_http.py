@@ -0,0 +1,89 @@
+import contextlib
+import io
+import time
+
+import pytest
+import requests
+
+import auth
+import buy_history
+import http_cache
+import retry
+import fakes.dhlottery_server as fake_server
+from HttpClient import AsyncHttpClient, HostRateLimiter, HttpClient
+
+MY_PAGE = "https://dhlottery.co.kr/userSsl.do?method=myPage"
+DETAIL = "https://dhlottery.co.kr/myPage.do?method=lotto645Detail"
+
+
+@pytest.fixture
+def fake():
+    with fake_server.FakeDhlotteryServer(latency=0, seed=1) as fake:
+        yield fake
+
+
+def _client(origin: str, tmp_path, **kwargs) -> HttpClient:
+    return HttpClient(origin=origin, cache=http_cache.HttpCache(str(tmp_path / "http")),
+                      rate_limiter=HostRateLimiter(rate=1000, burst=1000), **kwargs)
+
+
+def test_get_sends_the_login_session_and_keeps_the_method_query(fake, tmp_path):
+    authCtrl = auth.AuthController(_client(fake.origin, tmp_path))
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert authCtrl.login("user01", "pw")
+
+    client = AsyncHttpClient(authCtrl.http_client)
+    page = client.run(client.get(MY_PAGE, headers=authCtrl.add_auth_cred_to_headers({})))
+    detail = client.run(client.get(DETAIL, params={"orderNo": "1", "barcode": "2", "issueNo": "3"}))
+    client.run(client.aclose())
+
+    assert page.status_code == 200
+    assert fake_server.LOGIN_REQUIRED_PAGE not in page.text
+    assert detail.status_code == 200
+    assert fake.hits["/myPage.do?method=lotto645Detail"] == 1
+
+
+def test_requests_to_one_host_wait_for_the_pool(tmp_path):
+    with fake_server.FakeDhlotteryServer(latency=0.1, jitter=0, seed=1) as fake:
+        client = AsyncHttpClient(_client(fake.origin, tmp_path), pool_size=2)
+
+        async def fetch_all():
+            import asyncio
+            return await asyncio.gather(*(client.get(DETAIL) for _ in range(6)))
+
+        started = time.perf_counter()
+        responses = client.run(fetch_all())
+        elapsed = time.perf_counter() - started
+        client.run(client.aclose())
+
+    assert [res.status_code for res in responses] == [200] * 6
+    # 연결 2개로 6개를 보내면 최소 3번에 나눠 받는다
+    assert elapsed >= 0.29
+
+
+def test_connection_failure_is_retried_as_unsent_and_raised(tmp_path):
+    policy = retry.RetryPolicy(attempts=2, base_delay=0.001, max_delay=0.001)
+    http_client = _client("http://127.0.0.1:9", tmp_path, retry_policy=policy,
+                          circuit_breakers=retry.HostCircuitBreakers())
+    client = AsyncHttpClient(http_client)
+
+    with contextlib.redirect_stdout(io.StringIO()), pytest.raises(requests.ConnectionError) as error:
+        # 구매 요청도 서버에 닿지 않은 연결 실패는 다시 보낸다
+        client.run(client.post("https://ol.dhlottery.co.kr/olotto/game/execBuy.do", data={}))
+    client.run(client.aclose())
+
+    assert retry.is_unsent(error.value)
+    assert policy.retries == 1
+
+
+def test_crawler_fetches_details_over_async_transport(fake, tmp_path):
+    authCtrl = auth.AuthController(_client(fake.origin, tmp_path))
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert authCtrl.login("user01", "pw")
+
+    crawler = buy_history.BuyHistoryCrawler(authCtrl, concurrency=2)
+    records = list(crawler.iter_records("2025-10-01", "2025-10-20"))
+
+    assert len(records) == 3
+    assert all(record["lotto_details"] for record in records)
+    assert crawler.details == fake.hits["/myPage.do?method=lotto645Detail"] == 3
@@ -0,0 +1,77 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import backtest  # noqa: E402
+import lotto_stats  # noqa: E402
+
+DRAWS = backtest.MIN_HISTORY + 2 * backtest.CHUNK_DRAWS + 10
+
+
+def _history(draws: int = DRAWS) -> lotto_stats.DrawHistory:
+    rng = random.Random(1)
+    numbers, bonus = [], []
+    for _ in range(draws):
+        drawn = rng.sample(range(1, 46), 7)
+        numbers.append(sorted(drawn[:6]))
+        bonus.append(drawn[6])
+    return lotto_stats.DrawHistory(range(1, draws + 1), [f"2020-01-{i % 28 + 1:02d}" for i in range(draws)],
+                                   numbers, bonus)
+
+
+def _outcome(result: dict) -> tuple:
+    return result["counts"], result["return_mean"], result["return_ci"]
+
+
+@pytest.mark.parametrize("strategy", ["random", "local"])
+def test_same_seed_gives_same_result_with_any_worker_count(strategy):
+    history = _history()
+
+    single = backtest.Backtester(history, seed=7, workers=1).run(strategy, tickets_per_draw=200)
+    pooled = backtest.Backtester(history, seed=7, workers=3).run(strategy, tickets_per_draw=200)
+
+    assert _outcome(single) == _outcome(pooled)
+    assert single["draws"] == DRAWS - backtest.MIN_HISTORY
+    assert single["tickets"] == sum(single["counts"].values()) == single["draws"] * 200
+
+
+def test_different_seed_or_strategy_changes_tickets():
+    history = _history()
+    base = backtest.Backtester(history, seed=7, workers=1)
+
+    assert _outcome(base.run("random", 200)) != _outcome(backtest.Backtester(history, seed=8, workers=1).run("random", 200))
+    assert _outcome(base.run("random", 200)) != _outcome(base.run("local", 200))
+
+
+def test_chunks_cover_every_draw_after_min_history():
+    chunks = backtest.Backtester(_history(), workers=1)._chunks()
+
+    assert chunks[0][0] == backtest.MIN_HISTORY
+    assert chunks[-1][1] == DRAWS
+    assert all(a[1] == b[0] for a, b in zip(chunks, chunks[1:]))
+
+
+def test_local_tickets_pass_balance_rules():
+    history = _history()
+    past = lotto_stats.DrawHistory(history.rounds[:120], history.dates[:120], history.numbers[:120], history.bonus[:120])
+
+    tickets = backtest.local_tickets(past, 300, np.random.default_rng(0))
+
+    assert tickets.shape == (300, 6)
+    assert backtest.recommender.LocalRecommender.balanced(tickets).all()
+
+
+def test_short_history_is_rejected():
+    with pytest.raises(AssertionError):
+        backtest.Backtester(_history(backtest.MIN_HISTORY), workers=1)
+
+
+def test_chance_table_and_wilson_interval():
+    assert sum(backtest.CHANCE.values()) == pytest.approx(1.0)
+    assert backtest.wilson_interval(0, 0) == (0.0, 0.0)
+    low, high = backtest.wilson_interval(0, 1000)
+    assert low == 0.0 and 0 < high < 0.01
+    low, high = backtest.wilson_interval(500, 1000)
+    assert low < 0.5 < high
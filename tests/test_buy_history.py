@@ -0,0 +1,111 @@
+import datetime
+
+import auth
+import buy_history
+
+
+class _Response:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _PagedClient:
+    """
+    구매 내역 목록만 돌려주는 HttpClient 대역
+    - pages: 조회 시작일(searchStartDate)별 페이지 목록, 각 페이지는 (행 수, 마지막 페이지 번호, '다음' 링크 여부)
+    - 없는 페이지를 요청하면 사이트처럼 마지막 페이지를 다시 준다
+    """
+
+    def __init__(self, pages: dict):
+        self.pages = pages
+        self.requests = []
+
+    def post(self, url, headers=None, data=None, retry=False):
+        self.requests.append(dict(data))
+        pages = self.pages.get(data["searchStartDate"], [])
+        if not pages:
+            return _Response(_page([], 1, False, ""))
+        index = min(data["nowPage"], len(pages)) - 1
+        rows, last_page, has_next = pages[index]
+        return _Response(_page(range(rows), last_page, has_next, f"{data['searchStartDate']}-{index + 1}"))
+
+
+def _page(rows, last_page: int, has_next: bool, page_id: str) -> str:
+    trs = "".join(
+        f"<tr><td>2025-10-13</td><td>로또6/45</td><td>1194</td>"
+        f"<td><a href=\"javascript:detailPop('{page_id}-{i}', '1116887967', '8000');\">30930 76608</a></td>"
+        f"<td>5</td><td>{'5등' if i == 0 else '낙첨'}</td><td>{'5,000원' if i == 0 else '-'}</td><td>2025-10-18</td></tr>"
+        for i in rows
+    ) or "<tr><td colspan=\"8\">조회 결과가 없습니다.</td></tr>"
+    links = "".join(f"<a href=\"#\">{n}</a>" for n in range(1, last_page + 1))
+    if has_next:
+        links += "<a href=\"#\" class=\"btn_common next\">다음</a>"
+    return (f"<table class=\"tbl_data tbl_data_col\"><tbody>{trs}</tbody></table>"
+            f"<div class=\"paginate_common\">{links}</div>")
+
+
+def _crawler(pages: dict, window_days: int = 31) -> buy_history.BuyHistoryCrawler:
+    client = _PagedClient(pages)
+    return buy_history.BuyHistoryCrawler(auth.AuthController(client), client, window_days=window_days)
+
+
+def test_split_windows_walks_back_from_end():
+    windows = buy_history.split_windows(datetime.date(2025, 1, 1), datetime.date(2025, 3, 10), window_days=31)
+
+    assert windows == [
+        (datetime.date(2025, 2, 8), datetime.date(2025, 3, 10)),
+        (datetime.date(2025, 1, 8), datetime.date(2025, 2, 7)),
+        (datetime.date(2025, 1, 1), datetime.date(2025, 1, 7)),
+    ]
+
+
+def test_parse_date_accepts_several_formats():
+    assert buy_history.parse_date("20250101") == buy_history.parse_date("2025-01-01") == datetime.date(2025, 1, 1)
+    assert buy_history.parse_date(datetime.datetime(2025, 1, 1, 12)) == datetime.date(2025, 1, 1)
+
+
+def test_iter_pages_reads_every_page_of_every_window():
+    crawler = _crawler({
+        "20250208": [(10, 2, False), (3, 2, False)],
+        "20250108": [(10, 1, False)],
+        "20250101": [],
+    })
+
+    pages = list(crawler.iter_pages("lotto645", "20250101", "20250310"))
+
+    assert [len(rows) for rows in pages] == [10, 3, 10]
+    assert [(r["searchStartDate"], r["nowPage"]) for r in crawler.http_client.requests] == [
+        ("20250208", 1), ("20250208", 2), ("20250108", 1), ("20250101", 1),
+    ]
+    assert crawler.pages == 4
+    assert {r["lottoId"] for r in crawler.http_client.requests} == {"LO40"}
+
+
+def test_iter_pages_follows_next_link_past_visible_page_numbers():
+    # 페이지 번호는 10개까지만 보이고 '다음' 링크로 더 있다는 것을 알린다
+    crawler = _crawler({"20251001": [(10, 10, True)] * 10 + [(2, 11, False)]})
+
+    pages = list(crawler.iter_pages("win720", "20251001", "20251031"))
+
+    assert len(pages) == 11
+    assert {r["lottoId"] for r in crawler.http_client.requests} == {"LP72"}
+
+
+def test_iter_pages_stops_when_site_repeats_last_page():
+    # 마지막 페이지 번호를 알 수 없는데 없는 페이지에 마지막 페이지를 다시 주는 경우
+    crawler = _crawler({"20251001": [(10, 1, True), (4, 1, True)]})
+
+    pages = list(crawler.iter_pages("lotto645", "20251001", "20251031"))
+
+    assert [len(rows) for rows in pages] == [10, 4]
+    assert len(crawler.http_client.requests) == 3
+
+
+def test_records_without_details_and_summary():
+    crawler = _crawler({"20251001": [(3, 1, False)]})
+
+    records = list(crawler.iter_records("20251001", "20251031", details=False))
+
+    assert records[0]["detail"] == ("20251001-1-0", "1116887967", "8000")
+    assert records[0]["ticket_no"] == "30930 76608"
+    assert buy_history.summarize(records) == {"purchases": 3, "tickets": 15, "winnings": 1, "money": 5000, "errors": 0}
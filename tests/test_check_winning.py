@@ -0,0 +1,164 @@
+import contextlib
+import io
+
+import pytest
+
+import auth
+import draw_store
+import http_cache
+import lotto645
+import purchase_store
+import steps
+import fakes.dhlottery_server as fake_server
+from HttpClient import HttpClient
+
+DETAIL = "/myPage.do?method=lotto645Detail"
+DRAW_API = "/common.do?method=getLottoNumber"
+
+
+@pytest.fixture
+def fake(tmp_path, monkeypatch):
+    with fake_server.FakeDhlotteryServer(latency=0, seed=1) as fake:
+        monkeypatch.setenv("DHLOTTERY_ORIGIN", fake.origin)
+        monkeypatch.setenv("RECOMMENDER", "local")
+        monkeypatch.setenv("PURCHASE_STORE_DIR", str(tmp_path / "purchases"))
+        monkeypatch.delenv("PURCHASE_STORE", raising=False)
+        monkeypatch.delenv("SESSION_STORE_DIR", raising=False)
+        monkeypatch.setattr(draw_store, "get_store", lambda: None)
+        yield fake
+
+
+@pytest.fixture
+def authCtrl(fake, tmp_path):
+    authCtrl = auth.AuthController(HttpClient(cache=http_cache.HttpCache(str(tmp_path / "http"))))
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert authCtrl.login("user01", "pw")
+    return authCtrl
+
+
+def _buy(authCtrl, fake, monkeypatch, recorded: bool = True) -> None:
+    """계정 하나의 구매 (recorded=False 는 사이트에서 직접 산 것처럼 구매 기록을 남기지 않는다)"""
+    with monkeypatch.context() as patch:
+        if not recorded:
+            patch.setenv("PURCHASE_STORE", "0")
+        with contextlib.redirect_stdout(io.StringIO()):
+            steps.buy_account(authCtrl, "user01", 5, fake.webhook_url)
+
+
+def _drawn(monkeypatch, round_no, winners: list = None, avoid: list = ()) -> None:
+    """
+    구매 회차의 당첨 번호가 나온 뒤라고 가정한다
+    - winners: 당첨 번호 6개 + 보너스, 없으면 avoid 게임들에 없는 번호로 정한다 (모두 낙첨)
+    """
+    monkeypatch.setattr(fake_server, "LOTTO645_LAST_ROUND", int(round_no))
+    if winners is None:
+        played = {n for games in avoid for game in _stored(games) for n in game}
+        winners = [n for n in range(1, 46) if n not in played][:7]
+
+    draw_result = fake_server.draw_result
+
+    def fixed(number: int) -> dict:
+        result = draw_result(number)
+        if number == int(round_no):
+            result.update({f"drwtNo{i}": n for i, n in enumerate(winners[:6], 1)}, bnusNo=winners[6])
+        return result
+
+    monkeypatch.setattr(fake_server, "draw_result", fixed)
+
+
+def _requested(fake, before) -> set:
+    return set(fake.hits - before)
+
+
+def _played(result: dict) -> list:
+    return [[int(n.lstrip("✨")) for n in line["result"]] for line in result["lotto_details"]]
+
+
+def _stored(games: list) -> list:
+    return [[int(n) for n in game[:-1].split("|")[1:]] for game in games]
+
+
+def test_check_grades_recorded_purchase_without_detail_page(fake, authCtrl, monkeypatch):
+    _buy(authCtrl, fake, monkeypatch)
+    round_no = str(fake_server.LOTTO645_LAST_ROUND + 1)
+    records = purchase_store.from_env().load("user01")[round_no]
+    _drawn(monkeypatch, round_no, avoid=[record["games"] for record in records])
+
+    before = fake.hits.copy()
+    result = steps.check_winning_lotto645(authCtrl, "user01")
+
+    assert DETAIL not in _requested(fake, before)
+    assert _played(result) == _stored(records[0]["games"])
+    assert all(line["status"] == "0등" for line in result["lotto_details"])
+
+
+def test_check_confirms_winning_lines_on_detail_page(fake, authCtrl, monkeypatch):
+    _buy(authCtrl, fake, monkeypatch)
+    round_no = str(fake_server.LOTTO645_LAST_ROUND + 1)
+    games = purchase_store.from_env().load("user01")[round_no][0]["games"]
+    # 첫 게임이 1등인 회차
+    first = _stored(games)[0]
+    _drawn(monkeypatch, round_no, winners=first + [n for n in range(1, 46) if n not in first][:1])
+
+    before = fake.hits.copy()
+    steps.check_winning_lotto645(authCtrl, "user01")
+
+    assert DETAIL in _requested(fake, before)
+
+
+def test_check_uses_the_purchase_on_the_latest_row_of_a_round(fake, authCtrl, monkeypatch):
+    _buy(authCtrl, fake, monkeypatch)
+    _buy(authCtrl, fake, monkeypatch)
+    round_no = str(fake_server.LOTTO645_LAST_ROUND + 1)
+    records = purchase_store.from_env().load("user01")[round_no]
+    _drawn(monkeypatch, round_no, avoid=[records[-1]["games"]])
+
+    before = fake.hits.copy()
+    result = steps.check_winning_lotto645(authCtrl, "user01")
+
+    # 같은 회차의 두 구매를 모두 남기고, 구매 내역 첫 행(나중 구매)의 게임을 채점한다
+    assert len(records) == 2
+    assert DETAIL not in _requested(fake, before)
+    assert _played(result) == _stored(records[1]["games"])
+    assert _played(result) != _stored(records[0]["games"])
+
+
+def test_check_falls_back_to_detail_page_for_unrecorded_purchase(fake, authCtrl, monkeypatch):
+    _buy(authCtrl, fake, monkeypatch)
+    _buy(authCtrl, fake, monkeypatch, recorded=False)
+    round_no = str(fake_server.LOTTO645_LAST_ROUND + 1)
+    records = purchase_store.from_env().load("user01")[round_no]
+    assert len(records) == 1
+    _drawn(monkeypatch, round_no, avoid=[record["games"] for record in records])
+
+    before = fake.hits.copy()
+    steps.check_winning_lotto645(authCtrl, "user01")
+
+    assert DETAIL in _requested(fake, before)
+
+
+def test_check_falls_back_to_detail_page_before_the_draw(fake, authCtrl, monkeypatch):
+    _buy(authCtrl, fake, monkeypatch)
+
+    before = fake.hits.copy()
+    result = lotto645.Lotto645(authCtrl.http_client).check_winning(authCtrl, purchase_store.from_env().load("user01"))
+
+    assert DETAIL in _requested(fake, before)
+    assert result["lotto_details"]
+
+
+def test_check_reads_winning_numbers_from_local_store(fake, authCtrl, monkeypatch, tmp_path):
+    _buy(authCtrl, fake, monkeypatch)
+    round_no = fake_server.LOTTO645_LAST_ROUND + 1
+    records = purchase_store.from_env().load("user01")[str(round_no)]
+    _drawn(monkeypatch, round_no, avoid=[record["games"] for record in records])
+
+    store = draw_store.DrawStore(str(tmp_path / "draws.sqlite3"))
+    store.add([draw_store.fetch_draw(authCtrl.http_client, round_no)])
+    monkeypatch.setattr(draw_store, "get_store", lambda: store)
+
+    before = fake.hits.copy()
+    result = steps.check_winning_lotto645(authCtrl, "user01")
+
+    assert not _requested(fake, before) & {DETAIL, DRAW_API}
+    assert len(result["lotto_details"]) == 5
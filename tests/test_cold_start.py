@@ -0,0 +1,57 @@
+import json
+import os
+import subprocess
+import sys
+
+import fakes.dhlottery_server as fake_server
+
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+HEAVY_MODULES = ("openai", "Crypto", "numpy")
+
+# controller.py 를 __main__ 으로 실행한 뒤 불러온 무거운 모듈 목록을 마지막 줄에 출력한다
+RUN_CONTROLLER = """
+import json, runpy, sys
+sys.argv = ["controller.py"] + sys.argv[1:]
+runpy.run_path("controller.py", run_name="__main__")
+print(json.dumps(sorted({name.split(".")[0] for name in sys.modules} & set(%r))))
+""" % (HEAVY_MODULES,)
+
+
+def _run(env: dict, *args) -> tuple:
+    result = subprocess.run([sys.executable, "-c", RUN_CONTROLLER, *args], cwd=REPO_DIR, env=env,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    lines = result.stdout.strip().splitlines()
+    return json.loads(lines[-1]), "\n".join(lines[:-1])
+
+
+def _env(fake, tmp_path) -> dict:
+    env = dict(os.environ)
+    for name in ("SESSION_STORE_DIR", "METRICS_DIR", "PURCHASE_STORE"):
+        env.pop(name, None)
+    env.update({
+        "DHLOTTERY_ORIGIN": fake.origin,
+        "USERNAME": "user01",
+        "PASSWORD": "pw",
+        "SLACK_WEBHOOK_URL": fake.webhook_url,
+        "PURCHASE_STORE_DIR": str(tmp_path / "purchases"),
+        "DRAW_STORE_PATH": str(tmp_path / "draws.sqlite3"),
+        "HTTP_CACHE_DIR": str(tmp_path / "http"),
+    })
+    return env
+
+
+def test_check_does_not_import_heavy_modules(tmp_path):
+    with fake_server.FakeDhlotteryServer(latency=0, seed=1) as fake:
+        loaded, output = _run(_env(fake, tmp_path), "check")
+
+    assert "로그인 성공" in output
+    assert fake.hits["/myPage.do?method=lottoBuyList"] >= 1
+    assert loaded == []
+
+
+def test_usage_imports_nothing_heavy():
+    loaded, output = _run(dict(os.environ))
+
+    assert "Usage" in output
+    assert loaded == []
@@ -0,0 +1,89 @@
+import datetime
+import os
+
+import pytest
+
+import draw_info
+from draw_info import KST
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "..", "fixtures", "html", "main.html")
+
+
+class _Response:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _Client:
+    """메인 페이지 요청 수를 세는 HttpClient 대역"""
+
+    def __init__(self):
+        with open(FIXTURE, encoding="utf-8") as f:
+            self.html = f.read()
+        self.urls = []
+
+    def get_cached(self, url: str):
+        self.urls.append(url)
+        return _Response(self.html)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    draw_info.MainPageInfo.invalidate()
+    yield
+    draw_info.MainPageInfo.invalidate()
+
+
+def _kst(*args) -> datetime.datetime:
+    return datetime.datetime(*args, tzinfo=KST)
+
+
+def test_next_draw_time_adds_publish_grace():
+    # 2026-10-17 은 토요일
+    assert draw_info.next_draw_time(draw_info.LOTTO645_DRAW, _kst(2026, 10, 17, 12, 0)) == _kst(2026, 10, 17, 21, 35)
+    assert draw_info.next_draw_time(draw_info.LOTTO645_DRAW, _kst(2026, 10, 17, 21, 0)) == _kst(2026, 10, 17, 21, 35)
+
+
+def test_next_draw_time_rolls_over_to_next_week():
+    assert draw_info.next_draw_time(draw_info.LOTTO645_DRAW, _kst(2026, 10, 17, 21, 35)) == _kst(2026, 10, 24, 21, 35)
+    assert draw_info.next_draw_time(draw_info.WIN720_DRAW, _kst(2026, 10, 18, 9, 0)) == _kst(2026, 10, 22, 20, 5)
+
+
+def test_next_draw_time_converts_to_kst():
+    utc_now = datetime.datetime(2026, 10, 17, 12, 0, tzinfo=datetime.timezone.utc)  # KST 21:00
+
+    assert draw_info.next_draw_time(draw_info.LOTTO645_DRAW, utc_now) == _kst(2026, 10, 17, 21, 35)
+
+
+def test_next_update_time_is_the_earlier_draw():
+    assert draw_info.next_update_time(_kst(2026, 10, 18, 9, 0)) == _kst(2026, 10, 22, 20, 5)
+    assert draw_info.next_update_time(_kst(2026, 10, 23, 9, 0)) == _kst(2026, 10, 24, 21, 35)
+
+
+def test_rounds_share_one_main_page_fetch():
+    client = _Client()
+
+    assert draw_info.get_lotto645_round(client) == "1194"
+    assert draw_info.get_win720_round(client) == "286"
+    assert client.urls == [draw_info.MAIN_PAGE_URL]
+
+
+def test_main_page_is_fetched_again_after_next_update(monkeypatch):
+    client = _Client()
+    monkeypatch.setattr(draw_info, "next_update_time", lambda now: now)
+
+    draw_info.get_lotto645_round(client)
+    draw_info.get_lotto645_round(client)
+
+    assert len(client.urls) == 2
+
+
+def test_main_page_without_rounds_raises():
+    client = _Client()
+    client.html = "<html><body><strong>점검 중</strong></body></html>"
+
+    with pytest.raises(ValueError):
+        draw_info.MainPageInfo.get(client)
+    # 실패한 결과는 남기지 않는다
+    client.html = _Client().html
+    assert draw_info.MainPageInfo.get(client)["lottoDrwNo"] == 1193
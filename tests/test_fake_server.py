@@ -0,0 +1,116 @@
+import contextlib
+import io
+import json
+from urllib.parse import quote, urlencode
+
+import pytest
+import requests
+
+import auth
+import draw_store
+import http_cache
+import steps
+import fakes.dhlottery_server as fake_server
+from HttpClient import HttpClient
+
+pytest.importorskip("Crypto")
+
+from win720_crypto import CryptoContext  # noqa: E402
+
+
+@pytest.fixture
+def fake():
+    with fake_server.FakeDhlotteryServer(latency=0, accounts={"user01": "pw"}, seed=1) as fake:
+        yield fake
+
+
+def _session(fake) -> requests.Session:
+    """첫 방문 페이지에서 받은 JSESSIONID 를 계속 보내는 세션 (AuthController 처럼 로그인 응답의 새 쿠키는 쓰지 않는다)"""
+    session_id = requests.get(f"{fake.origin}/gameResult.do?method=byWin").cookies["JSESSIONID"]
+    session = requests.Session()
+    session.headers["Cookie"] = f"JSESSIONID={session_id}"
+    return session
+
+
+def _session_id(session) -> str:
+    return session.headers["Cookie"].partition("=")[2]
+
+
+def _login(fake, session, password: str = "pw") -> None:
+    session.post(f"{fake.origin}/userSsl.do?method=login", data={"userId": "user01", "password": password})
+
+
+def test_login_checks_account_and_keeps_session(fake):
+    session = _session(fake)
+    assert _session_id(session)
+
+    _login(fake, session, "wrong")
+    assert "로그인이 필요합니다" in session.get(f"{fake.origin}/userSsl.do?method=myPage").text
+
+    _login(fake, session)
+    assert "total_new" in session.get(f"{fake.origin}/userSsl.do?method=myPage").text
+
+
+def test_result_pages_revalidate_with_etag_and_gzip(fake):
+    url = f"{fake.origin}/gameResult.do?method=statByNumber"
+    res = requests.get(url, headers={"Accept-Encoding": "gzip"})
+
+    assert res.headers["Content-Encoding"] == "gzip"
+    assert requests.get(url, headers={"If-None-Match": res.headers["ETag"]}).status_code == 304
+    assert fake.hits["304"] == 1
+    # 메인 페이지는 검증 헤더 없이 준다
+    assert "ETag" not in requests.get(f"{fake.origin}/common.do?method=main").headers
+
+
+def test_draw_numbers_are_fixed_per_round(fake):
+    last = fake_server.LOTTO645_LAST_ROUND
+    url = f"{fake.origin}/common.do?method=getLottoNumber&drwNo="
+
+    first = requests.get(url + str(last)).json()
+
+    assert first == requests.get(url + str(last)).json()
+    assert first["returnValue"] == "success" and first["drwNo"] == last
+    assert requests.get(url + str(last + 1)).json() == {"returnValue": "fail"}
+
+
+def test_exec_buy_needs_login_and_shows_in_buy_list(fake):
+    session = _session(fake)
+    param = json.dumps([{"genType": "1", "arrGameChoiceNum": "1,12,23,34,40,45", "alpabet": "A"}])
+    url = f"{fake.origin}/olotto/game/execBuy.do"
+
+    assert session.post(url, data={"param": param}).json()["loginYn"] == "N"
+
+    _login(fake, session)
+    result = session.post(url, data={"param": param, "nBuyAmount": "1000"}).json()["result"]
+    buy_list = session.post(f"{fake.origin}/myPage.do?method=lottoBuyList", data={"nowPage": "1"}).text
+
+    assert result["arrGameChoiceNum"] == ["A|01|12|23|34|40|451"]
+    assert "".join(result[f"barCode{i}"] for i in range(1, 7)) in buy_list
+    assert fake.purchases == 1
+
+
+def test_win720_requests_use_session_key(fake):
+    session = _session(fake)
+    crypto = CryptoContext(_session_id(session))
+
+    q = crypto.encrypt(urlencode({"ROUND": "286"}))
+    res = session.post(f"{fake.origin}/game/pension720/process/makeAutoNo.jsp", data={"q": quote(q)})
+
+    payload = json.loads(crypto.decrypt(res.json()["q"]))
+    assert payload["resultCode"] == "100" and len(payload["selLotNo"]) == 6
+
+
+def test_buy_end_to_end_against_fake(fake, tmp_path, monkeypatch):
+    monkeypatch.setenv("DHLOTTERY_ORIGIN", fake.origin)
+    monkeypatch.setenv("RECOMMENDER", "local")
+    monkeypatch.setenv("PURCHASE_STORE_DIR", str(tmp_path / "purchases"))
+    monkeypatch.setattr(draw_store, "get_store", lambda: None)
+
+    authCtrl = auth.AuthController(HttpClient(cache=http_cache.HttpCache(str(tmp_path / "http"))))
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert authCtrl.login("user01", "pw")
+        bought = steps.buy_account(authCtrl, "user01", 5, fake.webhook_url)
+
+    assert bought["lotto"]["result"]["resultMsg"] == "SUCCESS"
+    assert len(bought["lotto"]["result"]["arrGameChoiceNum"]) == 5
+    assert fake.hits["/olotto/game/execBuy.do"] == 1
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+import draw_store
+import fleet
+import fakes.dhlottery_server as fake_server
+
+ACCOUNTS = {"user01": "pw1", "user02": "pw2", "user03": "pw3", "user04": "pw4"}
+
+
+@pytest.fixture
+def fake(tmp_path, monkeypatch):
+    with fake_server.FakeDhlotteryServer(latency=0.05, jitter=0, accounts=ACCOUNTS, seed=1) as fake:
+        monkeypatch.setenv("DHLOTTERY_ORIGIN", fake.origin)
+        monkeypatch.setenv("RECOMMENDER", "local")
+        monkeypatch.setenv("PURCHASE_STORE_DIR", str(tmp_path / "purchases"))
+        monkeypatch.delenv("SESSION_STORE_DIR", raising=False)
+        monkeypatch.setattr(draw_store, "get_store", lambda: None)
+        yield fake
+
+
+def _accounts(fake, passwords: dict) -> list:
+    return [{"username": username, "password": password, "count": 1, "webhook_url": fake.webhook_url}
+            for username, password in passwords.items()]
+
+
+def test_load_accounts_fills_defaults(tmp_path, monkeypatch):
+    monkeypatch.setenv("COUNT", "3")
+    monkeypatch.setenv("SLACK_WEBHOOK_URL", "https://hooks.example/default")
+    path = tmp_path / "accounts.json"
+    path.write_text(json.dumps([{"username": "user01", "password": "pw1"},
+                                {"username": "user02", "password": "pw2", "count": 1, "webhook_url": None}]))
+
+    accounts = fleet.load_accounts(str(path))
+
+    assert accounts == [
+        {"username": "user01", "password": "pw1", "count": 3, "webhook_url": "https://hooks.example/default"},
+        {"username": "user02", "password": "pw2", "count": 1, "webhook_url": None},
+    ]
+
+
+@pytest.mark.parametrize("content", [{"username": "user01"}, [{"username": "user01"}]])
+def test_load_accounts_rejects_invalid_file(tmp_path, content):
+    path = tmp_path / "accounts.json"
+    path.write_text(json.dumps(content))
+
+    with pytest.raises(ValueError):
+        fleet.load_accounts(str(path))
+
+
+def test_run_accounts_buys_for_every_account_concurrently(fake, capsys):
+    results = fleet.run_accounts(_accounts(fake, ACCOUNTS), "buy", max_workers=4)
+
+    assert [r["index"] for r in results] == [0, 1, 2, 3]
+    assert [r["username"] for r in results] == ["use***"] * 4
+    assert all(r["status"] == "OK" for r in results), results
+    # 계정마다 로그인했고, 워커 풀에서 겹쳐 돌았으므로 전체 시간이 계정별 합계보다 짧다
+    assert fake.hits["/userSsl.do?method=login"] == 4
+    assert results[0]["fleet_elapsed"] < sum(r["elapsed"] for r in results)
+
+
+def test_run_accounts_reports_failed_login_without_stopping_others(fake, capsys):
+    passwords = dict(ACCOUNTS, user02="wrong")
+
+    results = fleet.run_accounts(_accounts(fake, passwords), "buy", max_workers=2)
+
+    assert [r["status"] for r in results] == ["OK", "ERROR", "OK", "OK"]
+    assert results[1]["detail"] == "로그인 실패"
@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+import html_parser
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "..", "fixtures", "html")
+BACKENDS = html_parser.available_backends()
+
+
+def _fixture(name: str) -> str:
+    with open(os.path.join(FIXTURE_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_backends_read_the_same_text(backend):
+    doc = html_parser.parse(_fixture("main.html"), backend, only="strong")
+
+    assert doc.text("strong#lottoDrwNo") == "1193"
+    assert doc.text("strong#drwNo720") == "285"
+    assert doc.text("strong#missing") is None
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_backends_read_the_same_rows(backend):
+    html = _fixture("stat_by_number.html")
+    expected = html_parser.parse(html, html_parser.FALLBACK_BACKEND).rows(1)
+
+    rows = html_parser.parse(html, backend, only="table").rows(1)
+
+    assert rows == expected
+    assert len(rows) == 46
+    assert html_parser.parse(html, backend).rows(5) == []
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_only_keeps_the_targeted_area(backend):
+    html = _fixture("my_page.html")
+
+    balance = html_parser.extract(html, lambda doc: doc.text("p.total_new strong"), only="p.total_new", backend=backend)
+
+    assert balance == "25,000"
+
+
+def test_extract_falls_back_to_html5lib_when_fast_parser_fails():
+    backends = []
+
+    def read(doc):
+        backends.append(type(doc).__name__)
+        if len(backends) == 1:
+            raise ValueError("broken markup")
+        return doc.text("strong#lottoDrwNo")
+
+    assert html_parser.extract(_fixture("main.html"), read, only="strong") == "1193"
+    assert len(backends) == 2
+
+
+def test_extract_returns_fast_result_without_fallback():
+    calls = []
+
+    def read(doc):
+        calls.append(doc)
+        return doc.text("strong#drwNo720")
+
+    assert html_parser.extract(_fixture("main.html"), read, only="strong") == "285"
+    assert len(calls) == 1
+
+
+def test_default_backend_follows_environment(monkeypatch):
+    monkeypatch.setenv("HTML_PARSER_BACKEND", "html.parser")
+    assert html_parser.default_backend() == "html.parser"
+
+    monkeypatch.delenv("HTML_PARSER_BACKEND")
+    assert html_parser.default_backend() == BACKENDS[0]
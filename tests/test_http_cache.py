@@ -0,0 +1,80 @@
+import datetime
+
+import draw_info
+import http_cache
+import fakes.dhlottery_server as fake_server
+from HttpClient import HttpClient
+
+BY_WIN = "https://dhlottery.co.kr/gameResult.do?method=byWin"
+MAIN = "https://dhlottery.co.kr/common.do?method=main"
+
+
+def _client(fake, directory) -> HttpClient:
+    return HttpClient(origin=fake.origin, cache=http_cache.HttpCache(str(directory)))
+
+
+def test_validated_page_is_revalidated_with_304(tmp_path):
+    with fake_server.FakeDhlotteryServer(latency=0, seed=1) as fake:
+        first = _client(fake, tmp_path).get_cached(BY_WIN)
+
+        # 다른 실행(새 클라이언트)도 같은 디렉터리의 본문을 조건부 요청으로 확인해서 쓴다
+        client = _client(fake, tmp_path)
+        second = client.get_cached(BY_WIN)
+
+        assert second.status_code == 200
+        assert second.text == first.text
+        assert fake.hits["/gameResult.do?method=byWin"] == 2
+        assert fake.hits["304"] == 1
+        assert (client.cache.hits, client.cache.revalidated, client.cache.misses) == (0, 1, 0)
+
+
+def test_revalidate_after_serves_from_disk(tmp_path):
+    with fake_server.FakeDhlotteryServer(latency=0, seed=1) as fake:
+        client = HttpClient(origin=fake.origin, cache=http_cache.HttpCache(str(tmp_path), revalidate_after=60))
+        client.get_cached(BY_WIN)
+        client.get_cached(BY_WIN)
+
+        assert fake.hits["/gameResult.do?method=byWin"] == 1
+        assert (client.cache.hits, client.cache.misses) == (1, 1)
+        assert client.cache.bytes_saved > 0
+
+
+class _Clock:
+    """http_cache 의 time 모듈 대신 쓰는 시계 (time() 만 쓴다)"""
+
+    def __init__(self, now: float):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+def test_page_without_validators_is_kept_until_next_draw(tmp_path, monkeypatch):
+    clock = _Clock(1_700_000_000.0)
+    draw_time = datetime.datetime.fromtimestamp(clock.now + 3600, draw_info.KST)
+    monkeypatch.setattr(http_cache, "time", clock)
+    monkeypatch.setattr(draw_info, "next_update_time", lambda now=None: draw_time)
+
+    with fake_server.FakeDhlotteryServer(latency=0, seed=1) as fake:
+        client = _client(fake, tmp_path)
+        first = client.get_cached(MAIN)
+        assert "ETag" not in first.headers
+
+        # 추첨 결과 반영 전에는 다른 실행에서도 디스크의 본문을 그대로 쓴다
+        clock.now += 3599
+        second = _client(fake, tmp_path).get_cached(MAIN)
+        assert second.text == first.text
+        assert fake.hits["/common.do?method=main"] == 1
+
+        clock.now += 1
+        client = _client(fake, tmp_path)
+        client.get_cached(MAIN)
+        assert fake.hits["/common.do?method=main"] == 2
+        assert (client.cache.hits, client.cache.misses) == (0, 1)
+
+
+def test_urls_with_extra_parameters_are_not_cached(tmp_path):
+    assert http_cache.is_cacheable(BY_WIN)
+    assert not http_cache.is_cacheable(f"{BY_WIN}&drwNo=1193")
+    assert not http_cache.is_cacheable("https://dhlottery.co.kr/myPage.do?method=lottoBuyList")
+
@@ -0,0 +1,112 @@
+import json
+import time
+
+import pytest
+
+import llm_runner
+from fakes.openai_server import REFUSAL, FakeOpenAIServer
+
+pytest.importorskip("openai")
+
+SETS_A = [[1, 2, 3, 4, 5, 6], [7, 8, 9, 10, 11, 12], [13, 14, 15, 16, 17, 18],
+          [19, 20, 21, 22, 23, 24], [25, 26, 27, 28, 29, 30]]
+SETS_B = [[2, 9, 16, 23, 30, 37], [3, 10, 17, 24, 31, 38], [4, 11, 18, 25, 32, 39],
+          [5, 12, 19, 26, 33, 40], [6, 13, 20, 27, 34, 41]]
+
+PROMPTS = [("main", "추천해 주세요"), ("fallback", "번호만 주세요")]
+
+
+class ScriptedOpenAIServer(FakeOpenAIServer):
+    """도착한 순서대로 script 의 (지연, 응답 내용)을 돌려주는 가짜 서버 (마지막 항목을 반복)"""
+
+    def __init__(self, script: list):
+        super().__init__()
+        self.script = list(script)
+
+    def plan(self) -> tuple:
+        with self._lock:
+            index = self.requests
+            self.requests += 1
+        return self.script[min(index, len(self.script) - 1)]
+
+
+def _runner(fake, **kwargs) -> llm_runner.LLMRunner:
+    kwargs.setdefault("stream", False)
+    return llm_runner.LLMRunner(api_key="test", base_url=fake.base_url, **kwargs)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def warm_client():
+    # openai 는 첫 요청 때 모듈을 더 불러와 1초 가까이 걸리므로 시간을 재기 전에 한 번 보낸다
+    with ScriptedOpenAIServer([(0, json.dumps(SETS_A))]) as fake:
+        _runner(fake).recommend("warm up", need=5)
+
+
+def _wait_for(condition, timeout: float = 3.0) -> bool:
+    until = time.monotonic() + timeout
+    while time.monotonic() < until:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_first_valid_response_wins(stream):
+    # 첫 요청은 느리고, hedge 로 보낸 두 번째 요청이 먼저 유효한 응답을 준다
+    with ScriptedOpenAIServer([(1.0, json.dumps(SETS_A)), (0.05, json.dumps(SETS_B))]) as fake:
+        started = time.monotonic()
+        numbers = _runner(fake, hedge_delay=0.1, stream=stream).first_valid(PROMPTS, need=5)
+        elapsed = time.monotonic() - started
+
+    assert numbers == SETS_B
+    assert elapsed < 0.8
+
+
+def test_first_valid_skips_invalid_response():
+    # 앞 요청이 번호 없이 끝나면 hedge_delay 를 기다리지 않고 다음 프롬프트를 보낸다
+    with ScriptedOpenAIServer([(0.05, REFUSAL), (0.05, json.dumps(SETS_B))]) as fake:
+        started = time.monotonic()
+        numbers = _runner(fake, hedge_delay=5).first_valid(PROMPTS, need=5)
+        elapsed = time.monotonic() - started
+
+    assert numbers == SETS_B
+    assert elapsed < 2
+
+
+def test_losing_request_is_cancelled():
+    with ScriptedOpenAIServer([(1.0, json.dumps(SETS_A)), (0.05, json.dumps(SETS_B))]) as fake:
+        started = time.monotonic()
+        numbers = _runner(fake, hedge_delay=0.1).first_valid(PROMPTS, need=5, max_requests=2)
+        elapsed = time.monotonic() - started
+
+        # 돌아올 때 진 요청의 연결은 이미 끊겨 있어 서버가 응답을 쓰기 전에 알아챈다
+        assert numbers == SETS_B
+        assert elapsed < 0.8
+        assert _wait_for(lambda: fake.disconnects == 1)
+        assert fake.requests == 2
+        assert fake.sent_chars == len(json.dumps(SETS_B))
+
+
+@pytest.mark.parametrize("max_in_flight", [1, 2])
+def test_in_flight_requests_never_exceed_limit(monkeypatch, max_in_flight):
+    with ScriptedOpenAIServer([(0.1, REFUSAL)]) as fake:
+        runner = _runner(fake, hedge_delay=0, max_in_flight=max_in_flight)
+        active = peak = 0
+        recommend = runner._recommend
+
+        async def counted(*args):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            try:
+                return await recommend(*args)
+            finally:
+                active -= 1
+
+        monkeypatch.setattr(runner, "_recommend", counted)
+        numbers = runner.first_valid(PROMPTS * 2, need=5, max_requests=5)
+
+        assert numbers == []
+        assert fake.requests == 5
+        assert peak == max_in_flight
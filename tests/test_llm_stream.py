@@ -0,0 +1,70 @@
+import time
+
+import pytest
+
+import llm_runner
+import number_parser
+from fakes.openai_server import FakeOpenAIServer
+
+pytest.importorskip("openai")
+
+VERBOSE_CHARS = 1500
+
+
+def _fake() -> FakeOpenAIServer:
+    # 번호 5세트 뒤에 긴 설명이 붙는 응답을 글자 4개씩 보낸다
+    return FakeOpenAIServer(latency=0, token_latency=0.001, verbose_chars=VERBOSE_CHARS, seed=1)
+
+
+def _runner(fake, stream: bool) -> llm_runner.LLMRunner:
+    return llm_runner.LLMRunner(api_key="test", base_url=fake.base_url, stream=stream)
+
+
+def _wait_for(condition, timeout: float = 3.0) -> bool:
+    until = time.monotonic() + timeout
+    while time.monotonic() < until:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+def test_stream_stops_once_enough_sets_are_parsed(capsys):
+    with _fake() as fake:
+        numbers = _runner(fake, stream=True).recommend("추천해 주세요", need=5)
+
+        assert len(numbers) == 5
+        # 설명은 받지 않고 연결을 끊는다
+        assert fake.sent_chars < VERBOSE_CHARS
+        assert _wait_for(lambda: fake.disconnects == 1)
+
+
+def test_stream_returns_the_same_sets_as_full_response(capsys):
+    with _fake() as fake:
+        streamed = _runner(fake, stream=True).recommend("추천해 주세요", need=5)
+    with _fake() as fake:
+        full = _runner(fake, stream=False).recommend("추천해 주세요", need=5)
+        assert fake.sent_chars > VERBOSE_CHARS
+
+    assert streamed == full
+
+
+def test_stream_stops_earlier_for_fewer_sets(capsys):
+    with _fake() as fake:
+        numbers = _runner(fake, stream=True).recommend("추천해 주세요", need=2)
+        two_sets = fake.sent_chars
+    with _fake() as fake:
+        _runner(fake, stream=True).recommend("추천해 주세요", need=5)
+        five_sets = fake.sent_chars
+
+    assert len(numbers) == 2
+    assert two_sets < five_sets
+
+
+def test_parser_ignores_text_after_limit():
+    parser = number_parser.NumberSetParser(limit=1)
+
+    assert parser.feed("[3, 12, 19, 27, 34, 41] [5, 9") == [[3, 12, 19, 27, 34, 41]]
+    assert parser.done
+    assert parser.feed(", 16, 23, 38, 44]") == []
+    assert parser.close() == [[3, 12, 19, 27, 34, 41]]
@@ -0,0 +1,116 @@
+import json
+import threading
+
+import pytest
+import requests
+
+import metrics
+import fakes.dhlottery_server as fake_server
+from HttpClient import HostRateLimiter, HttpClient
+
+
+def _span(total: float, phase: str = "login", status: int = 200, endpoint: str = "/userSsl.do?method=login") -> dict:
+    return {"host": "www.dhlottery.co.kr", "endpoint": endpoint, "method": "POST", "status": status,
+            "bytes": 100, "dns": 0.0, "connect": 0.01, "tls": None, "ttfb": total / 2, "total": total, "phase": phase}
+
+
+@pytest.fixture
+def recorder(monkeypatch):
+    recorder = metrics.SpanRecorder()
+    monkeypatch.setattr(metrics, "_default_recorder", recorder)
+    return recorder
+
+
+def test_phase_nests_and_restores():
+    assert metrics.current_phase() == "other"
+    with metrics.phase("buy"):
+        with metrics.phase("execBuy"):
+            assert metrics.current_phase() == "execBuy"
+        assert metrics.current_phase() == "buy"
+    assert metrics.current_phase() == "other"
+
+
+def test_phase_decorator_and_thread_isolation():
+    seen = []
+
+    @metrics.phase("check")
+    def check():
+        seen.append(metrics.current_phase())
+        # 다른 스레드의 단계는 섞이지 않는다
+        thread = threading.Thread(target=lambda: seen.append(metrics.current_phase()))
+        thread.start()
+        thread.join()
+
+    check()
+    assert seen == ["check", "other"]
+
+
+def test_percentile_uses_nearest_rank():
+    values = [0.1 * i for i in range(1, 11)]
+
+    assert metrics.percentile([], 0.5) == 0.0
+    assert metrics.percentile(values, 0.5) == pytest.approx(0.5)
+    assert metrics.percentile(values, 0.95) == pytest.approx(1.0)
+
+
+def test_recorder_keeps_latest_spans_and_fills_phase():
+    recorder = metrics.SpanRecorder(max_spans=3)
+    with metrics.phase("history"):
+        for i in range(5):
+            span = _span(i)
+            del span["phase"]
+            recorder.record(span)
+
+    assert [span["total"] for span in recorder.spans()] == [2, 3, 4]
+    assert {span["phase"] for span in recorder.spans()} == {"history"}
+
+
+def test_prometheus_histogram_is_cumulative(recorder, tmp_path):
+    for total in (0.03, 0.3, 3.0):
+        recorder.record(_span(total))
+    path = tmp_path / "metrics.prom"
+
+    recorder.write_prometheus(str(path))
+    lines = path.read_text(encoding="utf-8").splitlines()
+
+    labels = 'host="www.dhlottery.co.kr",endpoint="/userSsl.do?method=login",method="POST",phase="login",status="200"'
+    assert f'dhlottery_http_request_duration_seconds_bucket{{{labels},le="0.05"}} 1' in lines
+    assert f'dhlottery_http_request_duration_seconds_bucket{{{labels},le="0.5"}} 2' in lines
+    assert f'dhlottery_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 3' in lines
+    assert f"dhlottery_http_request_duration_seconds_count{{{labels}}} 3" in lines
+    assert f"dhlottery_http_response_bytes_total{{{labels}}} 300" in lines
+    assert f'dhlottery_http_request_stage_seconds_total{{{labels},stage="tls"}} 0.000000' in lines
+
+
+def test_summary_and_export(recorder, tmp_path, capsys):
+    assert recorder.summary() == ""
+    assert not recorder.export("")
+
+    recorder.record(_span(0.2, phase="login"))
+    recorder.record(_span(1.5, phase="execBuy", endpoint="/olotto/game/execBuy.do"))
+    summary = recorder.summary()
+
+    assert summary.startswith("⏱️ 요청 2건 / 합계 1.70s")
+    assert "login 1건 0.20s, execBuy 1건 1.50s" in summary
+    assert "가장 느린 요청: POST www.dhlottery.co.kr/olotto/game/execBuy.do 1.500s" in summary
+
+    assert recorder.export(str(tmp_path))
+    assert recorder.export(str(tmp_path))
+    spans = [json.loads(line) for line in (tmp_path / "spans.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert len(spans) == 4 and spans[0]["run"] == metrics.RUN_ID
+    assert (tmp_path / "metrics.prom").exists()
+
+
+def test_http_client_records_original_host_and_phase(recorder):
+    with fake_server.FakeDhlotteryServer(latency=0, seed=1) as fake:
+        client = HttpClient(origin=fake.origin, rate_limiter=HostRateLimiter(rate=100, burst=10))
+        with metrics.phase("check"):
+            client.get("https://dhlottery.co.kr/common.do?method=getLottoNumber", params={"drwNo": 1})
+            with pytest.raises(requests.HTTPError):
+                client.get("https://www.dhlottery.co.kr/nowhere.do")
+
+    ok, missing = recorder.spans()
+    assert (ok["host"], ok["endpoint"], ok["status"], ok["phase"]) == (
+        "dhlottery.co.kr", "/common.do?method=getLottoNumber", 200, "check")
+    assert ok["bytes"] > 0 and ok["total"] >= ok["ttfb"] >= 0
+    assert (missing["endpoint"], missing["status"]) == ("/nowhere.do", 404)
@@ -0,0 +1,122 @@
+import contextlib
+import io
+import threading
+import time
+
+import notification
+
+URL = "https://hooks.example.com/a"
+
+
+class _Response:
+    def __init__(self, status_code: int, headers: dict = None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class _Session:
+    """WebhookQueue.session 대신 쓰는 가짜 세션 - responses 를 차례로 돌려주고 보낸 본문을 남긴다"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.posted = []
+        self.times = []
+        self._lock = threading.Lock()
+
+    def post(self, url, json=None, headers=None, timeout=None):
+        with self._lock:
+            self.posted.append((url, json["text"]))
+            self.times.append(time.monotonic())
+            outcome = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def _queue(session, **kwargs) -> notification.WebhookQueue:
+    kwargs.setdefault("batch_window", 0.05)
+    kwargs.setdefault("backoff", 0.001)
+    webhooks = notification.WebhookQueue(**kwargs)
+    webhooks.session = session
+    return webhooks
+
+
+def test_messages_in_one_window_are_sent_as_one_post():
+    session = _Session(_Response(204))
+    webhooks = _queue(session)
+
+    for i in range(3):
+        webhooks.put(URL, f"message {i}")
+    webhooks.put("https://hooks.example.com/b", "other")
+    assert webhooks.flush(timeout=5)
+
+    assert sorted(session.posted) == [
+        (URL, "message 0\n\nmessage 1\n\nmessage 2"),
+        ("https://hooks.example.com/b", "other"),
+    ]
+    assert (webhooks.sent, webhooks.failed) == (4, 0)
+
+
+def test_retry_after_is_respected():
+    session = _Session(_Response(429, {"Retry-After": "0.2"}), _Response(200))
+    webhooks = _queue(session)
+
+    webhooks.put(URL, "hello")
+    assert webhooks.flush(timeout=5)
+
+    assert webhooks.posts == 2 and webhooks.sent == 1
+    assert session.times[1] - session.times[0] >= 0.2
+
+
+def test_flush_returns_when_the_post_keeps_failing():
+    session = _Session(_Response(503))
+    webhooks = _queue(session, max_retries=2)
+
+    webhooks.put(URL, "hello")
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert webhooks.flush(timeout=5)
+
+    assert webhooks.posts == 3
+    assert (webhooks.sent, webhooks.failed) == (0, 1)
+
+
+def test_worker_survives_an_unexpected_error():
+    session = _Session(TypeError("broken payload"), _Response(204))
+    webhooks = _queue(session)
+
+    webhooks.put(URL, "first")
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert webhooks.flush(timeout=5)
+    webhooks.put(URL, "second")
+    assert webhooks.flush(timeout=5)
+
+    assert [text for _, text in session.posted] == ["first", "second"]
+    assert (webhooks.sent, webhooks.failed) == (1, 1)
+
+
+def test_flush_without_messages_returns_immediately():
+    started = time.monotonic()
+    assert _queue(_Session(_Response(204))).flush(timeout=5)
+    assert time.monotonic() - started < 1
+
+
+def test_batches_are_split_at_the_size_limit():
+    messages = ["a" * 1400, "b" * 1400, "c" * 1400]
+    chunks = notification._join_messages(messages)
+
+    assert [count for _, count in chunks] == [2, 1]
+    assert all(len(text) <= notification.MAX_BATCH_CHARS for text, _ in chunks)
+
+
+def test_oversized_message_is_split_into_pieces():
+    lines = [f"{i:04d} " + "x" * 95 for i in range(70)]
+    message = "\n".join(lines)
+    chunks = notification._join_messages(["short", message, "after"])
+
+    assert all(len(text) <= notification.MAX_BATCH_CHARS for text, _ in chunks)
+    assert sum(count for _, count in chunks) == 3
+    assert "\n".join(text for text, _ in chunks).replace("\n\n", "\n").split("\n") == ["short", *lines, "after"]
+
+    long_line = notification._join_messages(["y" * 7000])
+    assert [len(text) for text, _ in long_line] == [3000, 3000, 1000]
+    assert [count for _, count in long_line] == [0, 0, 1]
@@ -0,0 +1,29 @@
+import json
+import os
+
+import pytest
+
+import number_parser
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "fixtures", "llm", "responses.json")
+
+with open(CORPUS_PATH, encoding="utf-8") as f:
+    CORPUS = json.load(f)
+
+
+@pytest.mark.parametrize("case", CORPUS, ids=[case["name"] for case in CORPUS])
+def test_corpus(case):
+    assert number_parser.parse_number_sets(case["text"]) == case["expected"]
+
+
+@pytest.mark.parametrize("case", CORPUS, ids=[case["name"] for case in CORPUS])
+def test_corpus_streamed(case):
+    parser = number_parser.NumberSetParser()
+    for start in range(0, len(case["text"]), 7):
+        parser.feed(case["text"][start:start + 7])
+    assert parser.close() == case["expected"]
+
+
+def test_truncated_set_respects_limit():
+    text = "[[3, 12, 19, 27, 34, 41], [5, 9, 16, 23, 38, 44"
+    assert number_parser.parse_number_sets(text, limit=1) == [[3, 12, 19, 27, 34, 41]]
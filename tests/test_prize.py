@@ -0,0 +1,68 @@
+import numpy as np
+
+import lotto_stats
+import prize
+import ticket
+
+NUMBERS = [3, 11, 16, 35, 41, 44]
+BONUS = 7
+
+
+def test_grade_every_rank():
+    tickets = [
+        [3, 11, 16, 35, 41, 44],  # 6개 -> 1등
+        [3, 11, 16, 35, 41, 7],   # 5개 + 보너스 -> 2등
+        [3, 11, 16, 35, 41, 1],   # 5개 -> 3등
+        [3, 11, 16, 35, 1, 2],    # 4개 -> 4등
+        [3, 11, 16, 1, 2, 4],     # 3개 -> 5등
+        [3, 11, 7, 1, 2, 4],      # 2개 + 보너스 -> 낙첨
+        [1, 2, 4, 5, 6, 8],       # 0개 -> 낙첨
+    ]
+    assert prize.grade(tickets, NUMBERS, BONUS).tolist() == [1, 2, 3, 4, 5, 0, 0]
+
+
+def test_grade_purchase_reads_game_choices():
+    body = {"result": {"arrGameChoiceNum": ["A|03|11|16|35|41|073", "B|01|02|04|05|06|081"]}}
+    graded = prize.grade_purchase(body, NUMBERS, BONUS)
+    assert graded == [
+        {"label": "A", "numbers": [3, 7, 11, 16, 35, 41], "grade": 2, "status": "2등"},
+        {"label": "B", "numbers": [1, 2, 4, 5, 6, 8], "grade": 0, "status": "0등"},
+    ]
+
+
+def test_grade_rounds_uses_each_rounds_draw_and_skips_undrawn():
+    history = lotto_stats.DrawHistory(
+        [1, 2],
+        ["2002.12.07", "2002.12.14"],
+        [[1, 2, 3, 4, 5, 6], [10, 20, 30, 40, 41, 42]],
+        [7, 43],
+    )
+    tickets = np.array([
+        [1, 2, 3, 4, 5, 7],        # 1회: 5개 + 보너스 -> 2등
+        [1, 2, 3, 4, 5, 7],        # 2회: 0개 -> 낙첨
+        [10, 20, 30, 40, 41, 43],  # 2회: 5개 + 보너스 -> 2등
+        [10, 20, 30, 40, 41, 42],  # 3회: 아직 추첨 전 -> -1
+    ])
+    grades = prize.grade_rounds(tickets, [1, 2, 2, 3], history)
+    assert grades.tolist() == [2, 0, 2, -1]
+    assert prize.count_grades(grades) == {1: 0, 2: 2, 3: 0, 4: 0, 5: 0, 0: 1}
+
+
+def test_grade_matches_scalar_reference():
+    rng = np.random.default_rng(1)
+    tickets = np.array([rng.choice(np.arange(1, 46), 6, replace=False) for _ in range(2000)])
+    grades = prize.grade(tickets, NUMBERS, BONUS)
+
+    for row, got in zip(tickets.tolist(), grades.tolist()):
+        matches = len(set(row) & set(NUMBERS))
+        expected = {6: 1, 5: 2 if BONUS in row else 3, 4: 4, 3: 5}.get(matches, 0)
+        assert got == expected
+
+
+def test_ticket_grade_matches_vectorized_grade():
+    rng = np.random.default_rng(2)
+    tickets = [rng.choice(np.arange(1, 46), 6, replace=False) for _ in range(2000)]
+    tickets += [NUMBERS, [3, 11, 16, 35, 41, BONUS], [3, 11, 16, 35, 41, 1]]
+
+    expected = prize.grade(np.array(tickets), NUMBERS, BONUS).tolist()
+    assert [ticket.Ticket.of(row).grade(NUMBERS, BONUS) for row in tickets] == expected
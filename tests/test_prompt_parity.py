@@ -0,0 +1,62 @@
+import os
+
+import draw_store
+import html_parser
+import http_cache
+import lotto645
+import lotto_stats
+import steps
+from HttpClient import HttpClient
+from fakes.dhlottery_server import FIXTURE_DIR, FakeDhlotteryServer
+
+
+class _DrawApi:
+    """getLottoNumber 응답을 by_win.html 의 회차로 만들어 주는 fetch_draw 용 클라이언트"""
+
+    def __init__(self, rows: list):
+        self.draws = {int(row[0]): row for row in rows}
+
+    def get(self, url: str):
+        round_no = int(url.rsplit("=", 1)[1])
+        _, date, numbers, bonus = self.draws[round_no]
+        data = {"returnValue": "success", "drwNo": round_no, "drwNoDate": date.replace(".", "-"), "bnusNo": int(bonus)}
+        data.update({f"drwtNo{i}": int(n) for i, n in enumerate(numbers.split(","), start=1)})
+        return _JsonResponse(data)
+
+
+class _JsonResponse:
+    def __init__(self, data: dict):
+        self.data = data
+
+    def json(self) -> dict:
+        return dict(self.data)
+
+
+def _by_win_rows() -> list:
+    with open(os.path.join(FIXTURE_DIR, "by_win.html"), "r", encoding="utf-8") as f:
+        return [cols for cols in html_parser.parse(f.read()).rows(0) if len(cols) >= 4]
+
+
+def test_local_history_prompt_matches_scraped(tmp_path):
+    rows = _by_win_rows()
+    api = _DrawApi(rows)
+    store = draw_store.DrawStore(str(tmp_path / "draws.sqlite3"))
+    store.add([draw_store.fetch_draw(api, round_no) for round_no in sorted(api.draws)])
+    history = lotto_stats.DrawHistory.from_store(store)
+
+    with FakeDhlotteryServer(latency=0) as fake:
+        client = HttpClient(origin=fake.origin, cache=http_cache.HttpCache(str(tmp_path / "http")))
+        scraped = lotto645.Lotto645(client).fetch_recent_winning_numbers(10)
+
+    assert len(scraped) == 10
+    assert store.recent_winning_numbers(10) == scraped
+    assert history.recent_winning_numbers(10) == scraped
+    assert steps.build_history_prompt(history.recent_winning_numbers(10)) == steps.build_history_prompt(scraped)
+
+
+def test_iso_dates_from_older_stores_are_read_in_scraped_format(tmp_path):
+    store = draw_store.DrawStore(str(tmp_path / "draws.sqlite3"))
+    with store._connect() as conn:
+        conn.execute("INSERT INTO draws VALUES (1193, '2025-10-11', 4, 31, 32, 33, 36, 43, 27)")
+
+    assert store.recent_winning_numbers(1)[0]["date"] == "2025.10.11"
@@ -0,0 +1,97 @@
+import json
+import os
+
+import pytest
+
+import llm_runner
+from fakes.openai_server import FakeOpenAIServer
+from recommendation_cache import RecommendationCache
+
+MODEL = "gpt-3.5-turbo"
+MESSAGES = [{"role": "user", "content": "추천해 주세요"}]
+SETS = [[1, 12, 23, 34, 40, 45], [3, 8, 17, 26, 31, 42], [2, 9, 16, 23, 30, 37],
+        [5, 12, 19, 26, 33, 40], [6, 13, 20, 27, 34, 41]]
+
+
+class _FixedOpenAIServer(FakeOpenAIServer):
+    """항상 같은 응답을 바로 돌려주는 가짜 서버"""
+
+    def __init__(self, content: str):
+        super().__init__(latency=0)
+        self.content = content
+
+    def plan(self) -> tuple:
+        with self._lock:
+            self.requests += 1
+        return 0, self.content
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return RecommendationCache(str(tmp_path), shared=False)
+
+
+def test_get_returns_what_was_put(cache):
+    assert cache.get("1194", MODEL, MESSAGES, "user01") is None
+
+    cache.put("1194", MODEL, MESSAGES, SETS, "user01")
+
+    assert cache.get("1194", MODEL, MESSAGES, "user01") == SETS
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_key_depends_on_round_model_prompt_and_account(cache):
+    cache.put("1194", MODEL, MESSAGES, SETS, "user01")
+
+    assert cache.get("1195", MODEL, MESSAGES, "user01") is None
+    assert cache.get("1194", "gpt-4o-mini", MESSAGES, "user01") is None
+    assert cache.get("1194", MODEL, [{"role": "user", "content": "다른 프롬프트"}], "user01") is None
+    # 계정마다 다른 번호를 사도록 다른 계정과는 나누지 않는다
+    assert cache.get("1194", MODEL, MESSAGES, "user02") is None
+
+
+def test_shared_cache_ignores_account(tmp_path):
+    cache = RecommendationCache(str(tmp_path), shared=True)
+    cache.put("1194", MODEL, MESSAGES, SETS, "user01")
+
+    assert cache.get("1194", MODEL, MESSAGES, "user02") == SETS
+
+
+def test_put_drops_rounds_older_than_keep_rounds(cache, tmp_path):
+    for round_no in ("1192", "1193", "1194"):
+        cache.put(round_no, MODEL, MESSAGES, SETS, "user01")
+
+    assert sorted(os.listdir(tmp_path)) == ["1193.json", "1194.json"]
+    assert cache.evict("1196") == 2
+    assert os.listdir(tmp_path) == []
+
+
+def test_empty_or_corrupt_entries_are_ignored(cache, tmp_path, capsys):
+    cache.put("1194", MODEL, MESSAGES, [], "user01")
+    assert not os.path.exists(tmp_path / "1194.json")
+
+    (tmp_path / "1194.json").write_text("{not json")
+    assert cache.get("1194", MODEL, MESSAGES, "user01") is None
+    assert "손상" in capsys.readouterr().out
+
+
+def test_runner_uses_cache_instead_of_calling_openai(cache, capsys):
+    pytest.importorskip("openai")
+    with _FixedOpenAIServer(json.dumps(SETS)) as fake:
+        runner = llm_runner.LLMRunner(api_key="test", base_url=fake.base_url, cache=cache,
+                                      round_no="1194", account="user01", stream=False)
+
+        assert runner.recommend("추천해 주세요", need=5) == SETS
+        assert runner.recommend("추천해 주세요", need=5) == SETS
+        assert fake.requests == 1
+
+
+def test_runner_does_not_cache_incomplete_response(cache, capsys):
+    pytest.importorskip("openai")
+    with _FixedOpenAIServer(json.dumps(SETS[:3])) as fake:
+        runner = llm_runner.LLMRunner(api_key="test", base_url=fake.base_url, cache=cache,
+                                      round_no="1194", account="user01", stream=False)
+
+        assert runner.recommend("추천해 주세요", need=5) == SETS[:3]
+        assert runner.recommend("추천해 주세요", need=5) == SETS[:3]
+        assert fake.requests == 2
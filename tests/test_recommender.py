@@ -0,0 +1,81 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import lotto_stats  # noqa: E402
+import recommender  # noqa: E402
+from recommender import LocalRecommender  # noqa: E402
+
+FREQUENCY = [150 + (number * 7) % 30 for number in range(1, 46)]
+RECENT = [[1, 12, 23, 34, 40, 45], [3, 8, 17, 26, 31, 42]]
+
+
+def _runs(numbers: list) -> int:
+    longest = run = 1
+    for a, b in zip(numbers, numbers[1:]):
+        run = run + 1 if b == a + 1 else 1
+        longest = max(longest, run)
+    return longest
+
+
+def _decades(numbers: list) -> int:
+    return len({min((n - 1) // 10, len(lotto_stats.DECADES) - 1) for n in numbers})
+
+
+def test_recommend_meets_balance_constraints():
+    sets = LocalRecommender(FREQUENCY, recent_sets=RECENT, seed=7).recommend(50)
+
+    assert len(sets) == 50
+    assert len({tuple(numbers) for numbers in sets}) == 50
+    for numbers in sets:
+        assert numbers == sorted(numbers) and len(set(numbers)) == 6
+        assert all(1 <= n <= 45 for n in numbers)
+        assert recommender.ODD_RANGE[0] <= sum(n % 2 for n in numbers) <= recommender.ODD_RANGE[1]
+        assert _decades(numbers) >= recommender.MIN_DECADES
+        assert _runs(numbers) <= recommender.MAX_RUN
+        assert numbers not in RECENT
+
+
+def test_same_seed_gives_same_sets():
+    first = LocalRecommender(FREQUENCY, seed=42).recommend(5)
+
+    assert LocalRecommender(FREQUENCY, seed=42).recommend(5) == first
+    assert LocalRecommender(FREQUENCY, seed=43).recommend(5) != first
+
+
+def test_balanced_mask_rejects_each_rule():
+    sets = np.array([
+        [1, 12, 23, 34, 40, 45],  # 통과
+        [1, 3, 5, 7, 21, 41],     # 홀수 6개
+        [1, 2, 4, 6, 8, 10],      # 한 구간
+        [1, 2, 3, 20, 31, 42],    # 세 개 연속
+        [1, 2, 20, 21, 31, 42],   # 두 개 연속 두 번은 허용
+    ])
+
+    assert LocalRecommender.balanced(sets).tolist() == [True, False, False, False, True]
+
+
+def test_weights_favour_no_show_and_penalise_last_draw():
+    flat = [100] * 45
+    rec = LocalRecommender(flat, no_show_numbers=[5], last_numbers=[9])
+
+    assert rec.weights.sum() == pytest.approx(1.0)
+    assert rec.weights[4] == pytest.approx(rec.weights[0] * recommender.NO_SHOW_BOOST)
+    assert rec.weights[8] == pytest.approx(rec.weights[0] * recommender.LAST_DRAW_PENALTY)
+
+
+def test_sample_draws_six_distinct_sorted_numbers():
+    picks = LocalRecommender(FREQUENCY, seed=1).sample(200)
+
+    assert picks.shape == (200, 6)
+    assert (np.diff(picks, axis=1) > 0).all()
+    assert picks.min() >= 1 and picks.max() <= 45
+
+
+def test_from_statistics_reads_scraped_pages():
+    stats = {str(number): {"frequency": frequency} for number, frequency in enumerate(FREQUENCY, 1)}
+    winners = [{"numbers": numbers} for numbers in RECENT]
+
+    rec = LocalRecommender.from_statistics(stats, [5], winners, seed=3)
+
+    assert rec.recommend(5) == LocalRecommender(FREQUENCY, [5], RECENT[0], RECENT, seed=3).recommend(5)
@@ -0,0 +1,133 @@
+import contextlib
+import io
+import random
+import time
+
+import pytest
+import requests
+
+import retry
+
+URL = "https://dhlottery.co.kr/common.do?method=main"
+BUY_URL = "https://ol.dhlottery.co.kr/olotto/game/execBuy.do"
+
+
+def _http_error(status: int) -> requests.HTTPError:
+    res = requests.Response()
+    res.status_code = status
+    return requests.HTTPError(f"HTTP {status}", response=res)
+
+
+def _policy(**kwargs) -> retry.RetryPolicy:
+    kwargs.setdefault("attempts", 3)
+    return retry.RetryPolicy(base_delay=0.001, max_delay=0.001, rng=random.Random(1), **kwargs)
+
+
+def _sender(*outcomes):
+    """outcomes 를 차례로 돌려주거나 올리는 send(attempt, timeout)"""
+    calls = []
+
+    def send(attempt, timeout):
+        calls.append(attempt)
+        outcome = outcomes[len(calls) - 1]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return send, calls
+
+
+def test_breaker_opens_after_threshold_and_probes_after_reset():
+    breaker = retry.CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+
+    assert not breaker.record_failure()
+    assert breaker.allow()
+    assert breaker.record_failure()
+    assert breaker.is_open and not breaker.allow()
+
+    time.sleep(0.06)
+    # 시험 요청은 하나만 통과시킨다
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert not breaker.is_open and breaker.allow()
+
+
+def test_failed_probe_reopens_breaker():
+    breaker = retry.CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.is_open and not breaker.allow()
+
+
+def test_retries_transient_status_until_success():
+    send, calls = _sender(_http_error(503), _http_error(502), "ok")
+    breaker = retry.CircuitBreaker(failure_threshold=5)
+    policy = _policy()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert policy.call(send, URL, True, breaker) == "ok"
+    assert calls == [1, 2, 3]
+    assert policy.retries == 2
+    assert not breaker.is_open
+
+
+def test_client_errors_and_exhausted_attempts_raise():
+    send, calls = _sender(_http_error(404))
+    with pytest.raises(requests.HTTPError):
+        _policy().call(send, URL, True, retry.CircuitBreaker())
+    assert calls == [1]
+
+    send, calls = _sender(*[_http_error(503)] * 3)
+    with contextlib.redirect_stdout(io.StringIO()), pytest.raises(requests.HTTPError):
+        _policy().call(send, URL, True, retry.CircuitBreaker())
+    assert calls == [1, 2, 3]
+
+
+def test_purchase_paths_retry_only_unsent_failures():
+    send, calls = _sender(requests.exceptions.ReadTimeout("read"), "ok")
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        _policy().call(send, BUY_URL, True, retry.CircuitBreaker())
+    assert calls == [1]
+
+    send, calls = _sender(requests.exceptions.ConnectTimeout("connect"), "ok")
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert _policy().call(send, BUY_URL, True, retry.CircuitBreaker()) == "ok"
+    assert calls == [1, 2]
+
+
+def test_deadline_stops_retrying():
+    policy = retry.RetryPolicy(attempts=3, base_delay=0.001, max_delay=0.001, deadline=0.5, rng=random.Random(1))
+    # Retry-After 가 deadline 을 넘으면 기다리지 않고 바로 실패한다
+    error = _http_error(503)
+    error.response.headers["Retry-After"] = "10"
+    send, calls = _sender(error, "ok")
+
+    started = time.monotonic()
+    with pytest.raises(requests.HTTPError):
+        policy.call(send, URL, True, retry.CircuitBreaker())
+    assert calls == [1]
+    assert time.monotonic() - started < 0.5
+
+
+def test_open_breaker_fails_fast_without_sending():
+    breaker = retry.CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    send, calls = _sender(_http_error(503), _http_error(503), "ok")
+
+    with contextlib.redirect_stdout(io.StringIO()), pytest.raises(retry.CircuitOpenError):
+        _policy().call(send, URL, True, breaker)
+    assert calls == [1, 2]
+    assert breaker.is_open
+
+
+def test_rate_limit_does_not_count_as_host_failure():
+    breaker = retry.CircuitBreaker(failure_threshold=1)
+    send, calls = _sender(_http_error(429), "ok")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert _policy().call(send, URL, True, breaker) == "ok"
+    assert not breaker.is_open
@@ -0,0 +1,91 @@
+import threading
+import time
+
+import pytest
+
+from HttpClient import HostRateLimiter, TokenBucket
+from scheduler import PipelineScheduler
+
+
+def test_submitted_step_runs_while_current_step_runs():
+    started = threading.Event()
+    order = []
+
+    def background():
+        started.set()
+        order.append("background")
+        return "win720"
+
+    def foreground():
+        # submit 한 단계가 현재 단계와 겹쳐서 시작해야 끝난다
+        assert started.wait(1)
+        order.append("foreground")
+        return "lotto"
+
+    with PipelineScheduler() as scheduler:
+        scheduler.submit("prepare", background)
+        assert scheduler.run("buy", foreground) == "lotto"
+        assert scheduler.result("prepare") == "win720"
+
+    assert order == ["background", "foreground"]
+
+
+def test_result_waits_for_submitted_step():
+    with PipelineScheduler() as scheduler:
+        scheduler.submit("slow", lambda: time.sleep(0.05) or 42)
+        assert scheduler.result("slow") == 42
+        assert scheduler.result("missing", default="none") == "none"
+
+
+def test_failed_submitted_step_returns_default(capsys):
+    def fail():
+        raise ValueError("boom")
+
+    with PipelineScheduler() as scheduler:
+        scheduler.submit("prepare", fail)
+        assert scheduler.result("prepare", default={}) == {}
+
+    assert "prepare 단계 실패: ValueError: boom" in capsys.readouterr().out
+
+
+def test_failed_current_step_raises_and_is_timed(capsys):
+    def fail():
+        raise RuntimeError("buy failed")
+
+    with PipelineScheduler() as scheduler:
+        with pytest.raises(RuntimeError, match="buy failed"):
+            scheduler.run("buy", fail)
+        report = scheduler.report("구매")
+
+    assert list(report["steps"]) == ["buy"]
+
+
+def test_report_adds_removed_wait_to_sequential_time(capsys):
+    with PipelineScheduler() as scheduler:
+        scheduler.submit("a", time.sleep, 0.05)
+        scheduler.run("b", time.sleep, 0.05)
+        scheduler.result("a")
+        report = scheduler.report("구매", removed_wait=10)
+
+    assert set(report["steps"]) == {"a", "b"}
+    assert report["sequential"] >= 10.1
+    # 두 단계가 겹쳤으므로 실제 시간은 단계 합계보다 짧다
+    assert report["elapsed"] < sum(report["steps"].values())
+
+
+def test_token_bucket_allows_burst_then_waits():
+    bucket = TokenBucket(rate=20, burst=2)
+
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == pytest.approx(0.05, abs=0.02)
+
+
+def test_rate_limiter_keeps_one_bucket_per_host():
+    limiter = HostRateLimiter(rate=20, burst=1, overrides={"burst.example": (20, 2)})
+
+    assert limiter.acquire("https://a.example/x") == 0
+    assert limiter.acquire("https://b.example/x") == 0
+    assert limiter.acquire("https://a.example/y") > 0
+    assert limiter.acquire("https://burst.example/x") == 0
+    assert limiter.acquire("https://burst.example/y") == 0
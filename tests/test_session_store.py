@@ -0,0 +1,66 @@
+import contextlib
+import io
+
+import pytest
+import requests
+
+import auth
+import http_cache
+import session_store
+import fakes.dhlottery_server as fake_server
+from HttpClient import HttpClient
+
+
+@pytest.fixture
+def store(tmp_path):
+    return session_store.SessionStore(str(tmp_path), secret="shared-key")
+
+
+def test_failure_marker_is_per_password_even_with_secret(store):
+    store.mark_failed("user01", "wrong")
+
+    assert store.has_recent_failure("user01", "wrong")
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert not store.has_recent_failure("user01", "right")
+
+
+def test_failure_marker_expires(tmp_path):
+    store = session_store.SessionStore(str(tmp_path), failure_ttl=0)
+    store.mark_failed("user01", "wrong")
+
+    assert not store.has_recent_failure("user01", "wrong")
+
+
+def test_saved_session_round_trip(store):
+    store.save("user01", "pw", "JSESSION-1")
+
+    assert store.load("user01", "pw") == "JSESSION-1"
+    assert not store.has_recent_failure("user01", "pw")
+
+
+def _auth(fake, tmp_path) -> auth.AuthController:
+    return auth.AuthController(HttpClient(origin=fake.origin, cache=http_cache.HttpCache(str(tmp_path / "http"))))
+
+
+def test_wrong_password_is_marked_and_not_retried(tmp_path, store):
+    with fake_server.FakeDhlotteryServer(latency=0, seed=1, accounts={"user01": "right"}) as fake:
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert not _auth(fake, tmp_path).login("user01", "wrong", session_store=store)
+            assert fake.hits["/userSsl.do?method=login"] == 1
+            assert not _auth(fake, tmp_path).login("user01", "wrong", session_store=store)
+            assert fake.hits["/userSsl.do?method=login"] == 1
+            assert _auth(fake, tmp_path).login("user01", "right", session_store=store)
+
+
+def test_network_error_does_not_mark_failure(tmp_path, store, monkeypatch):
+    with fake_server.FakeDhlotteryServer(latency=0, seed=1, accounts={"user01": "right"}) as fake:
+        authCtrl = _auth(fake, tmp_path)
+
+        def unreachable():
+            raise requests.ConnectionError("mypage unreachable")
+
+        monkeypatch.setattr(authCtrl, "is_logged_in", unreachable)
+        with contextlib.redirect_stdout(io.StringIO()), pytest.raises(requests.ConnectionError):
+            authCtrl.login("user01", "right", session_store=store)
+
+        assert not store.has_recent_failure("user01", "right")
@@ -0,0 +1,91 @@
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import draw_info
+import draw_store
+import lotto645
+import fakes.dhlottery_server as fake_server
+from HttpClient import HostRateLimiter, HttpClient, SingleFlight
+
+STAT_PAGES = ("/gameResult.do?method=statByNumber", "/gameResult.do?method=noViewNumber",
+              "/gameResult.do?method=byWin", "/common.do?method=main")
+
+
+def test_concurrent_calls_share_one_execution():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(1)
+        return "page"
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(flights.do, "stat", fetch) for _ in range(4)]
+        # 모두 들어와 기다릴 때까지 첫 실행을 붙잡아 둔다
+        while flights.shared < 3:
+            time.sleep(0.005)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert results == ["page"] * 4
+    assert len(calls) == 1
+    assert (flights.executed, flights.shared) == (1, 3)
+
+
+def test_failure_is_shared_but_not_kept():
+    flights = SingleFlight()
+
+    def fail():
+        raise ConnectionError("down")
+
+    with pytest.raises(ConnectionError):
+        flights.do("stat", fail, ttl=60)
+    assert flights.do("stat", lambda: "page", ttl=60) == "page"
+    assert flights.executed == 2
+
+
+def test_finished_result_is_reused_within_ttl():
+    flights = SingleFlight()
+
+    assert flights.do("stat", lambda: 1, ttl=60) == 1
+    assert flights.do("stat", lambda: 2, ttl=60) == 1
+    assert flights.do("other", lambda: 3, ttl=60) == 3
+    # ttl 이 없으면 끝난 결과는 남기지 않는다
+    assert flights.do("once", lambda: 4) == 4
+    assert flights.do("once", lambda: 5) == 5
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    with fake_server.FakeDhlotteryServer(latency=0.05, jitter=0, seed=1) as fake:
+        monkeypatch.setenv("DHLOTTERY_ORIGIN", fake.origin)
+        monkeypatch.setattr(draw_store, "get_store", lambda: None)
+        draw_info.MainPageInfo.invalidate()
+        yield fake
+        draw_info.MainPageInfo.invalidate()
+
+
+def test_prefetch_fetches_statistics_pages_once_in_parallel(fake):
+    # 앞선 테스트가 공용 속도 제한 토큰을 써 버렸어도 기다리지 않도록 따로 둔다
+    lotto = lotto645.Lotto645(HttpClient(rate_limiter=HostRateLimiter(rate=100, burst=10)))
+
+    started = time.monotonic()
+    lotto.prefetch_statistics()
+    elapsed = time.monotonic() - started
+
+    before = fake.hits.copy()
+    assert len(lotto.fetch_lotto_statistics()) == 45
+    assert lotto.fetch_recent_no_show_numbers()
+    assert lotto.fetch_recent_winning_numbers()
+    draw_info.get_lotto645_round(lotto.http_client)
+
+    assert all(fake.hits[page] == 1 for page in STAT_PAGES), fake.hits
+    assert fake.hits == before
+    # 네 페이지를 동시에 받으므로 왕복 네 번보다 빠르다
+    assert elapsed < 4 * 0.05
@@ -0,0 +1,73 @@
+import itertools
+import random
+
+import pytest
+
+import ticket
+from ticket import Ticket
+
+GAMES = [sorted(random.Random(seed).sample(range(1, 46), 6)) for seed in range(200)]
+
+
+@pytest.mark.parametrize("numbers", GAMES[:20] + [[1, 2, 3, 4, 5, 6], [40, 41, 42, 43, 44, 45]])
+def test_mask_round_trips(numbers):
+    t = Ticket.of(numbers)
+
+    assert t.numbers == numbers
+    assert list(t) == numbers
+    assert ticket.numbers_of(ticket.mask_of(numbers)) == numbers
+    assert Ticket(t.mask) == t
+    assert Ticket.from_choice(t.to_choice()) == t
+    assert Ticket.from_game_choice(t.to_game_choice("C") + "3") == ("C", t)
+
+
+def test_of_accepts_strings_in_any_order():
+    assert Ticket.of(["05", "43", "12", "1", "27", "33"]).numbers == [1, 5, 12, 27, 33, 43]
+    assert Ticket.of(Ticket.of(GAMES[0])) == Ticket.of(GAMES[0])
+
+
+@pytest.mark.parametrize("numbers", [[0, 1, 2, 3, 4, 5], [1, 2, 3, 4, 5, 46], [1, 2, 3, 4, 5], [1, 1, 2, 3, 4, 5],
+                                     [1, 2, 3, 4, 5, 6, 7]])
+def test_of_rejects_invalid_games(numbers):
+    with pytest.raises(ValueError):
+        Ticket.of(numbers)
+
+
+def test_mask_must_hold_six_numbers():
+    with pytest.raises(ValueError):
+        Ticket(ticket.mask_of([1, 2, 3]))
+    with pytest.raises(ValueError):
+        Ticket(1 << 45 | ticket.mask_of([1, 2, 3, 4, 5]))
+
+
+def test_order_matches_sorted_number_lists():
+    tickets = [Ticket.of(numbers) for numbers in GAMES]
+
+    assert [t.numbers for t in sorted(tickets)] == sorted(GAMES)
+    for a, b in itertools.islice(itertools.combinations(tickets, 2), 500):
+        assert (a < b) == (a.numbers < b.numbers)
+        assert (a >= b) == (a.numbers >= b.numbers)
+
+
+def test_hash_and_equality_deduplicate():
+    assert len({Ticket.of(numbers) for numbers in GAMES + GAMES}) == len({tuple(numbers) for numbers in GAMES})
+    assert Ticket.of(GAMES[0]) != GAMES[0]
+
+
+def test_matches_and_membership():
+    t = Ticket.of([1, 12, 23, 34, 40, 45])
+
+    assert t.matches(Ticket.of([1, 12, 23, 2, 3, 4])) == 3
+    assert t.matches(ticket.mask_of([45])) == 1
+    assert 45 in t and 2 not in t and 0 not in t and 46 not in t
+    assert len(t) == 6
+
+
+def test_pack_unpack_round_trips():
+    pytest.importorskip("numpy")
+
+    masks = ticket.pack(GAMES)
+
+    assert masks.dtype.itemsize == 8
+    assert ticket.unpack(masks).tolist() == GAMES
+    assert ticket.pack([Ticket.of(GAMES[0])]).tolist() == [Ticket.of(GAMES[0]).mask]
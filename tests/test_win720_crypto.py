@@ -0,0 +1,88 @@
+import base64
+
+import pytest
+
+pytest.importorskip("Crypto")
+
+from Crypto.Cipher import AES  # noqa: E402
+from Crypto.Hash import SHA256  # noqa: E402
+from Crypto.Protocol.KDF import PBKDF2  # noqa: E402
+
+import win720_crypto  # noqa: E402
+from win720_crypto import CryptoContext  # noqa: E402
+
+SESSION_ID = "A1B2C3D4E5F6A7B8C9D0E1F2A3B4C5D6.worker1"
+
+
+@pytest.fixture(autouse=True)
+def fresh_sessions(monkeypatch):
+    monkeypatch.setattr(CryptoContext, "_sessions", type(CryptoContext._sessions)())
+
+
+def _parts(enc_text: str) -> tuple:
+    return enc_text[0:64], enc_text[64:96], enc_text[96:]
+
+
+def test_for_session_reuses_context_and_derived_key():
+    context = CryptoContext.for_session(SESSION_ID)
+    first = context.encrypt("ROUND=285")
+    second = CryptoContext.for_session(SESSION_ID).encrypt("ROUND=285")
+
+    assert CryptoContext.for_session(SESSION_ID) is context
+    assert context.derivations == 1
+    # 같은 세션은 salt(=키)를 재사용하고 IV 는 매번 새로 만든다
+    assert _parts(first)[0] == _parts(second)[0]
+    assert _parts(first)[1] != _parts(second)[1]
+    assert first != second
+
+
+def test_other_session_gets_its_own_context():
+    context = CryptoContext.for_session(SESSION_ID)
+    other = CryptoContext.for_session("F" * 32)
+
+    assert other is not context
+    assert _parts(other.encrypt("x"))[0] != _parts(context.encrypt("x"))[0]
+
+
+def test_round_trip_across_contexts_of_the_same_session():
+    plain = "q=%7B%22round%22%3A%22285%22%7D&ROUND=285"
+    enc_text = CryptoContext.for_session(SESSION_ID).encrypt(plain)
+
+    receiver = CryptoContext(SESSION_ID, reuse_salt=False)
+
+    assert receiver.decrypt(enc_text) == plain
+    assert receiver.decrypt_many([enc_text, enc_text]) == [plain, plain]
+    assert receiver.derivations == 1
+
+
+def test_decrypts_server_format_built_without_the_context():
+    # 서버처럼 매번 새 salt/IV 로 만든 암호문도 그대로 읽는다
+    salt, iv = bytes(range(32)), bytes(range(16))
+    key = PBKDF2(SESSION_ID[:32], salt, 16, count=win720_crypto.ITERATION_COUNT, hmac_hash_module=SHA256)
+    cipher = AES.new(key, AES.MODE_CBC, iv).encrypt(win720_crypto._pad('{"resultCode":"100"}').encode("utf-8"))
+    enc_text = salt.hex() + iv.hex() + base64.b64encode(cipher).decode("utf-8")
+
+    assert CryptoContext.for_session(SESSION_ID).decrypt(enc_text) == '{"resultCode":"100"}'
+
+
+def test_without_salt_reuse_each_message_derives_a_new_key():
+    context = CryptoContext(SESSION_ID, reuse_salt=False)
+
+    enc_texts = context.encrypt_many(["a", "b", "c"])
+
+    assert len({_parts(enc_text)[0] for enc_text in enc_texts}) == 3
+    assert context.derivations == 3
+    assert context.decrypt_many(enc_texts) == ["a", "b", "c"]
+    assert context.derivations == 3
+
+
+def test_session_contexts_are_bounded(monkeypatch):
+    monkeypatch.setattr(CryptoContext, "MAX_SESSIONS", 2)
+    first = CryptoContext.for_session("1" * 32)
+    CryptoContext.for_session("2" * 32)
+    CryptoContext.for_session("1" * 32)
+    CryptoContext.for_session("3" * 32)
+
+    # 가장 오래 쓰지 않은 세션부터 버린다
+    assert CryptoContext.for_session("1" * 32) is first
+    assert list(CryptoContext._sessions) == ["3" * 32, "1" * 32]
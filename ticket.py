@@ -0,0 +1,157 @@
+SET_SIZE = 6
+MIN_NUMBER = 1
+MAX_NUMBER = 45
+
+# 번호 n -> 비트 (n - 1), 45개 번호가 45비트 정수 하나에 들어간다
+_BITS = [0] + [1 << (n - 1) for n in range(MIN_NUMBER, MAX_NUMBER + 1)]
+_FULL = (1 << MAX_NUMBER) - 1
+
+# 맞힌 번호 수 -> 등수 (5개는 보너스 여부로 2/3등이 갈린다, 0 은 낙첨)
+GRADE_BY_MATCHES = (0, 0, 0, 5, 4, 3, 1)
+
+
+def popcount(mask: int) -> int:
+    # int.bit_count 는 3.10 부터라서 bin().count 를 쓴다 (45비트라 충분히 빠르다)
+    return bin(mask).count("1")
+
+
+def mask_of(numbers) -> int:
+    """번호 목록 -> 비트마스크 (검증 없이, 이미 유효한 번호일 때)"""
+    mask = 0
+    for n in numbers:
+        mask |= _BITS[n]
+    return mask
+
+
+def numbers_of(mask: int) -> list:
+    """비트마스크 -> 오름차순 번호 목록"""
+    numbers = []
+    while mask:
+        low = mask & -mask
+        numbers.append(low.bit_length())
+        mask ^= low
+    return numbers
+
+
+class Ticket:
+    """
+    로또 6/45 한 게임 (번호 6개)
+    - 45비트 정수 하나로 들고 있어 비교/해시/중복 제거가 정수 연산 한 번이다
+    - 맞힌 개수는 두 마스크의 AND 의 popcount
+    - 정렬 순서는 오름차순 번호 목록의 사전순과 같다
+    """
+
+    __slots__ = ("mask",)
+
+    def __init__(self, mask: int):
+        assert type(mask) == int
+        if mask & ~_FULL or popcount(mask) != SET_SIZE:
+            raise ValueError(f"번호 6개짜리 마스크가 아닙니다: {mask:#x}")
+        self.mask = mask
+
+    @classmethod
+    def of(cls, numbers) -> "Ticket":
+        """번호 목록 (또는 Ticket) -> Ticket, 1~45 가 아니거나 중복/개수가 맞지 않으면 ValueError"""
+        if isinstance(numbers, Ticket):
+            return numbers
+
+        mask = 0
+        count = 0
+        for n in numbers:
+            n = int(n)
+            if n < MIN_NUMBER or n > MAX_NUMBER:
+                raise ValueError(f"1~45 범위를 벗어난 번호: {n}")
+            mask |= _BITS[n]
+            count += 1
+        if count != SET_SIZE:
+            raise ValueError(f"번호는 6개여야 합니다: {count}개")
+        return cls(mask)
+
+    @classmethod
+    def from_choice(cls, text: str) -> "Ticket":
+        """execBuy 요청의 arrGameChoiceNum ("5,12,17,27,33,43") -> Ticket"""
+        return cls.of(text.split(","))
+
+    @classmethod
+    def from_game_choice(cls, entry: str) -> tuple:
+        """
+        구매 응답의 arrGameChoiceNum 한 줄 -> (게임 라벨, Ticket)
+        - 형식: "A|01|05|12|23|34|45" + 선택 방식 한 글자 (마지막 글자는 버린다)
+        """
+        parts = entry[:-1].split("|")
+        if len(parts) != SET_SIZE + 1:
+            raise ValueError(f"구매 번호 형식이 올바르지 않습니다: {entry!r}")
+        return parts[0], cls.of(parts[1:])
+
+    @property
+    def numbers(self) -> list:
+        return numbers_of(self.mask)
+
+    def to_choice(self) -> str:
+        """execBuy 요청 형식 ("5,12,17,27,33,43")"""
+        return ",".join(map(str, numbers_of(self.mask)))
+
+    def to_game_choice(self, label: str) -> str:
+        """구매 응답과 같은 표시 형식 ("A|05|12|17|27|33|43", 선택 방식 글자 없이)"""
+        return "|".join([label] + [f"{n:02d}" for n in numbers_of(self.mask)])
+
+    def matches(self, other) -> int:
+        """other (Ticket 또는 마스크) 와 겹치는 번호 수"""
+        return bin(self.mask & (other.mask if type(other) is Ticket else other)).count("1")
+
+    def grade(self, winning, bonus: int) -> int:
+        """당첨 번호 6개(Ticket 또는 번호 목록) + 보너스 -> 등수 (1~5, 낙첨 0), 게임 몇 개는 numpy 없이 바로 채점한다"""
+        grade = GRADE_BY_MATCHES[self.matches(Ticket.of(winning))]
+        return 2 if grade == 3 and bonus in self else grade
+
+    def __contains__(self, number: int) -> bool:
+        return MIN_NUMBER <= number <= MAX_NUMBER and bool(self.mask & _BITS[number])
+
+    def __iter__(self):
+        return iter(numbers_of(self.mask))
+
+    def __len__(self) -> int:
+        return SET_SIZE
+
+    def __hash__(self) -> int:
+        return hash(self.mask)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Ticket):
+            return NotImplemented
+        return self.mask == other.mask
+
+    def __lt__(self, other: "Ticket") -> bool:
+        # 사전순 비교 = 서로 다른 번호 중 가장 작은 번호를 가진 쪽이 앞
+        diff = self.mask ^ other.mask
+        return bool(self.mask & diff & -diff)
+
+    def __le__(self, other: "Ticket") -> bool:
+        return self == other or self < other
+
+    def __gt__(self, other: "Ticket") -> bool:
+        return other < self
+
+    def __ge__(self, other: "Ticket") -> bool:
+        return self == other or other < self
+
+    def __repr__(self) -> str:
+        return f"Ticket({numbers_of(self.mask)})"
+
+
+def pack(tickets):
+    """Ticket/번호 목록들 -> uint64 마스크 배열 (게임당 8바이트)"""
+    # 번호 검증/표시에만 쓰는 곳(알림, 수동 구매)에서 numpy 를 불러오지 않도록 배열 함수에서만 가져온다
+    import numpy as np
+
+    return np.fromiter((Ticket.of(t).mask for t in tickets), dtype=np.uint64)
+
+
+def unpack(masks):
+    """uint64 마스크 배열 -> (게임 수, 6) 오름차순 번호 행렬 (prize.grade 입력 형식)"""
+    import numpy as np
+
+    masks = np.asarray(masks, dtype=np.uint64)
+    bits = (masks[:, None] >> np.arange(MAX_NUMBER, dtype=np.uint64)) & np.uint64(1)
+    rows, columns = np.nonzero(bits)
+    return (columns + 1).reshape(-1, SET_SIZE).astype(np.int16)
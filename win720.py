@@ -1,20 +1,17 @@
 import json
 import datetime
-import base64
 import requests
 import re
 
 from enum import Enum
-from bs4 import BeautifulSoup as BS
 from datetime import timedelta
-from Crypto.Cipher import AES
-from Crypto.Protocol.KDF import PBKDF2
-from Crypto.Hash import SHA256
-from Crypto.Random import get_random_bytes
 
 from HttpClient import HttpClientSingleton
 
 import auth
+import draw_info
+import html_parser
+import metrics
 
 
 def safe_json_parse(text, fallback=None):
@@ -39,14 +36,8 @@ def safe_json_parse(text, fallback=None):
 
 class Win720:
 
-    keySize = 128
-    iterationCount = 1000
-    BlockSize = 16
     keyCode = ""
 
-    _pad = lambda self, s: s + (self.BlockSize - len(s) % self.BlockSize) * chr(self.BlockSize - len(s) % self.BlockSize)
-    _unpad = lambda self, s : s[:-ord(s[len(s)-1:])]
-
     _REQ_HEADERS = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/109.0.0.0 Safari/537.36",
         "Connection": "keep-alive",
@@ -66,14 +57,15 @@ class Win720:
         "X-Requested-With": "XMLHttpRequest"
     }
 
-    def __init__(self):
-        self.http_client = HttpClientSingleton.get_instance()
+    def __init__(self, http_client=None):
+        self.http_client = http_client or HttpClientSingleton.get_instance()
 
-    def buy_Win720(
-        self, 
-        auth_ctrl: auth.AuthController,
-        username: str
-    ) -> dict:
+    @metrics.phase("requirements")
+    def prepare_Win720(self, auth_ctrl: auth.AuthController) -> dict:
+        """
+        구매 전 준비 단계 (회차 조회 + 자동 번호 발급)
+        - 돈이 나가지 않는 요청만 하므로 로또 구매와 동시에 미리 실행해도 된다
+        """
         assert type(auth_ctrl) == auth.AuthController
 
         headers = self._generate_req_headers(auth_ctrl)
@@ -94,8 +86,30 @@ class Win720:
         if not extracted_data or 'selLotNo' not in extracted_data:
             print(f"❌ selLotNo 파싱 실패: {parsed_ret}")
             return {"error": "selLotNo 파싱 실패"}
-        
-        extracted_num = extracted_data["selLotNo"]
+
+        return {
+            "round": win720_round,
+            "selLotNo": extracted_data["selLotNo"]
+        }
+
+    def buy_Win720(
+        self, 
+        auth_ctrl: auth.AuthController,
+        username: str,
+        prepared: dict = None
+    ) -> dict:
+        assert type(auth_ctrl) == auth.AuthController
+
+        headers = self._generate_req_headers(auth_ctrl)
+        self.keyCode = headers['Cookie'].split("JSESSIONID=")[1]
+
+        if prepared is None:
+            prepared = self.prepare_Win720(auth_ctrl)
+        if "error" in prepared:
+            return prepared
+
+        win720_round = prepared["round"]
+        extracted_num = prepared["selLotNo"]
         orderNo, orderDate = self._doOrderRequest(auth_ctrl, win720_round, extracted_num)
         
         conn_pro_result = self._doConnPro(auth_ctrl, win720_round, extracted_num, username, orderNo, orderDate)
@@ -112,13 +126,7 @@ class Win720:
         return auth_ctrl.add_auth_cred_to_headers(self._REQ_HEADERS)
 
     def _get_round(self) -> str:
-        res = self.http_client.get("https://www.dhlottery.co.kr/common.do?method=main")
-        html = res.text
-        soup = BS(
-            html, "html5lib"
-        )  # 'html5lib' : in case that the html don't have clean tag pairs
-        last_drawn_round = int(soup.find("strong", id="drwNo720").text)
-        return str(last_drawn_round + 1)
+        return draw_info.get_win720_round(self.http_client)
 
     def _makeAutoNumbers(self, auth_ctrl: auth.AuthController, win720_round: str) -> str:
         payload = "ROUND={}&SEL_NO=&BUY_CNT=&AUTO_SEL_SET=SA&SEL_CLASS=&BUY_TYPE=A&ACCS_TYPE=01".format(win720_round)
@@ -131,11 +139,13 @@ class Win720:
         res = self.http_client.post(
             url="https://el.dhlottery.co.kr/game/pension720/process/makeAutoNo.jsp", 
             headers=headers,
-            data=data
+            data=data,
+            retry=True
         )
 
         return res.text
 
+    @metrics.phase("makeOrderNo")
     def _doOrderRequest(self, auth_ctrl: auth.AuthController, win720_round: str, extracted_num: str) -> str:
         payload = "ROUND={}&AUTO_SEL_SET=SA&SEL_CLASS=&SEL_NO={}&BUY_TYPE=M&BUY_CNT=5".format(win720_round, extracted_num)
         headers = self._generate_req_headers(auth_ctrl)
@@ -163,6 +173,7 @@ class Win720:
 
         return ret['orderNo'], ret['orderDate']
 
+    @metrics.phase("connPro")
     def _doConnPro(self, auth_ctrl: auth.AuthController, win720_round: str, extracted_num: str, username: str, orderNo: str, orderDate: str) -> str:
         payload = "ROUND={}&FLAG=&BUY_KIND=01&BUY_NO={}&BUY_CNT=5&BUY_SET_TYPE=SA%2CSA%2CSA%2CSA%2CSA&BUY_TYPE=A%2CA%2CA%2CA%2CA%2C&CS_TYPE=01&orderNo={}&orderDate={}&TRANSACTION_ID=&WIN_DATE=&USER_ID={}&PAY_TYPE=&resultErrorCode=&resultErrorMsg=&resultOrderNo=&WORKING_FLAG=true&NUM_CHANGE_TYPE=&auto_process=N&set_type=SA&classnum=&selnum=&buytype=M&num1=&num2=&num3=&num4=&num5=&num6=&DSEC=34&CLOSE_DATE=&verifyYN=N&curdeposit=&curpay=5000&DROUND={}&DSEC=0&CLOSE_DATE=&verifyYN=N&lotto720_radio_group=on".format(win720_round,"".join([ "{}{}%2C".format(i,extracted_num) for i in range(1,6)])[:-3],orderNo, orderDate, username, win720_round)
         headers = self._generate_req_headers(auth_ctrl)
@@ -186,44 +197,34 @@ class Win720:
         
         return ret
 
-    def _encText(self, plainText: str) -> str:
-        encSalt = get_random_bytes(32)
-        encIV = get_random_bytes(16)
-        passPhrase = self.keyCode[:32]
-        encKey = PBKDF2(passPhrase, encSalt, self.BlockSize, count=self.iterationCount, hmac_hash_module=SHA256)
-        aes = AES.new(encKey, AES.MODE_CBC, encIV)
+    def _crypto(self):
+        # pycryptodome 은 연금복권 요청을 실제로 보낼 때 처음 가져온다 (당첨 확인만 할 때는 필요 없음)
+        from win720_crypto import CryptoContext
 
-        plainText = self._pad(plainText).encode('utf-8')
+        # 같은 세션(JSESSIONID) 안에서는 파생 키를 재사용한다
+        return CryptoContext.for_session(self.keyCode)
 
-        return "{}{}{}".format(bytes.hex(encSalt), bytes.hex(encIV), base64.b64encode(aes.encrypt(plainText)).decode('utf-8'))
+    def _encText(self, plainText: str) -> str:
+        return self._crypto().encrypt(plainText)
 
     def _decText(self, encText: str) -> str:
-
-        decSalt = bytes.fromhex(encText[0:64])
-        decIv = bytes.fromhex(encText[64:96])
-        cryptText = encText[96:]
-        passPhrase = self.keyCode[:32]
-        decKey = PBKDF2(passPhrase, decSalt, self.BlockSize, count=self.iterationCount, hmac_hash_module=SHA256)
-
-        aes = AES.new(decKey, AES.MODE_CBC, decIv)
-
-        return self._unpad(aes.decrypt(base64.b64decode(cryptText)).decode('utf-8'))
+        return self._crypto().decrypt(encText)
 
     def get_balance(self, auth_ctrl: auth.AuthController) -> str: 
         
         headers = self._generate_req_headers(auth_ctrl)
         res = self.http_client.post(
             url="https://dhlottery.co.kr/userSsl.do?method=myPage", 
-            headers=headers
+            headers=headers,
+            retry=True
         )
 
-        html = res.text
-        soup = BS(
-            html, "html5lib"
-        )
-        balance = soup.find("p", class_="total_new").find('strong').text
+        balance = html_parser.extract(res.text, lambda doc: doc.text("p.total_new strong"), only="p.total_new")
+        if balance is None:
+            raise ValueError("마이페이지에서 잔액 정보를 찾을 수 없습니다.")
         return balance
 
+    @metrics.phase("check")
     def check_winning(self, auth_ctrl: auth.AuthController) -> dict:
         assert type(auth_ctrl) == auth.AuthController
 
@@ -242,13 +243,13 @@ class Win720:
         res = self.http_client.post(
             "https://dhlottery.co.kr/myPage.do?method=lottoBuyList",
             headers=headers,
-            data=data
+            data=data,
+            retry=True
         )
 
-        html = res.text
-        soup = BS(html, "html5lib")
-        
-        winnings = soup.find("table", class_="tbl_data tbl_data_col").find_all("tbody")[0].find_all("td")       
+        winnings = html_parser.extract_soup(res.text, self._read_winnings, only="table.tbl_data")
+        if winnings is None:
+            raise ValueError("구매 내역 테이블을 찾을 수 없습니다.")
 
         result_data = {
             "data": "no winning data"
@@ -258,13 +259,22 @@ class Win720:
             return result_data
 
         result_data = {
-            "round": winnings[2].text.strip(),
-            "money": ",".join([ winnings[6+(i*8)].text.strip() for i in range(0,int(len(winnings)/7))]) ,
-            "purchased_date": winnings[0].text.strip(),
-            "winning_date": winnings[7].text.strip()
+            "round": winnings[2],
+            "money": ",".join([ winnings[6+(i*8)] for i in range(0,int(len(winnings)/7))]) ,
+            "purchased_date": winnings[0],
+            "winning_date": winnings[7]
         }
 
         return result_data
+
+    @staticmethod
+    def _read_winnings(soup):
+        """구매 내역 표의 첫 번째 tbody 칸만 읽는다 (표 안에 다른 tbody 가 있어도 섞이지 않도록)"""
+        table = soup.select_one("table.tbl_data.tbl_data_col")
+        tbody = table.select_one("tbody") if table is not None else None
+        if tbody is None:
+            return None
+        return [td.get_text().strip() for td in tbody.find_all("td")] or None
     
     def _make_search_date(self) -> dict:
         today = datetime.datetime.today()
@@ -0,0 +1,97 @@
+import base64
+import threading
+
+from collections import OrderedDict
+
+from Crypto.Cipher import AES
+from Crypto.Hash import SHA256
+from Crypto.Protocol.KDF import PBKDF2
+from Crypto.Random import get_random_bytes
+
+BLOCK_SIZE = 16
+ITERATION_COUNT = 1000
+SALT_SIZE = 32
+IV_SIZE = 16
+
+
+def _pad(s: str) -> str:
+    return s + (BLOCK_SIZE - len(s) % BLOCK_SIZE) * chr(BLOCK_SIZE - len(s) % BLOCK_SIZE)
+
+
+def _unpad(s: str) -> str:
+    return s[:-ord(s[len(s)-1:])]
+
+
+class CryptoContext:
+    """
+    연금복권(el.dhlottery.co.kr) 요청/응답 암호화용 세션 단위 컨텍스트
+    - 형식: hex(salt 32바이트) + hex(iv 16바이트) + base64(AES-CBC 암호문), 키는 PBKDF2-SHA256(JSESSIONID[:32], salt)
+    - 파생 키를 (passphrase, salt) 로 기억해 두고, 보내는 쪽은 세션 동안 salt 하나를 재사용한다 (IV 는 매번 새로 만든다)
+    """
+
+    MAX_KEYS = 64
+    MAX_SESSIONS = 32
+
+    _sessions = OrderedDict()
+    _sessions_lock = threading.Lock()
+
+    def __init__(self, key_code: str, reuse_salt: bool = True):
+        self.passphrase = key_code[:32]
+        self._enc_salt = get_random_bytes(SALT_SIZE) if reuse_salt else None
+        self._keys = OrderedDict()
+        self._lock = threading.Lock()
+        self.derivations = 0
+
+    @classmethod
+    def for_session(cls, key_code: str) -> "CryptoContext":
+        """같은 JSESSIONID 로 만든 Win720 인스턴스끼리 컨텍스트를 공유한다"""
+        with cls._sessions_lock:
+            context = cls._sessions.get(key_code)
+            if context is None:
+                context = cls._sessions[key_code] = cls(key_code)
+                if len(cls._sessions) > cls.MAX_SESSIONS:
+                    cls._sessions.popitem(last=False)
+            else:
+                cls._sessions.move_to_end(key_code)
+            return context
+
+    def derive_key(self, salt: bytes) -> bytes:
+        cache_key = (self.passphrase, salt)
+        with self._lock:
+            key = self._keys.get(cache_key)
+            if key is not None:
+                self._keys.move_to_end(cache_key)
+                return key
+
+        key = PBKDF2(self.passphrase, salt, BLOCK_SIZE, count=ITERATION_COUNT, hmac_hash_module=SHA256)
+
+        with self._lock:
+            self.derivations += 1
+            self._keys[cache_key] = key
+            if len(self._keys) > self.MAX_KEYS:
+                self._keys.popitem(last=False)
+        return key
+
+    def encrypt(self, plain_text: str) -> str:
+        enc_salt = self._enc_salt or get_random_bytes(SALT_SIZE)
+        enc_iv = get_random_bytes(IV_SIZE)
+        aes = AES.new(self.derive_key(enc_salt), AES.MODE_CBC, enc_iv)
+
+        padded = _pad(plain_text).encode('utf-8')
+
+        return "{}{}{}".format(bytes.hex(enc_salt), bytes.hex(enc_iv), base64.b64encode(aes.encrypt(padded)).decode('utf-8'))
+
+    def decrypt(self, enc_text: str) -> str:
+        dec_salt = bytes.fromhex(enc_text[0:64])
+        dec_iv = bytes.fromhex(enc_text[64:96])
+        crypt_text = enc_text[96:]
+
+        aes = AES.new(self.derive_key(dec_salt), AES.MODE_CBC, dec_iv)
+
+        return _unpad(aes.decrypt(base64.b64decode(crypt_text)).decode('utf-8'))
+
+    def encrypt_many(self, plain_texts: list) -> list:
+        return [self.encrypt(plain_text) for plain_text in plain_texts]
+
+    def decrypt_many(self, enc_texts: list) -> list:
+        return [self.decrypt(enc_text) for enc_text in enc_texts]